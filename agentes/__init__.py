@@ -3,10 +3,23 @@ from .agente_base import AgenteBase
 from .agente_temperatura import AgenteTemperatura
 from .agente_iluminacion import AgenteIluminacion
 from .agente_seguridad import AgenteSeguridad
+from .motor_termico import MotorTermico
+from .motor_reglas import MotorReglas, Regla
+from .planificador import PlanificadorAgentes
+from .agente_async import AsyncAgenteBase, AgenteSincronoAsync, ejecutar_agentes_async
+from .procesos import EjecutorProcesos
 
 __all__ = [
     'AgenteBase',
     'AgenteTemperatura', 
     'AgenteIluminacion',
-    'AgenteSeguridad'
+    'AgenteSeguridad',
+    'MotorTermico',
+    'MotorReglas',
+    'Regla',
+    'PlanificadorAgentes',
+    'AsyncAgenteBase',
+    'AgenteSincronoAsync',
+    'ejecutar_agentes_async',
+    'EjecutorProcesos'
 ]
\ No newline at end of file
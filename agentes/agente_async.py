@@ -0,0 +1,168 @@
+# agentes/agente_async.py - Variante asyncio de los agentes
+import asyncio
+import time
+from configuracion import TIEMPOS_RESPUESTA
+from utilidades.histograma import HistogramaLatencias
+from utilidades.reloj import reloj_real
+
+class AsyncAgenteBase:
+    """Agente cooperativo que corre como corrutina en un bucle de eventos.
+
+    Misma estructura que AgenteBase (inicializar, ejecutar_ciclo, finalizar y
+    estadísticas) pero sin hilo propio: miles de agentes pueden compartir un
+    solo bucle. El evento de parada puede ser un asyncio.Event o un EventoParada.
+    """
+    def __init__(self, nombre, bus_async, evento_parada, tipos=None, objetivos=None, reloj=None):
+        self.nombre = nombre
+        self.bus = bus_async
+        self.evento_parada = evento_parada
+        # Reloj de la lógica del agente, como en AgenteBase (un RelojVirtual en simulaciones)
+        self.reloj = reloj or reloj_real
+        self._tipos = tipos
+        self._objetivos = objetivos
+        self.suscripcion = None
+        self.intervalo_ciclo = TIEMPOS_RESPUESTA.get(nombre, 0.05)
+        self.ultimo_tiempo_procesamiento = self.reloj.time()
+        self.histograma_ciclos = HistogramaLatencias()
+        self.plazo_ciclo = self.intervalo_ciclo
+        self.estadisticas = {
+            'ciclos_ejecutados': 0,
+            'mensajes_enviados': 0,
+            'mensajes_recibidos': 0,
+            'errores': 0,
+            'tiempo_total_ejecucion': 0.0,
+            'plazos_incumplidos': 0
+        }
+
+    def crear_suscripcion(self):
+        """Suscribe el agente al bus (se llama ya dentro del bucle de eventos)"""
+        return self.bus.suscribir(self.nombre, self._tipos, self._objetivos)
+
+    async def enviar_mensaje(self, mensaje):
+        """Publica un mensaje firmado con el nombre del agente"""
+        try:
+            mensaje = dict(mensaje, de=self.nombre, marca_tiempo=self.reloj.time())
+            exito = await self.bus.publicar(mensaje)
+            if exito:
+                self.estadisticas['mensajes_enviados'] += 1
+            return exito
+        except Exception as error:
+            print(f"[{self.nombre}] Error enviando mensaje: {error}")
+            self.estadisticas['errores'] += 1
+            return False
+
+    def recibir_mensajes(self):
+        """Recibe sin esperar todos los mensajes pendientes del agente"""
+        try:
+            mensajes = self.suscripcion.extraer_todos()
+            self.estadisticas['mensajes_recibidos'] += len(mensajes)
+            return mensajes
+        except Exception as error:
+            print(f"[{self.nombre}] Error recibiendo mensajes: {error}")
+            self.estadisticas['errores'] += 1
+            return []
+
+    async def esperar_actividad(self, tiempo_espera):
+        """Espera un mensaje, la parada o el vencimiento del tiempo sin bloquear el bucle"""
+        return await self.suscripcion.esperar(tiempo_espera, self.evento_parada)
+
+    async def ejecutar_ciclo(self):
+        """Ejecuta un ciclo del agente (debe ser implementado por subclases)"""
+        raise NotImplementedError("Los agentes deben implementar el método ejecutar_ciclo")
+
+    async def inicializar(self):
+        """Inicialización del agente (puede ser sobreescrito por subclases)"""
+        print(f"[{self.nombre}] Agente asyncio inicializado")
+
+    async def finalizar(self):
+        """Limpieza antes de terminar (puede ser sobreescrito por subclases)"""
+        print(f"[{self.nombre}] Agente asyncio finalizado")
+
+    def obtener_estadisticas(self):
+        """Retorna las estadísticas del agente con los percentiles de duración de ciclo (µs)"""
+        estadisticas = self.estadisticas.copy()
+        estadisticas['plazo_ciclo'] = self.plazo_ciclo
+        estadisticas['tiempo_ciclo'] = self.histograma_ciclos.resumen()
+        return estadisticas
+
+    async def ejecutar_paso(self):
+        """Ejecuta un único ciclo actualizando estadísticas; retorna False si falló.
+
+        Con ciclos asíncronos la duración incluye lo que el ciclo esperó en
+        sus await, no solo su tiempo de CPU.
+        """
+        ciclo_inicio = time.perf_counter()
+        try:
+            await self.ejecutar_ciclo()
+            exito = True
+        except Exception as error:
+            print(f"[{self.nombre}] Error en ciclo de ejecución: {error}")
+            self.estadisticas['errores'] += 1
+            exito = False
+        ciclo_duracion = time.perf_counter() - ciclo_inicio
+        self.histograma_ciclos.registrar(ciclo_duracion)
+        self.estadisticas['tiempo_total_ejecucion'] += ciclo_duracion
+        if ciclo_duracion > self.plazo_ciclo:
+            self.estadisticas['plazos_incumplidos'] += 1
+        if exito:
+            self.estadisticas['ciclos_ejecutados'] += 1
+            self.ultimo_tiempo_procesamiento = self.reloj.time()
+        return exito
+
+    async def ejecutar(self):
+        """Bucle principal del agente (corrutina)"""
+        # La suscripción necesita el bucle en marcha, por eso se crea aquí
+        self.suscripcion = self.crear_suscripcion()
+        if hasattr(self.evento_parada, 'agregar_oyente'):
+            self.evento_parada.agregar_oyente(self.suscripcion.despertar)
+
+        await self.inicializar()
+        while not self.evento_parada.is_set():
+            ciclo_inicio = self.reloj.time()
+            if not await self.ejecutar_paso():
+                await asyncio.sleep(0.5)  # Pausa más larga en caso de error
+                continue
+
+            # Esperar al próximo ciclo; un mensaje nuevo lo adelanta
+            restante = ciclo_inicio + self.intervalo_ciclo - self.reloj.time()
+            if restante > 0:
+                await self.esperar_actividad(restante)
+            else:
+                await asyncio.sleep(0)  # Ceder el bucle a los demás agentes
+
+        await self.finalizar()
+        if hasattr(self.evento_parada, 'quitar_oyente'):
+            self.evento_parada.quitar_oyente(self.suscripcion.despertar)
+        self.suscripcion.cerrar()
+
+class AgenteSincronoAsync(AsyncAgenteBase):
+    """Adapta un AgenteBase existente para correr en el bucle asyncio.
+
+    Llama a ejecutar_paso() del agente en cada ciclo y usa su buzón, de modo que
+    los agentes actuales pueden moverse al bucle de eventos sin reescribirlos.
+    ejecutar_ciclo corre dentro del bucle, así que debe ser corto y no bloquear.
+    """
+    def __init__(self, agente, bus_async):
+        super().__init__(agente.nombre, bus_async, agente.evento_parada, reloj=agente.reloj)
+        self.agente = agente
+        self.intervalo_ciclo = agente.intervalo_ciclo
+
+    def crear_suscripcion(self):
+        # Reutilizar el buzón que el agente ya tiene suscrito en el bus
+        return self.bus.envolver_buzon(self.nombre, self.agente.buzon)
+
+    async def ejecutar_paso(self):
+        return self.agente.ejecutar_paso()
+
+    async def inicializar(self):
+        self.agente.inicializar()
+
+    async def finalizar(self):
+        self.agente.finalizar()
+
+    def obtener_estadisticas(self):
+        return self.agente.obtener_estadisticas()
+
+async def ejecutar_agentes_async(agentes):
+    """Ejecuta varios agentes asyncio concurrentemente hasta que todos terminen"""
+    await asyncio.gather(*(agente.ejecutar() for agente in agentes))
@@ -1,28 +1,52 @@
 # agentes/agente_base.py - Clase base optimizada para todos los agentes
 import threading
 import time
+from configuracion import TIEMPOS_RESPUESTA, PERFILADOR
+from utilidades.reloj import reloj_real
+from utilidades.histograma import HistogramaLatencias
+from utilidades.perfilador import perfilador
 
 class AgenteBase(threading.Thread):
-    def __init__(self, nombre, bus_mensajes, evento_parada):
+    def __init__(self, nombre, bus_mensajes, evento_parada, tipos=None, objetivos=None, reloj=None):
         super().__init__(daemon=True)
         self.nombre = nombre
         self.bus_mensajes = bus_mensajes
         self.evento_parada = evento_parada
-        self.ultimo_tiempo_procesamiento = time.time()
+        # Reloj de la lógica del agente (marcas de tiempo, esperas entre alertas, etc.);
+        # un RelojVirtual permite simular horas en segundos
+        self.reloj = reloj or reloj_real
+        # Buzón privado: solo llegan los mensajes de los tipos/objetivos suscritos
+        self.buzon = bus_mensajes.suscribir(nombre, tipos=tipos, objetivos=objetivos)
+        # Con un EventoParada la parada despierta al agente aunque esté bloqueado en su buzón
+        if hasattr(evento_parada, 'agregar_oyente'):
+            evento_parada.agregar_oyente(self.buzon.despertar)
+        # Periodo máximo entre ciclos sin mensajes nuevos (también lo usa el planificador)
+        self.intervalo_ciclo = TIEMPOS_RESPUESTA.get(nombre, 0.05)
+        self.ultimo_tiempo_procesamiento = self.reloj.time()
+        # Duración de cada ciclo y perfilador opcional de los ciclos más lentos
+        self.histograma_ciclos = HistogramaLatencias()
+        self.perfilador = perfilador if PERFILADOR['activado'] else None
         self.estadisticas = {
             'ciclos_ejecutados': 0,
             'mensajes_enviados': 0,
             'mensajes_recibidos': 0,
             'errores': 0,
-            'tiempo_total_ejecucion': 0.0
+            'tiempo_total_ejecucion': 0.0,  # Suma de la duración de los ciclos
+            'tiempo_activo': 0.0,           # Tiempo de pared desde que arrancó el bucle
+            'plazos_incumplidos': 0         # Ciclos que duraron más que plazo_ciclo
         }
     
+    @property
+    def plazo_ciclo(self):
+        """Duración máxima aceptable de un ciclo: intervalo_verificacion de su
+        configuración si lo tiene, si no su intervalo_ciclo"""
+        config = getattr(self, 'config', None) or {}
+        return config.get('intervalo_verificacion', self.intervalo_ciclo)
+    
     def enviar_mensaje(self, mensaje):
         """Envía un mensaje con prioridad para mensajes críticos"""
         try:
-            mensaje = dict(mensaje)
-            mensaje['de'] = self.nombre
-            mensaje['marca_tiempo'] = time.time()
+            mensaje = dict(mensaje, de=self.nombre, marca_tiempo=self.reloj.time())
             
             # Prioridad para mensajes críticos (timeout más corto)
             if mensaje.get('tipo') in ['movimiento', 'alerta', 'comando_critico']:
@@ -40,9 +64,9 @@ class AgenteBase(threading.Thread):
             return False
     
     def recibir_mensajes(self):
-        """Recibe todos los mensajes disponibles con manejo de errores"""
+        """Recibe todos los mensajes del buzón del agente con manejo de errores"""
         try:
-            mensajes = self.bus_mensajes.recibir_todos_mensajes()
+            mensajes = self.buzon.extraer_todos()
             self.estadisticas['mensajes_recibidos'] += len(mensajes)
             return mensajes
         except Exception as error:
@@ -50,13 +74,67 @@ class AgenteBase(threading.Thread):
             self.estadisticas['errores'] += 1
             return []
     
+    def despachar_mensajes(self, manejador):
+        """Extrae los mensajes pendientes y llama a manejador(mensaje) con cada uno.
+
+        Además de recibirlos, registra en las trazas del bus cuánto tardó el
+        manejador y el total desde la publicación. Retorna cuántos se despacharon.
+        """
+        try:
+            sobres = self.buzon.extraer_todos_priorizados()
+        except Exception as error:
+            print(f"[{self.nombre}] Error recibiendo mensajes: {error}")
+            self.estadisticas['errores'] += 1
+            return 0
+        self.estadisticas['mensajes_recibidos'] += len(sobres)
+        trazas = getattr(self.bus_mensajes, 'trazas', None)
+        for sobre in sobres:
+            inicio = time.monotonic()
+            manejador(sobre.mensaje)
+            if trazas is not None:
+                trazas.registrar_manejo(sobre, inicio, time.monotonic())
+        return len(sobres)
+    
+    def despachar_lote(self, manejador_lote, cantidad_maxima=None):
+        """Como despachar_mensajes pero llama una sola vez a manejador_lote(mensajes).
+
+        Para agentes que pueden amortizar el costo por mensaje ante ráfagas
+        (p. ej. muchas lecturas de sensores). Extrae hasta `cantidad_maxima`
+        mensajes en orden de prioridad (todos si es None); los que queden se
+        despachan en el ciclo siguiente. En las trazas, todos los mensajes
+        del lote comparten la duración del manejador. Retorna cuántos se despacharon.
+        """
+        try:
+            if cantidad_maxima is None:
+                sobres = self.buzon.extraer_todos_priorizados()
+            else:
+                sobres = self.buzon.extraer_lote_priorizados(cantidad_maxima)
+        except Exception as error:
+            print(f"[{self.nombre}] Error recibiendo mensajes: {error}")
+            self.estadisticas['errores'] += 1
+            return 0
+        if not sobres:
+            return 0
+        self.estadisticas['mensajes_recibidos'] += len(sobres)
+        inicio = time.monotonic()
+        manejador_lote([sobre.mensaje for sobre in sobres])
+        trazas = getattr(self.bus_mensajes, 'trazas', None)
+        if trazas is not None:
+            fin = time.monotonic()
+            for sobre in sobres:
+                trazas.registrar_manejo(sobre, inicio, fin)
+        return len(sobres)
+    
     def dormir_seguro(self, duracion):
-        """Pausa el agente verificando periódicamente si debe detenerse"""
-        intervalo = 0.05  # Intervalo más corto para mejor respuesta
-        tiempo_transcurrido = 0
-        while tiempo_transcurrido < duracion and not self.evento_parada.is_set():
-            time.sleep(intervalo)
-            tiempo_transcurrido += intervalo
+        """Pausa el agente retornando de inmediato si debe detenerse"""
+        self.evento_parada.wait(duracion)
+
+    def esperar_actividad(self, tiempo_espera):
+        """Bloquea hasta que llegue un mensaje, se pida la parada o venza el tiempo.
+
+        Retorna True si hay mensajes esperando en el buzón del agente.
+        """
+        return self.buzon.esperar(tiempo_espera, self.evento_parada)
     
     def ejecutar_ciclo(self):
         """Ejecuta un ciclo del agente (debe ser implementado por subclases)"""
@@ -71,8 +149,38 @@ class AgenteBase(threading.Thread):
         print(f"[{self.nombre}] Agente finalizado")
     
     def obtener_estadisticas(self):
-        """Retorna las estadísticas del agente"""
-        return self.estadisticas.copy()
+        """Retorna las estadísticas del agente con los percentiles de duración de ciclo (µs)"""
+        estadisticas = self.estadisticas.copy()
+        estadisticas['plazo_ciclo'] = self.plazo_ciclo
+        estadisticas['tiempo_ciclo'] = self.histograma_ciclos.resumen()
+        return estadisticas
+    
+    def ejecutar_paso(self):
+        """Ejecuta un único ciclo actualizando estadísticas; retorna False si falló"""
+        ciclo_perfilado = self.perfilador.comenzar_ciclo(self.nombre) if self.perfilador else None
+        ciclo_inicio = time.perf_counter()
+        try:
+            # Ejecutar el ciclo principal del agente
+            self.ejecutar_ciclo()
+            exito = True
+            
+        except Exception as error:
+            print(f"[{self.nombre}] Error en ciclo de ejecución: {error}")
+            self.estadisticas['errores'] += 1
+            exito = False
+        
+        # Actualizar estadísticas (también de los ciclos fallidos: su costo cuenta)
+        ciclo_duracion = time.perf_counter() - ciclo_inicio
+        if ciclo_perfilado is not None:
+            self.perfilador.terminar_ciclo(ciclo_perfilado, ciclo_duracion)
+        self.histograma_ciclos.registrar(ciclo_duracion)
+        self.estadisticas['tiempo_total_ejecucion'] += ciclo_duracion
+        if ciclo_duracion > self.plazo_ciclo:
+            self.estadisticas['plazos_incumplidos'] += 1
+        if exito:
+            self.estadisticas['ciclos_ejecutados'] += 1
+            self.ultimo_tiempo_procesamiento = self.reloj.time()
+        return exito
     
     def ejecutar(self):
         """Bucle principal de ejecución del agente"""
@@ -80,31 +188,21 @@ class AgenteBase(threading.Thread):
         tiempo_inicio = time.time()
         
         while not self.evento_parada.is_set():
-            try:
-                ciclo_inicio = time.time()
-                
-                # Ejecutar el ciclo principal del agente
-                self.ejecutar_ciclo()
-                
-                # Actualizar estadísticas
-                self.estadisticas['ciclos_ejecutados'] += 1
-                ciclo_duracion = time.time() - ciclo_inicio
-                self.estadisticas['tiempo_total_ejecucion'] += ciclo_duracion
-                self.ultimo_tiempo_procesamiento = time.time()
-                
-                # Pequeña pausa para no saturar la CPU (puede ser ajustada por subclases)
-                self.dormir_seguro(0.01)  # 10ms mínimos entre ciclos
-                
-            except Exception as error:
-                print(f"[{self.nombre}] Error en ciclo de ejecución: {error}")
-                self.estadisticas['errores'] += 1
+            ciclo_inicio = time.time()
+            if not self.ejecutar_paso():
                 self.dormir_seguro(0.5)  # Pausa más larga en caso de error
+                continue
+            
+            # Esperar al próximo ciclo; un mensaje nuevo lo adelanta
+            restante = ciclo_inicio + self.intervalo_ciclo - time.time()
+            if restante > 0:
+                self.esperar_actividad(restante)
         
-        # Calcular tiempo total de ejecución
-        tiempo_total = time.time() - tiempo_inicio
-        self.estadisticas['tiempo_total_ejecucion'] = tiempo_total
+        # Tiempo de pared del bucle (tiempo_total_ejecucion conserva la suma de los ciclos)
+        self.estadisticas['tiempo_activo'] = time.time() - tiempo_inicio
         
         self.finalizar()
+        self.bus_mensajes.cancelar_suscripcion(self.nombre)
     
     def run(self):
         """Método principal del hilo (llama a ejecutar)"""
@@ -121,5 +219,5 @@ class AgenteBase(threading.Thread):
     
     def verificar_salud(self):
         """Verifica si el agente está funcionando correctamente"""
-        tiempo_inactivo = time.time() - self.ultimo_tiempo_procesamiento
+        tiempo_inactivo = self.reloj.time() - self.ultimo_tiempo_procesamiento
         return tiempo_inactivo < 5.0  # Considerado saludable si ha procesado en los últimos 5 segundos
\ No newline at end of file
@@ -2,16 +2,19 @@
 from .agente_base import AgenteBase
 from datos_compartidos.estado_sistema import estado_sistema
 from configuracion import CONFIG_AGENTES
+from .motor_reglas import MotorReglas
+from .reglas_hogar import REGLAS_SEGURIDAD
 import random
-import time
 
 class AgenteSeguridad(AgenteBase):
-    def __init__(self, bus_mensajes, evento_parada):
-        super().__init__('seguridad', bus_mensajes, evento_parada)
+    def __init__(self, bus_mensajes, evento_parada, reloj=None):
+        super().__init__('seguridad', bus_mensajes, evento_parada,
+                         tipos=('simular_movimiento', 'movimiento'), objetivos=('seguridad',), reloj=reloj)
         self.config = CONFIG_AGENTES['seguridad']
         self.ultima_alerta = 0
         self.tiempo_entre_alertas = 5  # Reducido a 5 segundos entre alertas
         self.reset_pendiente = False
+        self.reglas = MotorReglas(REGLAS_SEGURIDAD, agente=self, reloj=self.reloj)
     
     def inicializar(self):
         """Inicialización específica del agente de seguridad"""
@@ -23,10 +26,7 @@ class AgenteSeguridad(AgenteBase):
         """Ciclo principal de ejecución - RESPUESTA MUY RÁPIDA"""
         try:
             # PRIMERO procesar mensajes (incluyendo reset) - ORDEN CRÍTICO
-            mensajes = self.recibir_mensajes()
-            if mensajes:
-                for mensaje in mensajes:
-                    self.procesar_mensaje_seguridad(mensaje)
+            self.despachar_lote(self.procesar_lote_seguridad, self.config['lote_mensajes'])
             
             # LUEGO verificar movimiento (menos crítico)
             if random.random() < self.config['probabilidad_movimiento']:
@@ -36,6 +36,20 @@ class AgenteSeguridad(AgenteBase):
             print(f"[Agente Seguridad] Error en ciclo: {error}")
             self.estadisticas['errores'] += 1
     
+    def procesar_lote_seguridad(self, mensajes):
+        """Procesa en orden los mensajes del ciclo; de varias lecturas de movimiento
+        seguidas se evalúa solo la primera positiva (las demás caerían dentro de
+        tiempo_entre_alertas), así una ráfaga de sensores cuesta una evaluación"""
+        movimiento_evaluado = False
+        for mensaje in mensajes:
+            if mensaje.get('tipo') == 'movimiento':
+                if mensaje.get('valor') and not movimiento_evaluado:
+                    self.reglas.procesar_mensaje(mensaje)
+                    movimiento_evaluado = True
+            else:
+                self.procesar_mensaje_seguridad(mensaje)
+                movimiento_evaluado = False
+    
     def procesar_mensaje_seguridad(self, mensaje):
         """Procesa mensajes con RESPUESTA INMEDIATA para reset"""
         tipo_mensaje = mensaje.get('tipo')
@@ -54,7 +68,7 @@ class AgenteSeguridad(AgenteBase):
                 print(f"[Seguridad] Reset de alerta procesado inmediatamente")
         
         elif tipo_mensaje == 'movimiento':
-            self.evaluar_movimiento(mensaje.get('valor'))
+            self.reglas.procesar_mensaje(mensaje)
     
     def detectar_movimiento(self):
         """Detecta movimiento y activa las respuestas correspondientes"""
@@ -75,30 +89,6 @@ class AgenteSeguridad(AgenteBase):
                 'prioridad': 'alta'
             })
     
-    def evaluar_movimiento(self, hay_movimiento):
-        """Evalúa si el movimiento representa una amenaza - CON RESET RÁPIDO"""
-        if not hay_movimiento:
-            return
-        
-        presencia_esperada = estado_sistema.obtener('presencia_esperada')
-        tiempo_actual = time.time()
-        
-        # Solo activar alerta si no hay presencia esperada
-        if not presencia_esperada:
-            # Verificar si ha pasado el tiempo mínimo desde la última alerta
-            if (tiempo_actual - self.ultima_alerta) > self.tiempo_entre_alertas:
-                estado_sistema.actualizar('alerta_seguridad', True)
-                self.ultima_alerta = tiempo_actual
-                estado_sistema.registrar_evento("[Seguridad] ¡ALERTA! Movimiento sin presencia")
-                
-                # Activar luces inmediatamente
-                self.enviar_mensaje({
-                    'tipo': 'comando', 
-                    'objetivo': 'iluminacion', 
-                    'accion': 'activar_luces',
-                    'prioridad': 'alta'
-                })
-    
     def finalizar(self):
         """Limpieza antes de terminar"""
         estado_sistema.actualizar('alerta_seguridad', False)  # Asegurar que la alerta se resetee
@@ -1,47 +1,40 @@
 # agentes/agente_temperatura.py - Agente optimizado para respuesta rápida
 from .agente_base import AgenteBase
+from .motor_termico import MotorTermico, numpy_disponible
 from datos_compartidos.estado_sistema import estado_sistema
+from datos_compartidos.estado_zonas import estado_zonas
 from configuracion import CONFIG_AGENTES
 import random
-import time
 
 class AgenteTemperatura(AgenteBase):
-    def __init__(self, bus_mensajes, evento_parada):
-        super().__init__('temperatura', bus_mensajes, evento_parada)
+    def __init__(self, bus_mensajes, evento_parada, reloj=None):
+        super().__init__('temperatura', bus_mensajes, evento_parada,
+                         objetivos=('temperatura',), reloj=reloj)
         self.config = CONFIG_AGENTES['temperatura']
-        self.ultimo_ajuste = time.time()
+        self.ultimo_ajuste = self.reloj.time()
+        # Simulación vectorizada de las zonas de estado_zonas (solo si NumPy está instalado)
+        self.motor_zonas = None
+        self.ultimo_paso_zonas = self.reloj.time()
     
-    def ejecutar(self):
-        while not self.evento_parada.is_set():
-            try:
-                # Obtener estado actual
-                estado = estado_sistema.obtener_todo()
-                temperatura_actual = estado['temperatura']
-                calefaccion_activa = estado['calefaccion_activada']
-                ventilador_activo = estado['ventilador_activado']
-                
-                # Aplicar variación natural de temperatura (más frecuente pero menor)
-                variacion = random.uniform(*self.config['variacion_temperatura'])
-                nueva_temperatura = temperatura_actual + variacion
-                estado_sistema.actualizar('temperatura', nueva_temperatura)
-                
-                # Lógica de control de temperatura (RESPUESTA RÁPIDA)
-                self.controlar_temperatura(nueva_temperatura, calefaccion_activa, ventilador_activo)
-                
-                # Procesar mensajes recibidos
-                mensajes = self.recibir_mensajes()
-                for mensaje in mensajes:
-                    self.procesar_mensaje_temperatura(mensaje)
-                
-                # Aplicar efectos de los sistemas HVAC (actualización constante)
-                self.aplicar_efectos_hvac()
-                
-                # Pausa optimizada
-                self.dormir_seguro(0.3)  # 300ms en lugar de 1.5 segundos
-                
-            except Exception as error:
-                print(f"[Agente Temperatura] Error: {error}")
-                self.dormir_seguro(0.5)
+    def ejecutar_ciclo(self):
+        """Ciclo de control de temperatura (periodo: TIEMPOS_RESPUESTA['temperatura'])"""
+        # Aplicar variación natural de temperatura (más frecuente pero menor)
+        variacion = random.uniform(*self.config['variacion_temperatura'])
+        nueva_temperatura = estado_sistema.modificar('temperatura', lambda temperatura: temperatura + variacion)
+        calefaccion_activa, ventilador_activo = estado_sistema.leer('calefaccion_activada', 'ventilador_activado')
+        
+        # Lógica de control de temperatura (RESPUESTA RÁPIDA)
+        self.controlar_temperatura(nueva_temperatura, calefaccion_activa, ventilador_activo)
+        
+        # Procesar mensajes recibidos
+        self.despachar_mensajes(self.procesar_mensaje_temperatura)
+        
+        # Aplicar efectos de los sistemas HVAC (actualización constante)
+        self.aplicar_efectos_hvac()
+        
+        # Avanzar todas las zonas en un solo paso vectorizado
+        if numpy_disponible() and len(estado_zonas):
+            self.simular_zonas()
     
     def controlar_temperatura(self, temperatura, calefaccion_activa, ventilador_activo):
         """Controla los sistemas de temperatura con respuesta inmediata"""
@@ -71,6 +64,10 @@ class AgenteTemperatura(AgenteBase):
             mensaje.get('tipo') == 'comando'):
             
             accion = mensaje.get('accion')
+            if mensaje.get('zona') is not None:
+                self.procesar_comando_zona(mensaje['zona'], accion)
+                return
+            
             if accion == 'activar_calefaccion':
                 estado_sistema.actualizar('calefaccion_activada', True)
             elif accion == 'desactivar_calefaccion':
@@ -82,15 +79,61 @@ class AgenteTemperatura(AgenteBase):
             
             estado_sistema.registrar_evento(f"[Temperatura] Comando ejecutado: {accion}")
     
+    def procesar_comando_zona(self, zona, accion):
+        """Ejecuta un comando de climatización dirigido a una zona concreta"""
+        acciones = {
+            'activar_calefaccion': ('calefaccion_activada', True),
+            'desactivar_calefaccion': ('calefaccion_activada', False),
+            'activar_ventilador': ('ventilador_activado', True),
+            'desactivar_ventilador': ('ventilador_activado', False)
+        }
+        if zona not in estado_zonas or accion not in acciones:
+            estado_sistema.registrar_evento(f"[Temperatura] Comando inválido para zona {zona}: {accion}")
+            return
+        atributo, valor = acciones[accion]
+        estado_zonas.actualizar(zona, atributo, valor)
+        estado_sistema.registrar_evento(f"[Temperatura] Comando ejecutado en {zona}: {accion}")
+    
     def aplicar_efectos_hvac(self):
-        """Aplica los efectos de calefacción y ventilación"""
-        estado_actual = estado_sistema.obtener_todo()
-        temperatura_actual = estado_actual['temperatura']
+        """Aplica los efectos de calefacción y ventilación (potencias por segundo)"""
+        ahora = self.reloj.time()
+        # Los ciclos pueden adelantarse al llegar un mensaje: escalar por el tiempo real
+        transcurrido = min(ahora - self.ultimo_ajuste, 1.0)
+        self.ultimo_ajuste = ahora
+        
+        # Leer actuadores y escribir la temperatura en una sola transacción:
+        # así no se pierden los cambios hechos entre medio (p. ej. teclas T/G)
+        with estado_sistema.transaccion('temperatura', 'calefaccion_activada', 'ventilador_activado') as estado:
+            efecto = 0.0
+            if estado['calefaccion_activada']:
+                efecto += self.config['potencia_calefaccion'] * transcurrido
+            if estado['ventilador_activado']:
+                efecto -= self.config['potencia_enfriamiento'] * transcurrido
+            if efecto:
+                estado['temperatura'] = estado['temperatura'] + efecto
+    
+    def simular_zonas(self):
+        """Avanza la temperatura de todas las zonas y registra los actuadores que cambiaron"""
+        ahora = self.reloj.time()
+        transcurrido = min(ahora - self.ultimo_paso_zonas, 1.0)
+        self.ultimo_paso_zonas = ahora
+        
+        if self.motor_zonas is None or self.motor_zonas.cantidad != len(estado_zonas):
+            # Semilla tomada de `random`: con random.seed() la simulación es reproducible
+            self.motor_zonas = MotorTermico.desde_estado_zonas(estado_zonas, config=self.config,
+                                                               semilla=random.getrandbits(32))
+        else:
+            # Releer actuadores para respetar los comandos recibidos por zona
+            self.motor_zonas.cargar_de(estado_zonas)
         
-        if estado_actual['calefaccion_activada']:
-            nueva_temp = temperatura_actual + self.config['potencia_calefaccion'] * 0.3
-            estado_sistema.actualizar('temperatura', nueva_temp)
+        cambios = self.motor_zonas.paso(transcurrido)
+        self.motor_zonas.guardar_en(estado_zonas, cambios)
         
-        if estado_actual['ventilador_activado']:
-            nueva_temp = temperatura_actual - self.config['potencia_enfriamiento'] * 0.3
-            estado_sistema.actualizar('temperatura', nueva_temp)
\ No newline at end of file
+        for atributo, indices in cambios.items():
+            if len(indices) > 5:
+                estado_sistema.registrar_evento(f"[Temperatura] {atributo}: {len(indices)} zonas cambiaron")
+                continue
+            valores = self.motor_zonas.actuador(atributo)
+            for indice in indices.tolist():
+                estado = "activada" if valores[indice] else "desactivada"
+                estado_sistema.registrar_evento(f"[Temperatura] Zona {estado_zonas.id_zona(indice)}: {atributo} {estado}")
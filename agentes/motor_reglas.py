@@ -0,0 +1,201 @@
+# agentes/motor_reglas.py - Motor de reglas declarativas indexadas por clave de estado y tipo de mensaje
+import heapq
+import itertools
+import threading
+from datos_compartidos.estado_sistema import estado_sistema
+from utilidades.reloj import reloj_real
+
+class Regla:
+    """Regla declarativa: si condicion(contexto) es verdadera se ejecuta accion(contexto).
+
+    `claves` son las claves del estado cuyo cambio la evalúa y `tipos` los
+    tipos de mensaje que la evalúan (opcionalmente solo con ese `objetivo`).
+    Una regla deshabilitada no entra en los índices del motor.
+    """
+    __slots__ = ('nombre', 'condicion', 'accion', 'claves', 'tipos', 'objetivo', 'habilitada')
+
+    def __init__(self, nombre, condicion, accion, claves=(), tipos=(), objetivo=None, habilitada=True):
+        self.nombre = nombre
+        self.condicion = condicion
+        self.accion = accion
+        self.claves = tuple(claves)
+        self.tipos = tuple(tipos)
+        self.objetivo = objetivo
+        self.habilitada = habilitada
+
+    def __repr__(self):
+        return f"Regla({self.nombre!r}, claves={self.claves}, tipos={self.tipos})"
+
+class ContextoRegla:
+    """Lo que ve una regla al evaluarse.
+
+    estado: instantánea vigente del estado (se toma de nuevo para cada regla,
+    así ve lo que escribieron las anteriores); claves: claves cambiadas que la
+    dispararon; mensaje: el mensaje que la disparó (o None); ahora: tiempo del
+    reloj del motor; agente: el dueño del motor.
+    """
+    __slots__ = ('motor', 'agente', 'estado', 'claves', 'mensaje', 'ahora', '_regla')
+
+    def __init__(self, motor, claves=frozenset(), mensaje=None):
+        self.motor = motor
+        self.agente = motor.agente
+        self.estado = None
+        self.claves = claves
+        self.mensaje = mensaje
+        self.ahora = motor.reloj.time()
+        self._regla = None
+
+    def __getitem__(self, clave):
+        return self.estado[clave]
+
+    def cambio(self, clave):
+        """True si `clave` está entre las que cambiaron y dispararon la evaluación"""
+        return clave in self.claves
+
+    def reevaluar_en(self, segundos):
+        """Vuelve a evaluar la regla actual dentro de `segundos` (p. ej. para esperas por inactividad)"""
+        self.motor.programar(self._regla, self.ahora + segundos)
+
+class MotorReglas:
+    """Evalúa solo las reglas afectadas por cada cambio de estado o mensaje.
+
+    Las reglas se compilan en dos índices: clave del estado -> reglas y
+    (tipo, objetivo) -> reglas, así que el costo por evento depende de
+    cuántas reglas lo leen y no del total de reglas. Los cambios de estado se
+    marcan desde el callback de suscribir() (cualquier hilo) y se evalúan en
+    procesar_pendientes(), en el hilo del agente: cada regla afectada se
+    evalúa una vez aunque hayan cambiado varias de sus claves. Los mensajes
+    se evalúan al llegar con procesar_mensaje().
+    """
+    def __init__(self, reglas=(), agente=None, reloj=None):
+        self.agente = agente
+        self.reloj = reloj or reloj_real
+        self._reglas = []
+        self._orden = {}         # regla -> posición (orden de declaración)
+        self._por_clave = {}     # clave -> tupla de reglas
+        self._por_mensaje = {}   # (tipo, objetivo o None) -> tupla de reglas
+        self._bloqueo = threading.Lock()
+        self._pendientes = set()
+        self._temporizadores = []  # heap de (instante, desempate, regla)
+        self._programadas = {}     # regla -> instante más próximo programado
+        self._desempate = itertools.count()
+        self.estadisticas = {'evaluaciones': 0, 'disparos': 0, 'errores': 0}
+        self.agregar(*reglas)
+
+    def agregar(self, *reglas):
+        """Agrega reglas (las deshabilitadas se ignoran) y recompila los índices una vez"""
+        with self._bloqueo:
+            for regla in reglas:
+                if regla.habilitada:
+                    self._orden[regla] = len(self._reglas)
+                    self._reglas.append(regla)
+            self._compilar()
+
+    def quitar(self, nombre):
+        with self._bloqueo:
+            self._reglas = [regla for regla in self._reglas if regla.nombre != nombre]
+            self._orden = {regla: posicion for posicion, regla in enumerate(self._reglas)}
+            self._compilar()
+
+    def _compilar(self):
+        """Reconstruye los índices (con el bloqueo tomado; copia en escritura como las rutas del bus)"""
+        por_clave = {}
+        por_mensaje = {}
+        for regla in self._reglas:
+            for clave in regla.claves:
+                por_clave.setdefault(clave, []).append(regla)
+            for tipo in regla.tipos:
+                por_mensaje.setdefault((tipo, regla.objetivo), []).append(regla)
+        self._por_clave = {clave: tuple(reglas) for clave, reglas in por_clave.items()}
+        self._por_mensaje = {clave: tuple(reglas) for clave, reglas in por_mensaje.items()}
+
+    def claves(self):
+        """Claves del estado que leen las reglas (para suscribirse solo a ellas)"""
+        return tuple(self._por_clave)
+
+    def tipos(self):
+        return tuple({tipo for tipo, _ in self._por_mensaje})
+
+    def __len__(self):
+        return len(self._reglas)
+
+    # --- Disparadores ---
+
+    def marcar_cambio(self, clave, valor=None, version=None):
+        """Callback para estado_sistema.suscribir(): anota la clave para el próximo procesar_pendientes()"""
+        if clave in self._por_clave:
+            with self._bloqueo:
+                self._pendientes.add(clave)
+
+    def marcar_todas(self):
+        """Hace que la próxima pasada evalúe todas las reglas con claves (p. ej. al arrancar)"""
+        with self._bloqueo:
+            self._pendientes.update(self._por_clave)
+
+    def programar(self, regla, instante):
+        if regla is None:
+            return
+        with self._bloqueo:
+            previsto = self._programadas.get(regla)
+            if previsto is not None and previsto <= instante:
+                return
+            self._programadas[regla] = instante
+            heapq.heappush(self._temporizadores, (instante, next(self._desempate), regla))
+
+    def procesar_pendientes(self):
+        """Evalúa una vez cada regla afectada por las claves cambiadas o con temporizador vencido.
+
+        Retorna cuántas reglas se evaluaron.
+        """
+        ahora = self.reloj.time()
+        with self._bloqueo:
+            pendientes, self._pendientes = self._pendientes, set()
+            vencidas = set()
+            while self._temporizadores and self._temporizadores[0][0] <= ahora:
+                instante, _, regla = heapq.heappop(self._temporizadores)
+                if self._programadas.get(regla) == instante:
+                    del self._programadas[regla]
+                    vencidas.add(regla)
+        if not pendientes and not vencidas:
+            return 0
+
+        afectadas = set(vencidas)
+        for clave in pendientes:
+            afectadas.update(self._por_clave.get(clave, ()))
+        orden = self._orden
+        contexto = ContextoRegla(self, frozenset(pendientes))
+        for regla in sorted(afectadas, key=lambda regla: orden.get(regla, 0)):
+            self._evaluar(regla, contexto)
+        return len(afectadas)
+
+    def procesar_mensaje(self, mensaje):
+        """Evalúa las reglas indexadas por el tipo (y objetivo) del mensaje; retorna cuántas"""
+        tipo = mensaje.get('tipo')
+        reglas = self._por_mensaje.get((tipo, None), ())
+        objetivo = mensaje.get('objetivo')
+        if objetivo is not None:
+            reglas = reglas + self._por_mensaje.get((tipo, objetivo), ())
+        if not reglas:
+            return 0
+        contexto = ContextoRegla(self, mensaje=mensaje)
+        for regla in reglas:
+            self._evaluar(regla, contexto)
+        return len(reglas)
+
+    def _evaluar(self, regla, contexto):
+        self.estadisticas['evaluaciones'] += 1
+        contexto.estado = estado_sistema.obtener_todo()
+        contexto._regla = regla
+        try:
+            if regla.condicion(contexto):
+                self.estadisticas['disparos'] += 1
+                regla.accion(contexto)
+        except Exception as error:
+            self.estadisticas['errores'] += 1
+            print(f"[MotorReglas] Error en regla '{regla.nombre}': {error}")
+
+    def obtener_estadisticas(self):
+        estadisticas = dict(self.estadisticas)
+        estadisticas['reglas'] = len(self._reglas)
+        estadisticas['temporizadores'] = len(self._programadas)
+        return estadisticas
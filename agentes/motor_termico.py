@@ -0,0 +1,98 @@
+# agentes/motor_termico.py - Simulación térmica vectorizada para muchas zonas
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él solo se simula la temperatura global
+    np = None
+
+from configuracion import CONFIG_AGENTES
+
+def numpy_disponible():
+    return np is not None
+
+class MotorTermico:
+    """Avanza la temperatura de N zonas a la vez con arrays de NumPy.
+
+    Cada paso aplica, sobre todas las zonas y sin bucles de Python:
+    variación aleatoria, control por umbrales (misma lógica que
+    AgenteTemperatura.controlar_temperatura, evaluada como máscaras),
+    efecto de calefacción/ventilador escalado por el tiempo transcurrido y
+    acoplamiento térmico entre zonas vecinas. Retorna solo las zonas cuyo
+    actuador cambió de estado.
+    """
+    def __init__(self, cantidad, config=None, vecinos=None, semilla=None):
+        if np is None:
+            raise ImportError("MotorTermico requiere NumPy (pip install numpy)")
+        self.config = config or CONFIG_AGENTES['temperatura']
+        self.cantidad = cantidad
+        self.temperatura = np.full(cantidad, 22.0)
+        self.calefaccion = np.zeros(cantidad, dtype=bool)
+        self.ventilador = np.zeros(cantidad, dtype=bool)
+        self.aleatorio = np.random.default_rng(semilla)
+        self.definir_vecinos(vecinos)
+
+    def definir_vecinos(self, vecinos):
+        """Pares (i, j) de zonas que intercambian calor (array de forma (M, 2) o lista de pares)"""
+        pares = np.asarray(vecinos if vecinos is not None else [], dtype=np.intp).reshape(-1, 2)
+        self._origen = pares[:, 0].copy()
+        self._destino = pares[:, 1].copy()
+
+    def paso(self, transcurrido):
+        """Avanza `transcurrido` segundos; retorna {actuador: índices de zonas que cambiaron}"""
+        config = self.config
+        temperatura = self.temperatura
+
+        # Variación natural (por ciclo, igual que el agente escalar)
+        temperatura += self.aleatorio.uniform(*config['variacion_temperatura'], self.cantidad)
+
+        # Control por umbrales: las tres regiones son disjuntas, como la cadena if/elif
+        encender_calefaccion = (temperatura < config['temp_minima']) & ~self.calefaccion
+        encender_ventilador = (temperatura > config['temp_maxima']) & ~self.ventilador
+        optima = (temperatura >= config['temp_optima_min']) & (temperatura <= config['temp_optima_max'])
+        cambio_calefaccion = encender_calefaccion | (optima & self.calefaccion)
+        cambio_ventilador = encender_ventilador | (optima & self.ventilador)
+        self.calefaccion ^= cambio_calefaccion
+        self.ventilador ^= cambio_ventilador
+
+        # Efecto HVAC en grados por segundo
+        temperatura += self.calefaccion * (config['potencia_calefaccion'] * transcurrido)
+        temperatura -= self.ventilador * (config['potencia_enfriamiento'] * transcurrido)
+
+        # Acoplamiento: flujo proporcional a la diferencia entre vecinas, acumulado con bincount
+        acoplamiento = config.get('acoplamiento_zonas', 0.0)
+        if acoplamiento and len(self._origen):
+            flujo = (temperatura[self._destino] - temperatura[self._origen]) * (acoplamiento * transcurrido)
+            temperatura += (np.bincount(self._origen, weights=flujo, minlength=self.cantidad) -
+                            np.bincount(self._destino, weights=flujo, minlength=self.cantidad))
+
+        return {
+            'calefaccion_activada': np.flatnonzero(cambio_calefaccion),
+            'ventilador_activado': np.flatnonzero(cambio_ventilador)
+        }
+
+    def cargar_de(self, estado_zonas):
+        """Toma temperaturas y actuadores actuales de un EstadoZonas (p. ej. tras comandos)"""
+        self.temperatura = np.frombuffer(estado_zonas.copiar_columna('temperatura'), dtype=np.float64).copy()
+        self.calefaccion = np.frombuffer(estado_zonas.copiar_columna('calefaccion_activada'), dtype=np.uint8).astype(bool)
+        self.ventilador = np.frombuffer(estado_zonas.copiar_columna('ventilador_activado'), dtype=np.uint8).astype(bool)
+        self.cantidad = len(self.temperatura)
+
+    def guardar_en(self, estado_zonas, cambios):
+        """Escribe la columna de temperatura y solo los actuadores que cambiaron"""
+        estado_zonas.escribir_columna('temperatura', self.temperatura)
+        for atributo, indices in cambios.items():
+            if len(indices):
+                estado_zonas.escribir_columna(atributo, self.actuador(atributo)[indices].tolist(), indices.tolist())
+
+    def actuador(self, atributo):
+        """Array booleano de un actuador ('calefaccion_activada' o 'ventilador_activado')"""
+        return self.calefaccion if atributo == 'calefaccion_activada' else self.ventilador
+
+    @classmethod
+    def desde_estado_zonas(cls, estado_zonas, config=None, semilla=None):
+        """Crea un motor para las zonas de un EstadoZonas; las zonas consecutivas de un hogar son vecinas"""
+        motor = cls(len(estado_zonas), config=config, semilla=semilla)
+        motor.cargar_de(estado_zonas)
+        hogares = np.frombuffer(estado_zonas.copiar_hogares(), dtype=np.uint32)
+        origen = np.flatnonzero(hogares[:-1] == hogares[1:])
+        motor.definir_vecinos(np.column_stack((origen, origen + 1)))
+        return motor
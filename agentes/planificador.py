@@ -0,0 +1,206 @@
+# agentes/planificador.py - Planificador de un solo hilo con rueda de temporización
+import threading
+from configuracion import PLANIFICADOR
+from utilidades.reloj import reloj_real
+
+class EntradaPlanificada:
+    """Agente registrado en la rueda junto con sus métricas de puntualidad"""
+    __slots__ = ('agente', 'periodo_ticks', 'tick_objetivo', 'ciclos',
+                 'jitter_total', 'jitter_maximo', 'desbordes', 'ciclos_omitidos')
+
+    def __init__(self, agente, periodo_ticks, tick_objetivo):
+        self.agente = agente
+        self.periodo_ticks = periodo_ticks
+        self.tick_objetivo = tick_objetivo
+        self.ciclos = 0
+        self.jitter_total = 0.0
+        self.jitter_maximo = 0.0
+        self.desbordes = 0          # Ciclos que duraron más que su periodo
+        self.ciclos_omitidos = 0    # Periodos saltados por ir atrasado
+
+class PlanificadorAgentes(threading.Thread):
+    """Ejecuta el ejecutar_ciclo de muchos agentes desde un único hilo.
+
+    Los agentes se ubican en una rueda de temporización (hashed timing wheel)
+    de `ranuras` posiciones que avanza cada `resolucion` segundos; cada agente
+    se reprograma según su intervalo_ciclo (tomado de TIEMPOS_RESPUESTA). Así
+    cientos de agentes comparten un hilo en lugar de tener uno cada uno.
+    Los agentes se crean normalmente pero no se les llama a start().
+    Con un RelojVirtual, simular() ejecuta los ciclos sin esperas.
+    """
+    def __init__(self, evento_parada, resolucion=None, ranuras=None, reloj=None):
+        super().__init__(daemon=True, name='planificador_agentes')
+        self.evento_parada = evento_parada
+        self.reloj = reloj or reloj_real
+        self.resolucion = resolucion or PLANIFICADOR['resolucion']
+        self.ranuras = ranuras or PLANIFICADOR['ranuras']
+        self._rueda = [[] for _ in range(self.ranuras)]
+        self._entradas = {}
+        self._bloqueo = threading.Lock()
+        self._tick_actual = 0
+        self._inicio = None
+        self.estadisticas = {
+            'ticks': 0,
+            'ciclos_ejecutados': 0,
+            'desbordes': 0,
+            'ciclos_omitidos': 0
+        }
+
+    def agregar_agente(self, agente):
+        """Registra un agente; su primer ciclo se ejecuta en el próximo tick"""
+        periodo_ticks = max(1, round(agente.intervalo_ciclo / self.resolucion))
+        with self._bloqueo:
+            entrada = EntradaPlanificada(agente, periodo_ticks, self._tick_actual + 1)
+            self._entradas[agente.nombre] = entrada
+            self._programar(entrada)
+            iniciado = self._inicio is not None
+        if iniciado:
+            agente.inicializar()
+        return entrada
+
+    def quitar_agente(self, nombre):
+        """Retira un agente; se descarta de la rueda cuando su ranura se visita"""
+        with self._bloqueo:
+            entrada = self._entradas.pop(nombre, None)
+        if entrada is not None:
+            entrada.agente.finalizar()
+
+    def _programar(self, entrada):
+        self._rueda[entrada.tick_objetivo % self.ranuras].append(entrada)
+
+    def _procesar_tick(self, tick):
+        """Ejecuta las entradas vencidas de la ranura del tick y las reprograma"""
+        with self._bloqueo:
+            indice = tick % self.ranuras
+            ranura = self._rueda[indice]
+            self._rueda[indice] = []
+            # Entradas de vueltas futuras de la rueda se quedan en su ranura
+            vencidas = []
+            for entrada in ranura:
+                if self._entradas.get(entrada.agente.nombre) is not entrada:
+                    continue
+                if entrada.tick_objetivo <= tick:
+                    vencidas.append(entrada)
+                else:
+                    self._rueda[indice].append(entrada)
+
+        for entrada in vencidas:
+            if self.evento_parada.is_set():
+                return
+            self._ejecutar_entrada(entrada, tick)
+
+    def _ejecutar_entrada(self, entrada, tick):
+        programado = self._inicio + entrada.tick_objetivo * self.resolucion
+        inicio_ciclo = self.reloj.monotonic()
+        jitter = max(0.0, inicio_ciclo - programado)
+
+        entrada.agente.ejecutar_paso()
+        duracion = self.reloj.monotonic() - inicio_ciclo
+
+        entrada.ciclos += 1
+        entrada.jitter_total += jitter
+        entrada.jitter_maximo = max(entrada.jitter_maximo, jitter)
+        self.estadisticas['ciclos_ejecutados'] += 1
+        if duracion > entrada.agente.intervalo_ciclo:
+            entrada.desbordes += 1
+            self.estadisticas['desbordes'] += 1
+
+        # Reprogramar sin acumular ráfagas: los periodos ya vencidos se omiten
+        tick_actual = max(tick, int((self.reloj.monotonic() - self._inicio) / self.resolucion))
+        proximo = entrada.tick_objetivo + entrada.periodo_ticks
+        if proximo <= tick_actual:
+            omitidos = (tick_actual - proximo) // entrada.periodo_ticks + 1
+            entrada.ciclos_omitidos += omitidos
+            self.estadisticas['ciclos_omitidos'] += omitidos
+            proximo += omitidos * entrada.periodo_ticks
+
+        with self._bloqueo:
+            entrada.tick_objetivo = proximo
+            if self._entradas.get(entrada.agente.nombre) is entrada:
+                self._programar(entrada)
+
+    def ejecutar(self):
+        """Bucle principal: avanza la rueda un tick por cada `resolucion` segundos"""
+        self._iniciar()
+        while not self.evento_parada.is_set():
+            tick = self._tick_actual + 1
+            restante = self._inicio + tick * self.resolucion - self.reloj.monotonic()
+            if restante > 0 and self.evento_parada.wait(restante):
+                break
+            self._tick_actual = tick
+            self.estadisticas['ticks'] += 1
+            try:
+                self._procesar_tick(tick)
+            except Exception as error:
+                print(f"[Planificador] Error procesando tick {tick}: {error}")
+
+        self.cerrar()
+
+    def _iniciar(self):
+        """Fija el instante cero de la rueda e inicializa los agentes (una sola vez)"""
+        with self._bloqueo:
+            if self._inicio is not None:
+                return
+            self._inicio = self.reloj.monotonic()
+            agentes = [entrada.agente for entrada in self._entradas.values()]
+        for agente in agentes:
+            agente.inicializar()
+
+    def simular(self, duracion):
+        """Ejecuta `duracion` segundos de tiempo virtual lo más rápido posible.
+
+        Requiere un RelojVirtual: en lugar de esperar cada tick, el reloj salta
+        directamente al próximo ciclo programado. Puede llamarse varias veces
+        para avanzar por tramos; al terminar se debe llamar a cerrar().
+        """
+        if not getattr(self.reloj, 'virtual', False):
+            raise ValueError("simular() requiere un reloj virtual")
+        self._iniciar()
+        fin = self.reloj.monotonic() + duracion
+        tick_final = int((fin - self._inicio) / self.resolucion)
+
+        while not self.evento_parada.is_set():
+            with self._bloqueo:
+                tick = min((entrada.tick_objetivo for entrada in self._entradas.values()), default=None)
+            if tick is None or tick > tick_final:
+                break
+            self.reloj.avanzar_hasta(self._inicio + tick * self.resolucion)
+            self.estadisticas['ticks'] += 1
+            self._tick_actual = tick
+            try:
+                self._procesar_tick(tick)
+            except Exception as error:
+                print(f"[Planificador] Error procesando tick {tick}: {error}")
+
+        self.reloj.avanzar_hasta(fin)
+        self._tick_actual = max(self._tick_actual, tick_final)
+
+    def cerrar(self):
+        """Finaliza los agentes y cancela sus suscripciones al bus"""
+        with self._bloqueo:
+            entradas = list(self._entradas.values())
+        for entrada in entradas:
+            entrada.agente.finalizar()
+            entrada.agente.bus_mensajes.cancelar_suscripcion(entrada.agente.nombre)
+
+    def run(self):
+        """Método principal del hilo (llama a ejecutar)"""
+        self.ejecutar()
+
+    def obtener_estadisticas(self):
+        """Estadísticas globales y de puntualidad por agente (jitter en segundos)"""
+        with self._bloqueo:
+            entradas = list(self._entradas.values())
+        estadisticas = self.estadisticas.copy()
+        estadisticas['agentes'] = {
+            entrada.agente.nombre: {
+                'periodo': entrada.periodo_ticks * self.resolucion,
+                'ciclos': entrada.ciclos,
+                'jitter_promedio': entrada.jitter_total / entrada.ciclos if entrada.ciclos else 0.0,
+                'jitter_maximo': entrada.jitter_maximo,
+                'desbordes': entrada.desbordes,
+                'ciclos_omitidos': entrada.ciclos_omitidos
+            }
+            for entrada in entradas
+        }
+        return estadisticas
@@ -0,0 +1,141 @@
+# agentes/procesos.py - Ejecución de cada agente en su propio proceso
+import multiprocessing
+import queue
+import sys
+import threading
+from agentes.agente_temperatura import AgenteTemperatura
+from agentes.agente_iluminacion import AgenteIluminacion
+from agentes.agente_seguridad import AgenteSeguridad
+from datos_compartidos.bus_mensajes import bus_mensajes
+from datos_compartidos.bus_procesos import PuenteBus
+from datos_compartidos.estado_compartido import EstadoCompartido, instalar_estado
+from datos_compartidos.evento_parada import EventoParada
+from utilidades.perfilador import perfilador
+
+# Agentes que pueden correr en un proceso aparte (por nombre, para crearlos en el hijo)
+AGENTES_PROCESO = {
+    'temperatura': AgenteTemperatura,
+    'iluminacion': AgenteIluminacion,
+    'seguridad': AgenteSeguridad
+}
+
+def ejecutar_proceso(nombre, estado, extremo, parada, resultados, perfilar=False):
+    """Punto de entrada del proceso hijo: corre un agente hasta que se pida la parada.
+
+    El agente no sabe que está en otro proceso: usa estado_sistema y
+    bus_mensajes como siempre, pero el estado es el bloque compartido y el
+    bus local está conectado al del proceso principal.
+    """
+    instalar_estado(estado)
+    extremo.conectar(bus_mensajes)
+
+    evento_parada = EventoParada()
+    agente = AGENTES_PROCESO[nombre](bus_mensajes, evento_parada)
+    extremo.anunciar_rutas()
+    if perfilar:
+        agente.perfilador = perfilador
+        perfilador.iniciar()
+
+    def vigilar_parada():
+        # Terminar también si el proceso principal murió sin activar la parada
+        padre = multiprocessing.parent_process()
+        while not parada.wait(1.0):
+            if padre is not None and not padre.is_alive():
+                break
+        evento_parada.set()
+    threading.Thread(target=vigilar_parada, daemon=True, name='vigilar-parada').start()
+
+    agente.start()
+    agente.join()
+
+    informe = None
+    if perfilar:
+        perfilador.detener()
+        informe = perfilador.formatear()
+    resultados.put((nombre, agente.obtener_estadisticas(), informe))
+    extremo.cerrar()
+    estado.cerrar()
+
+class EjecutorProcesos:
+    """Lanza un proceso por agente con estado y bus compartidos con el principal.
+
+    Al iniciar copia el estado actual a un EstadoCompartido y lo instala como
+    estado_sistema también en este proceso (la interfaz lo lee igual que
+    antes), y conecta bus_mensajes con los procesos mediante un PuenteBus.
+    Los procesos se crean con 'spawn': cada uno importa el sistema desde cero,
+    así que estado_zonas y las demás instancias globales no compartidas
+    quedan propias de cada proceso.
+    """
+    def __init__(self, evento_parada, agentes=None, bus=None, perfilar=False):
+        self.nombres = tuple(agentes or AGENTES_PROCESO)
+        self.bus = bus or bus_mensajes
+        self.perfilar = perfilar
+        self._contexto = multiprocessing.get_context('spawn')
+        self._parada = self._contexto.Event()
+        self._resultados = self._contexto.Queue()
+        self.estado = None
+        self.puente = None
+        self.procesos = {}
+        self.estadisticas = {}
+        self.informes = {}
+        self._estado_anterior = None
+        evento_parada.agregar_oyente(self._parada.set)
+
+    def iniciar(self):
+        """Crea el estado compartido y los procesos; retorna los procesos a esperar"""
+        # El paquete datos_compartidos tapa el módulo estado_sistema con la instancia
+        actual = sys.modules['datos_compartidos.estado_sistema'].estado_sistema
+        self.estado = EstadoCompartido(dict(actual.obtener_todo()), self._contexto)
+        self._estado_anterior = instalar_estado(self.estado)
+        self.puente = PuenteBus(self.bus, self._contexto)
+        self.puente.iniciar()
+
+        for nombre in self.nombres:
+            proceso = self._contexto.Process(
+                target=ejecutar_proceso, name=f'agente-{nombre}', daemon=True,
+                args=(nombre, self.estado, self.puente.crear_extremo(nombre),
+                      self._parada, self._resultados, self.perfilar))
+            proceso.start()
+            self.procesos[nombre] = proceso
+        return list(self.procesos.values())
+
+    def detener(self):
+        self._parada.set()
+
+    def cerrar(self, tiempo_espera=2.0):
+        """Espera a los procesos, recoge sus estadísticas y libera el estado compartido.
+
+        El estado final se copia de vuelta al EstadoSistema anterior, que
+        vuelve a quedar instalado.
+        """
+        self._parada.set()
+        for nombre, proceso in self.procesos.items():
+            proceso.join(tiempo_espera)
+            if proceso.is_alive():
+                print(f"⚠️ El proceso del agente {nombre} no terminó a tiempo")
+                proceso.terminate()
+        while True:
+            try:
+                nombre, estadisticas, informe = self._resultados.get(timeout=0.1)
+            except queue.Empty:
+                break
+            self.estadisticas[nombre] = estadisticas
+            if informe:
+                self.informes[nombre] = informe
+
+        if self.puente is not None:
+            self.puente.detener()
+        if self.estado is not None:
+            final = dict(self.estado.obtener_todo())
+            instalar_estado(self._estado_anterior)
+            self.estado.cerrar()
+            for clave, valor in final.items():
+                self._estado_anterior.actualizar(clave, valor)
+            self.estado = None
+
+    def obtener_estadisticas(self):
+        """Estadísticas de cada agente (disponibles tras cerrar) y del puente del bus"""
+        return {
+            'agentes': dict(self.estadisticas),
+            'puente': dict(self.puente.estadisticas) if self.puente else {}
+        }
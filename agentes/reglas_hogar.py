@@ -0,0 +1,90 @@
+# agentes/reglas_hogar.py - Reglas de iluminación y seguridad del hogar para MotorReglas
+#
+# Cada regla declara qué claves del estado y qué tipos de mensaje la disparan;
+# los flags de COMPORTAMIENTO_LUCES deciden qué reglas se habilitan.
+from datos_compartidos.estado_sistema import estado_sistema
+from configuracion import CONFIG_AGENTES, COMPORTAMIENTO_LUCES
+from .motor_reglas import Regla
+
+# --- Iluminación ---
+
+def noche_con_presencia_sin_luces(contexto):
+    return contexto['es_noche'] and contexto['presencia_esperada'] and not contexto['luces_activadas']
+
+def encender_por_presencia_nocturna(contexto):
+    estado_sistema.actualizar('luces_activadas', True)
+    if contexto.cambio('es_noche'):
+        estado_sistema.registrar_evento("[Iluminación] Anochecer detectado -> luces encendidas automáticamente")
+    else:
+        estado_sistema.registrar_evento("[Iluminación] Presencia activada en noche -> luces encendidas")
+
+def dia_sin_presencia_con_luces(contexto):
+    return not contexto['es_noche'] and not contexto['presencia_esperada'] and contexto['luces_activadas']
+
+def apagar_al_amanecer(contexto):
+    estado_sistema.actualizar('luces_activadas', False)
+    estado_sistema.registrar_evento("[Iluminación] Amanecer sin presencia -> luces apagadas")
+
+def movimiento_de_noche(contexto):
+    # Una lectura negativa del sensor (valor False) no es movimiento
+    return contexto['es_noche'] and contexto.mensaje.get('valor')
+
+def encender_por_movimiento(contexto):
+    contexto.agente.encender_luces_automaticamente()
+    estado_sistema.registrar_evento("[Iluminación] Movimiento detectado en noche -> luces encendidas")
+
+def luces_sin_presencia(contexto):
+    return not contexto['presencia_esperada'] and contexto['luces_activadas']
+
+def apagar_por_inactividad(contexto):
+    """Apaga si pasó el tiempo desde el último movimiento; si no, vuelve a mirar cuando se cumpla"""
+    restante = (contexto.agente.ultimo_movimiento + CONFIG_AGENTES['iluminacion']['tiempo_encendido_automatico']
+                - contexto.ahora)
+    if restante >= 0:
+        contexto.reevaluar_en(restante + 0.001)
+        return
+    estado_sistema.actualizar('luces_activadas', False)
+    estado_sistema.registrar_evento("[Iluminación] Apagado automático por inactividad")
+
+REGLAS_ILUMINACION = [
+    # Anochecer con presencia, o presencia que llega de noche
+    Regla('encender_noche_con_presencia', noche_con_presencia_sin_luces, encender_por_presencia_nocturna,
+          claves=('es_noche', 'presencia_esperada'),
+          habilitada=COMPORTAMIENTO_LUCES['encender_anochecer']),
+    Regla('apagar_amanecer_sin_presencia', dia_sin_presencia_con_luces, apagar_al_amanecer,
+          claves=('es_noche',),
+          habilitada=COMPORTAMIENTO_LUCES['apagar_amanecer']),
+    Regla('encender_por_movimiento_nocturno', movimiento_de_noche, encender_por_movimiento,
+          tipos=('movimiento',),
+          habilitada=COMPORTAMIENTO_LUCES['encender_movimiento_noche']),
+    # Con presencia nunca se cumple, así que de noche con presencia las luces
+    # se mantienen (COMPORTAMIENTO_LUCES['mantener_noche_presencia'])
+    Regla('apagado_por_inactividad', luces_sin_presencia, apagar_por_inactividad,
+          claves=('presencia_esperada', 'luces_activadas'))
+]
+
+# --- Seguridad ---
+
+def movimiento_sin_presencia(contexto):
+    agente = contexto.agente
+    return (contexto.mensaje.get('valor') and
+            not contexto['presencia_esperada'] and
+            contexto.ahora - agente.ultima_alerta > agente.tiempo_entre_alertas)
+
+def activar_alerta(contexto):
+    estado_sistema.actualizar('alerta_seguridad', True)
+    contexto.agente.ultima_alerta = contexto.ahora
+    estado_sistema.registrar_evento("[Seguridad] ¡ALERTA! Movimiento sin presencia")
+
+    # Activar luces inmediatamente
+    contexto.agente.enviar_mensaje({
+        'tipo': 'comando',
+        'objetivo': 'iluminacion',
+        'accion': 'activar_luces',
+        'prioridad': 'alta'
+    })
+
+REGLAS_SEGURIDAD = [
+    Regla('alerta_movimiento_sin_presencia', movimiento_sin_presencia, activar_alerta,
+          tipos=('movimiento',))
+]
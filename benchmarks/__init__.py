@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+# Mediciones reproducibles de rendimiento (ejecutar con python -m benchmarks.<modulo>,
+# o la suite completa con python -m benchmarks --json resultados.json)
@@ -0,0 +1,78 @@
+# benchmarks/__main__.py - Ejecuta todos los benchmarks y guarda un único JSON
+#
+#   python -m benchmarks --json resultados.json
+#   python -m benchmarks --rapido --json nuevo.json --comparar resultados.json
+import argparse
+import json
+from benchmarks import (contencion_estado, costo_mensajes, costo_registro, costo_reglas,
+                        escalado_procesos, latencia_extremo, rendimiento_bus)
+from benchmarks.comun import metadatos, guardar_json
+
+def ejecutar(rapido=False):
+    """Ejecuta la suite completa; `rapido` reduce tamaños para una verificación breve"""
+    escala = 0.2 if rapido else 1.0
+    return {
+        'metadatos': metadatos(),
+        'bus': rendimiento_bus.ejecutar(mensajes=int(20000 * escala)),
+        'bus_lotes': rendimiento_bus.ejecutar(mensajes=int(20000 * escala), lote=100),
+        'estado': contencion_estado.ejecutar(duracion=0.5 * escala),
+        'registro': costo_registro.ejecutar(cantidad=int(200000 * escala)),
+        'mensajes': costo_mensajes.ejecutar(cantidad=int(100000 * escala)),
+        'reglas': costo_reglas.ejecutar(eventos=int(20000 * escala)),
+        'extremo_a_extremo': latencia_extremo.ejecutar(repeticiones=max(5, int(50 * escala))),
+        'procesos': escalado_procesos.ejecutar(lotes=int(200 * escala), cantidad=int(50000 * escala))
+    }
+
+def aplanar(datos, prefijo=''):
+    """{'a': {'b': 1}} -> {'a.b': 1}; las listas se indexan por posición"""
+    if isinstance(datos, dict):
+        elementos = datos.items()
+    elif isinstance(datos, list):
+        elementos = enumerate(datos)
+    else:
+        return {prefijo: datos}
+    plano = {}
+    for clave, valor in elementos:
+        plano.update(aplanar(valor, f"{prefijo}.{clave}" if prefijo else str(clave)))
+    return plano
+
+def comparar(anterior, actual, umbral=10.0):
+    """Lista las métricas numéricas que cambiaron más de `umbral` por ciento"""
+    valores_anteriores = aplanar({k: v for k, v in anterior.items() if k != 'metadatos'})
+    valores_actuales = aplanar({k: v for k, v in actual.items() if k != 'metadatos'})
+    cambios = []
+    for clave, valor in valores_actuales.items():
+        previo = valores_anteriores.get(clave)
+        if (isinstance(valor, (int, float)) and isinstance(previo, (int, float))
+                and not isinstance(valor, bool) and previo):
+            porcentaje = (valor - previo) / abs(previo) * 100
+            if abs(porcentaje) >= umbral:
+                cambios.append((clave, previo, valor, porcentaje))
+    return cambios
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de Domótica Multiagente")
+    parser.add_argument('--rapido', action='store_true', help="Tamaños reducidos")
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    parser.add_argument('--comparar', help="JSON de una ejecución anterior para listar diferencias")
+    parser.add_argument('--umbral', type=float, default=10.0, help="Porcentaje mínimo a reportar")
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar(argumentos.rapido)
+    if argumentos.json:
+        guardar_json(argumentos.json, resultados)
+        print(f"Resultados guardados en {argumentos.json}")
+    else:
+        print(json.dumps(resultados, indent=2, ensure_ascii=False))
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+        cambios = comparar(anterior, resultados, argumentos.umbral)
+        print(f"\nCambios de más de {argumentos.umbral:.0f}% respecto de {argumentos.comparar} "
+              f"(commit {anterior.get('metadatos', {}).get('commit')}):")
+        for clave, previo, valor, porcentaje in sorted(cambios, key=lambda cambio: -abs(cambio[3])):
+            print(f"  {clave:<70}{previo:>14}{valor:>14}{porcentaje:>+9.1f}%")
+
+if __name__ == "__main__":
+    main()
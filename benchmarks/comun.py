@@ -0,0 +1,44 @@
+# benchmarks/comun.py - Utilidades compartidas por los benchmarks
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+def percentil(ordenados, porcentaje):
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    if not ordenados:
+        return 0.0
+    indice = min(len(ordenados) - 1, max(0, round(porcentaje / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+def resumen_latencias(muestras):
+    """p50/p99/máximo en microsegundos de una lista de latencias en segundos"""
+    ordenados = sorted(muestras)
+    return {
+        'muestras': len(ordenados),
+        'p50_us': round(percentil(ordenados, 50) * 1e6, 1),
+        'p99_us': round(percentil(ordenados, 99) * 1e6, 1),
+        'max_us': round(ordenados[-1] * 1e6, 1) if ordenados else 0.0
+    }
+
+def metadatos():
+    """Datos de la máquina y la versión para comparar resultados entre ejecuciones"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'implementacion': platform.python_implementation(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+def guardar_json(ruta, resultados):
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(resultados, archivo, indent=2, ensure_ascii=False)
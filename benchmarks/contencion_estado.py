@@ -0,0 +1,117 @@
+# benchmarks/contencion_estado.py - Contención de EstadoSistema según hilos lectores
+import argparse
+import json
+import threading
+import time
+from datos_compartidos.estado_sistema import EstadoSistema
+
+class EstadoMutexReferencia:
+    """Réplica del diseño original: un mutex y dict.copy() en cada lectura"""
+    def __init__(self):
+        self._bloqueo = threading.Lock()
+        self._estado = EstadoSistema('global').obtener_todo().copy()
+        self._estado['registro_eventos'] = ()
+
+    def obtener(self, clave):
+        with self._bloqueo:
+            return self._estado[clave]
+
+    def obtener_todo(self):
+        with self._bloqueo:
+            return self._estado.copy()
+
+    def leer(self, *claves):
+        return tuple(self.obtener(clave) for clave in claves)
+
+    def actualizar(self, clave, valor):
+        with self._bloqueo:
+            self._estado[clave] = valor
+
+    def modificar(self, clave, funcion):
+        with self._bloqueo:
+            self._estado[clave] = funcion(self._estado[clave])
+
+    def registrar_evento(self, mensaje):
+        with self._bloqueo:
+            self._estado['registro_eventos'] = (mensaje,) + self._estado['registro_eventos'][:9]
+
+VARIANTES = {
+    'mutex_referencia': EstadoMutexReferencia,
+    'global': lambda: EstadoSistema('global'),
+    'fragmentos': lambda: EstadoSistema('fragmentos'),
+}
+
+def medir(crear_estado, lectores, escritores, duracion):
+    """Ejecuta lectores y escritores concurrentes y retorna operaciones por segundo"""
+    estado = crear_estado()
+    parada = threading.Event()
+    conteos = []
+
+    def lector(indice):
+        operaciones = 0
+        while not parada.is_set():
+            estado.obtener_todo()['temperatura']
+            estado.leer('es_noche', 'presencia_esperada', 'luces_activadas')
+            operaciones += 2
+        conteos.append(('lecturas', operaciones))
+
+    # Escritores de grupos distintos, como los agentes reales
+    def escritor(indice):
+        operaciones = 0
+        while not parada.is_set():
+            tipo = (indice + operaciones) % 3
+            if tipo == 0:
+                estado.modificar('temperatura', lambda temperatura: temperatura + 0.001)
+            elif tipo == 1:
+                estado.actualizar('luces_activadas', operaciones % 2 == 0)
+            else:
+                estado.registrar_evento(f"evento {operaciones}")
+            operaciones += 1
+        conteos.append(('escrituras', operaciones))
+
+    hilos = [threading.Thread(target=lector, args=(i,)) for i in range(lectores)]
+    hilos += [threading.Thread(target=escritor, args=(i,)) for i in range(escritores)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(duracion)
+    parada.set()
+    # Con muchos hilos ocupados el hilo principal puede despertar tarde: medir lo real
+    transcurrido = time.perf_counter() - inicio
+    for hilo in hilos:
+        hilo.join()
+
+    resultado = {'lecturas': 0, 'escrituras': 0}
+    for tipo, operaciones in conteos:
+        resultado[tipo] += operaciones
+    return {tipo: round(total / transcurrido) for tipo, total in resultado.items()}
+
+def ejecutar(hilos_lectores=(1, 2, 4, 8, 16, 32), escritores=3, duracion=0.5, variantes=None):
+    """Mide cada variante con cantidades crecientes de lectores; retorna una lista de filas"""
+    filas = []
+    for nombre in variantes or VARIANTES:
+        for lectores in hilos_lectores:
+            operaciones = medir(VARIANTES[nombre], lectores, escritores, duracion)
+            filas.append({'variante': nombre, 'lectores': lectores, 'escritores': escritores,
+                          'lecturas_por_s': operaciones['lecturas'],
+                          'escrituras_por_s': operaciones['escrituras']})
+    return filas
+
+def main():
+    parser = argparse.ArgumentParser(description="Contención de EstadoSistema")
+    parser.add_argument('--duracion', type=float, default=0.5, help="Segundos por medición")
+    parser.add_argument('--escritores', type=int, default=3)
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    argumentos = parser.parse_args()
+
+    filas = ejecutar(escritores=argumentos.escritores, duracion=argumentos.duracion)
+    print(f"{'variante':<18}{'lectores':>9}{'lecturas/s':>14}{'escrituras/s':>14}")
+    for fila in filas:
+        print(f"{fila['variante']:<18}{fila['lectores']:>9}{fila['lecturas_por_s']:>14}{fila['escrituras_por_s']:>14}")
+
+    if argumentos.json:
+        with open(argumentos.json, 'w', encoding='utf-8') as archivo:
+            json.dump(filas, archivo, indent=2)
+
+if __name__ == "__main__":
+    main()
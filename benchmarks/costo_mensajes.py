@@ -0,0 +1,76 @@
+# benchmarks/costo_mensajes.py - Memoria y CPU por mensaje en el camino caliente del bus
+import argparse
+import gc
+import time
+import tracemalloc
+from datos_compartidos.bus_mensajes import BusMensajes, MensajePriorizado
+from benchmarks.comun import guardar_json
+
+# Mismo mensaje que envía AgenteSeguridad al detectar movimiento
+CAMPOS = {'tipo': 'movimiento', 'valor': True, 'prioridad': 'alta'}
+
+def firmar(indice):
+    # Como AgenteBase.enviar_mensaje
+    return dict(CAMPOS, de='seguridad', marca_tiempo=float(indice))
+
+def nanosegundos(funcion, cantidad):
+    inicio = time.perf_counter()
+    for indice in range(cantidad):
+        funcion(indice)
+    return (time.perf_counter() - inicio) / cantidad * 1e9
+
+def bytes_en_cola(cantidad):
+    """Memoria por mensaje retenido en un buzón (mensaje + sobre)"""
+    bus = BusMensajes(max_size=cantidad, trazar=False)
+    buzon = bus.suscribir('consumidor', tipos=(CAMPOS['tipo'],))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for indice in range(cantidad):
+            bus.enviar_mensaje(firmar(indice))
+        memoria = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    buzon.limpiar()
+    return memoria / cantidad
+
+def ida_y_vuelta(cantidad):
+    """enviar_mensaje + extraer + tres get() como haría un manejador"""
+    bus = BusMensajes(trazar=False)
+    buzon = bus.suscribir('consumidor', tipos=(CAMPOS['tipo'],))
+
+    def paso(indice):
+        bus.enviar_mensaje(firmar(indice))
+        mensaje = buzon.extraer()
+        mensaje.get('tipo')
+        mensaje.get('valor')
+        mensaje.get('zona')
+    return nanosegundos(paso, cantidad)
+
+def ejecutar(cantidad=100000):
+    """ns del sobre, bytes en cola, ns de creación, ns por get y ns de ida y vuelta por el bus"""
+    mensaje = firmar(0)
+    return {
+        'sobre_ns': round(nanosegundos(lambda indice: MensajePriorizado(CAMPOS, 1), cantidad), 1),
+        'bytes_en_cola': round(bytes_en_cola(min(cantidad, 20000)), 1),
+        'creacion_ns': round(nanosegundos(firmar, cantidad), 1),
+        'get_ns': round(nanosegundos(lambda indice: mensaje.get('valor'), cantidad), 1),
+        'ida_y_vuelta_ns': round(ida_y_vuelta(cantidad), 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por mensaje en el bus")
+    parser.add_argument('--mensajes', type=int, default=100000)
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar(argumentos.mensajes)
+    print(f"{'sobre ns':>10}{'bytes/cola':>12}{'creación ns':>14}{'get ns':>10}{'ida y vuelta ns':>18}")
+    print(f"{resultados['sobre_ns']:>10}{resultados['bytes_en_cola']:>12}{resultados['creacion_ns']:>14}"
+          f"{resultados['get_ns']:>10}{resultados['ida_y_vuelta_ns']:>18}")
+
+    if argumentos.json:
+        guardar_json(argumentos.json, resultados)
+
+if __name__ == "__main__":
+    main()
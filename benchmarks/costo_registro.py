@@ -0,0 +1,48 @@
+# benchmarks/costo_registro.py - Costo por evento de registrar() frente a un put en cola
+import argparse
+import json
+import queue
+import tempfile
+import time
+from utilidades.registrador import Registrador
+
+def medir(funcion, cantidad):
+    inicio = time.perf_counter()
+    for indice in range(cantidad):
+        funcion(f"[Bench] evento {indice}")
+    return (time.perf_counter() - inicio) / cantidad * 1e9
+
+def ejecutar(cantidad=200000):
+    """Nanosegundos por evento: put en cola, registrar en memoria y registrar persistiendo"""
+    cola = queue.SimpleQueue()
+    resultados = {'put_en_cola_ns': medir(cola.put, cantidad)}
+
+    resultados['registrar_memoria_ns'] = medir(Registrador().registrar, cantidad)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        registro = Registrador(directorio=directorio)
+        registro.iniciar()
+        resultados['registrar_persistiendo_ns'] = medir(registro.registrar, cantidad)
+        registro.detener(tiempo_espera=30)
+        resultados['eventos_escritos'] = registro.estadisticas['eventos_escritos']
+        resultados['lotes_escritos'] = registro.estadisticas['lotes_escritos']
+
+    return {clave: round(valor, 1) if isinstance(valor, float) else valor
+            for clave, valor in resultados.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por evento del registrador")
+    parser.add_argument('--eventos', type=int, default=200000)
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar(argumentos.eventos)
+    for clave, valor in resultados.items():
+        print(f"{clave:<28}{valor:>12}")
+
+    if argumentos.json:
+        with open(argumentos.json, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/costo_reglas.py - Costo por evento de MotorReglas según la cantidad de reglas
+import argparse
+import contextlib
+import io
+import time
+from agentes.motor_reglas import MotorReglas, Regla, ContextoRegla
+from benchmarks.comun import guardar_json
+
+REGLAS_POR_CLAVE = 3  # Cada clave del estado y cada tipo de mensaje los leen 3 reglas
+
+def nunca(contexto):
+    return False
+
+def crear_motor(cantidad):
+    """Reglas sintéticas: la regla i lee la clave 'clave-k' y el tipo 'tipo-k' con k = i // REGLAS_POR_CLAVE"""
+    return MotorReglas(Regla(f"regla-{indice}", nunca, nunca,
+                             claves=(f"clave-{indice // REGLAS_POR_CLAVE}",),
+                             tipos=(f"tipo-{indice // REGLAS_POR_CLAVE}",))
+                       for indice in range(cantidad))
+
+def nanosegundos(funcion, eventos):
+    inicio = time.perf_counter()
+    for indice in range(eventos):
+        funcion(indice)
+    return (time.perf_counter() - inicio) / eventos * 1e9
+
+def medir(cantidad, eventos):
+    motor = crear_motor(cantidad)
+    claves = [f"clave-{indice}" for indice in range(max(1, cantidad // REGLAS_POR_CLAVE))]
+    mensajes = [{'tipo': f"tipo-{indice}"} for indice in range(len(claves))]
+    reglas = list(motor._reglas)
+
+    def cambio_indexado(indice):
+        motor.marcar_cambio(claves[indice % len(claves)])
+        motor.procesar_pendientes()
+
+    def mensaje_indexado(indice):
+        motor.procesar_mensaje(mensajes[indice % len(mensajes)])
+
+    def evaluar_todas(indice):
+        # Lo que hacía el ciclo antes del motor: mirar todas las reglas en cada pasada
+        contexto = ContextoRegla(motor)
+        for regla in reglas:
+            motor._evaluar(regla, contexto)
+
+    return {
+        'reglas': cantidad,
+        'cambio_estado_ns': round(nanosegundos(cambio_indexado, eventos), 1),
+        'mensaje_ns': round(nanosegundos(mensaje_indexado, eventos), 1),
+        'todas_ns': round(nanosegundos(evaluar_todas, max(1, eventos * 10 // cantidad)), 1)
+    }
+
+def ejecutar(cantidades=(10, 100, 1000, 10000), eventos=20000):
+    """Por cantidad de reglas: ns por cambio de estado, por mensaje y evaluando todas las reglas"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [medir(cantidad, eventos) for cantidad in cantidades]
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por evento del motor de reglas")
+    parser.add_argument('--eventos', type=int, default=20000)
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    argumentos = parser.parse_args()
+
+    filas = ejecutar(eventos=argumentos.eventos)
+    print(f"{'reglas':>8}{'cambio ns':>12}{'mensaje ns':>12}{'todas ns':>14}")
+    for fila in filas:
+        print(f"{fila['reglas']:>8}{fila['cambio_estado_ns']:>12}{fila['mensaje_ns']:>12}{fila['todas_ns']:>14}")
+
+    if argumentos.json:
+        guardar_json(argumentos.json, filas)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/escalado_procesos.py - Hilos frente a procesos con trabajo de CPU y estado compartido
+import argparse
+import multiprocessing
+import threading
+import time
+from datos_compartidos.estado_sistema import EstadoSistema
+from datos_compartidos.estado_compartido import EstadoCompartido
+from benchmarks.comun import guardar_json
+
+def trabajo(iteraciones):
+    """Cálculo en Python puro: retiene el GIL todo el tiempo"""
+    total = 0.0
+    for indice in range(iteraciones):
+        total += (indice % 7) * 0.5
+    return total
+
+def trabajador(estado, lotes, iteraciones):
+    """Alterna trabajo de CPU con una escritura y una lectura del estado, como un ciclo de agente"""
+    for _ in range(lotes):
+        trabajo(iteraciones)
+        estado.modificar('temperatura', lambda valor: valor + 0.001)
+        estado.obtener('calefaccion_activada')
+
+def lotes_por_segundo(modo, trabajadores, lotes, iteraciones):
+    """Lotes completados por segundo entre todos los trabajadores"""
+    if modo == 'hilos':
+        estado = EstadoSistema()
+        lanzar = lambda: threading.Thread(target=trabajador, args=(estado, lotes, iteraciones))
+    else:
+        contexto = multiprocessing.get_context('spawn')
+        estado = EstadoCompartido(contexto=contexto)
+        lanzar = lambda: contexto.Process(target=trabajador, args=(estado, lotes, iteraciones))
+    ejecutores = [lanzar() for _ in range(trabajadores)]
+    try:
+        # Se mide desde start(): incluye el arranque de cada proceso (spawn importa todo de nuevo)
+        inicio = time.perf_counter()
+        for ejecutor in ejecutores:
+            ejecutor.start()
+        for ejecutor in ejecutores:
+            ejecutor.join()
+        duracion = time.perf_counter() - inicio
+        esperado = 22.0 + 0.001 * lotes * trabajadores
+        if abs(estado.obtener('temperatura') - esperado) > 1e-6:
+            raise RuntimeError(f"Escrituras perdidas en modo {modo}")
+    finally:
+        if modo == 'procesos':
+            estado.cerrar()
+    return lotes * trabajadores / duracion
+
+def costo_operaciones(estado, cantidad):
+    """ns por lectura (sin cambios entre lecturas), por escritura y por lectura tras escribir"""
+    def medir(funcion):
+        inicio = time.perf_counter()
+        for indice in range(cantidad):
+            funcion(indice)
+        return round((time.perf_counter() - inicio) / cantidad * 1e9, 1)
+    return {
+        'lectura_ns': medir(lambda indice: estado.obtener('temperatura')),
+        'escritura_ns': medir(lambda indice: estado.actualizar('temperatura', float(indice))),
+        'escritura_y_lectura_ns': medir(lambda indice: (estado.actualizar('temperatura', -float(indice)),
+                                                        estado.obtener('temperatura')))
+    }
+
+def ejecutar(lotes=200, iteraciones=20000, trabajadores=(1, 2, 4), cantidad=50000):
+    resultados = {
+        'cpus': multiprocessing.cpu_count(),
+        'operaciones': {'hilos': costo_operaciones(EstadoSistema(), cantidad)}
+    }
+    compartido = EstadoCompartido()
+    try:
+        resultados['operaciones']['procesos'] = costo_operaciones(compartido, cantidad)
+    finally:
+        compartido.cerrar()
+    for modo in ('hilos', 'procesos'):
+        resultados[modo] = {str(cantidad_trabajadores): round(lotes_por_segundo(modo, cantidad_trabajadores,
+                                                                                 lotes, iteraciones), 1)
+                            for cantidad_trabajadores in trabajadores}
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalado de hilos frente a procesos con estado compartido")
+    parser.add_argument('--lotes', type=int, default=200, help="Lotes por trabajador")
+    parser.add_argument('--iteraciones', type=int, default=20000, help="Iteraciones de CPU por lote")
+    parser.add_argument('--trabajadores', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar(argumentos.lotes, argumentos.iteraciones, tuple(argumentos.trabajadores))
+    print(f"CPUs: {resultados['cpus']}")
+    for modo, costos in resultados['operaciones'].items():
+        print(f"{modo:<10} lectura {costos['lectura_ns']} ns, escritura {costos['escritura_ns']} ns, "
+              f"escritura+lectura {costos['escritura_y_lectura_ns']} ns")
+    print(f"{'trabajadores':<14}{'hilos lotes/s':>16}{'procesos lotes/s':>18}")
+    for cantidad in argumentos.trabajadores:
+        print(f"{cantidad:<14}{resultados['hilos'][str(cantidad)]:>16}{resultados['procesos'][str(cantidad)]:>18}")
+
+    if argumentos.json:
+        guardar_json(argumentos.json, resultados)
+
+if __name__ == "__main__":
+    main()
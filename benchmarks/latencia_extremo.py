@@ -0,0 +1,105 @@
+# benchmarks/latencia_extremo.py - Latencia de reacción de los agentes reales (extremo a extremo)
+import argparse
+import contextlib
+import io
+import threading
+import time
+from datos_compartidos.bus_mensajes import bus_mensajes
+from datos_compartidos.estado_sistema import estado_sistema
+from datos_compartidos.evento_parada import EventoParada
+from ejecutar_sistema import crear_agentes, iniciar_agentes
+from benchmarks.comun import resumen_latencias, guardar_json
+
+def preparar_reinicio_alerta():
+    estado_sistema.actualizar('alerta_seguridad', True)
+
+def preparar_movimiento_noche():
+    # Sin presencia: con presencia la regla de anochecer encendería las luces antes del mensaje
+    estado_sistema.actualizar('presencia_esperada', False)
+    estado_sistema.actualizar('luces_activadas', False)
+    estado_sistema.actualizar('es_noche', True)
+
+# Escenario: (preparar estado, mensaje enviado, clave observada, valor esperado).
+# Los mensajes son los mismos que envía la interfaz con las teclas R y M; no se
+# incluye la actualización local que hace la interfaz al pulsar R.
+ESCENARIOS = {
+    'tecla_r_alerta_reiniciada': (
+        preparar_reinicio_alerta,
+        {'de': 'interfaz', 'tipo': 'comando', 'objetivo': 'seguridad', 'accion': 'reiniciar_alerta'},
+        'alerta_seguridad', False),
+    'movimiento_noche_luces_encendidas': (
+        preparar_movimiento_noche,
+        {'de': 'interfaz', 'tipo': 'simular_movimiento', 'valor': True},
+        'luces_activadas', True),
+}
+
+def medir_escenario(nombre, repeticiones, pausa):
+    """Envía el mensaje del escenario y mide hasta que el estado toma el valor esperado"""
+    preparar, mensaje, clave, esperado = ESCENARIOS[nombre]
+    alcanzado = threading.Event()
+    marca = {}
+
+    # El callback corre en el hilo del agente que escribe: mide el instante exacto
+    def al_cambiar(clave_cambiada, valor, version):
+        if valor == esperado and not alcanzado.is_set():
+            marca['fin'] = time.perf_counter()
+            alcanzado.set()
+
+    latencias = []
+    perdidas = 0
+    estado_sistema.suscribir(al_cambiar, claves=(clave,))
+    try:
+        for _ in range(repeticiones):
+            preparar()
+            time.sleep(pausa)  # Dejar que los agentes vean el estado preparado
+            alcanzado.clear()
+            inicio = time.perf_counter()
+            bus_mensajes.enviar_mensaje(dict(mensaje))
+            if alcanzado.wait(1.0):
+                latencias.append(marca['fin'] - inicio)
+            else:
+                perdidas += 1
+    finally:
+        estado_sistema.cancelar_suscripcion(al_cambiar)
+    resumen = resumen_latencias(latencias)
+    resumen['sin_respuesta'] = perdidas
+    return resumen
+
+def ejecutar(modos=('hilos', 'planificador', 'asyncio'), repeticiones=50, pausa=0.02):
+    """Mide cada escenario con los agentes corriendo en cada modo de ejecución"""
+    resultados = {}
+    for modo in modos:
+        evento_parada = EventoParada()
+        # Los agentes imprimen al iniciar, finalizar y procesar: silenciarlos durante la medición
+        with contextlib.redirect_stdout(io.StringIO()):
+            hilos = iniciar_agentes(modo, crear_agentes(evento_parada), evento_parada)
+            try:
+                time.sleep(0.2)
+                resultados[modo] = {nombre: medir_escenario(nombre, repeticiones, pausa)
+                                    for nombre in ESCENARIOS}
+            finally:
+                evento_parada.set()
+                for hilo in hilos:
+                    hilo.join(timeout=1)
+                bus_mensajes.limpiar_cola()
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia extremo a extremo de los agentes")
+    parser.add_argument('--repeticiones', type=int, default=50)
+    parser.add_argument('--modos', nargs='+', default=['hilos', 'planificador', 'asyncio'],
+                        choices=['hilos', 'planificador', 'asyncio'])
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar(argumentos.modos, argumentos.repeticiones)
+    print(f"{'modo':<14}{'escenario':<36}{'p50 µs':>10}{'p99 µs':>10}{'sin resp.':>10}")
+    for modo, escenarios in resultados.items():
+        for nombre, resumen in escenarios.items():
+            print(f"{modo:<14}{nombre:<36}{resumen['p50_us']:>10}{resumen['p99_us']:>10}{resumen['sin_respuesta']:>10}")
+
+    if argumentos.json:
+        guardar_json(argumentos.json, resultados)
+
+if __name__ == "__main__":
+    main()
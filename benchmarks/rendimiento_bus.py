@@ -0,0 +1,103 @@
+# benchmarks/rendimiento_bus.py - Throughput y latencia por prioridad de BusMensajes
+import argparse
+import threading
+import time
+from datos_compartidos.bus_mensajes import BusMensajes
+from benchmarks.comun import resumen_latencias, guardar_json
+
+PRIORIDADES = (0, 1, 2)
+
+def medir(productores, mensajes_por_productor, capacidad, lote=1):
+    """Productores publican mensajes de prioridades alternadas y un consumidor los drena.
+
+    La latencia es desde enviar_mensaje hasta que el consumidor extrae el
+    mensaje de su buzón (incluye la espera en cola). Con lote > 1 se publica
+    con enviar_lote y se consume con extraer_lote de a `lote` mensajes.
+    """
+    bus = BusMensajes(max_size=capacidad)
+    buzon = bus.suscribir('consumidor', tipos=('bench',))
+    latencias = {prioridad: [] for prioridad in PRIORIDADES}
+    total = productores * mensajes_por_productor
+    fin_produccion = threading.Event()
+
+    def productor(indice):
+        if lote > 1:
+            for desde in range(0, mensajes_por_productor, lote):
+                numeros = range(desde, min(desde + lote, mensajes_por_productor))
+                prioridades = [PRIORIDADES[(indice + numero) % len(PRIORIDADES)] for numero in numeros]
+                ahora = time.perf_counter()
+                bus.enviar_lote([{'tipo': 'bench', 'p': prioridad, 't': ahora} for prioridad in prioridades],
+                                prioridades=prioridades)
+            return
+        for numero in range(mensajes_por_productor):
+            prioridad = PRIORIDADES[(indice + numero) % len(PRIORIDADES)]
+            bus.enviar_mensaje({'tipo': 'bench', 'p': prioridad, 't': time.perf_counter()},
+                               prioridad=prioridad)
+
+    def consumidor():
+        recibidos = 0
+        while recibidos < total:
+            mensajes = buzon.extraer_lote(lote, tiempo_espera=0.1)
+            if not mensajes:
+                # Sin mensajes y producción terminada: el resto se perdió por capacidad
+                if fin_produccion.is_set() and not len(buzon):
+                    break
+                continue
+            ahora = time.perf_counter()
+            for mensaje in mensajes:
+                latencias[mensaje['p']].append(ahora - mensaje['t'])
+            recibidos += len(mensajes)
+
+    hilo_consumidor = threading.Thread(target=consumidor)
+    hilos = [threading.Thread(target=productor, args=(i,)) for i in range(productores)]
+    inicio = time.perf_counter()
+    hilo_consumidor.start()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion_produccion = time.perf_counter() - inicio
+    fin_produccion.set()
+    hilo_consumidor.join()
+    duracion = time.perf_counter() - inicio
+
+    recibidos = sum(len(muestras) for muestras in latencias.values())
+    estadisticas = bus.obtener_estadisticas()
+    bus.cancelar_suscripcion('consumidor')
+    return {
+        'productores': productores,
+        'capacidad': capacidad,
+        'lote': lote,
+        'publicados_por_s': round(total / duracion_produccion),
+        'recibidos_por_s': round(recibidos / duracion),
+        'perdidos': estadisticas['mensajes_perdidos'],
+        'latencia_por_prioridad': {str(prioridad): resumen_latencias(muestras)
+                                   for prioridad, muestras in latencias.items()}
+    }
+
+def ejecutar(hilos_productores=(1, 4, 16), mensajes=20000, capacidad=1000, lote=1):
+    """Mide con cantidades crecientes de productores; `mensajes` es el total por medición"""
+    return [medir(productores, max(1, mensajes // productores), capacidad, lote)
+            for productores in hilos_productores]
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput y latencia de BusMensajes")
+    parser.add_argument('--mensajes', type=int, default=20000, help="Mensajes por medición")
+    parser.add_argument('--capacidad', type=int, default=1000, help="max_size del buzón")
+    parser.add_argument('--lote', type=int, default=1, help="Mensajes por enviar_lote/extraer_lote (1: de a uno)")
+    parser.add_argument('--json', help="Guardar resultados en este archivo JSON")
+    argumentos = parser.parse_args()
+
+    filas = ejecutar(mensajes=argumentos.mensajes, capacidad=argumentos.capacidad, lote=argumentos.lote)
+    print(f"{'productores':>11}{'pub/s':>10}{'recv/s':>10}{'perdidos':>10}  p50/p99 µs por prioridad 0 | 1 | 2")
+    for fila in filas:
+        latencias = ' | '.join(f"{resumen['p50_us']:.0f}/{resumen['p99_us']:.0f}"
+                               for resumen in fila['latencia_por_prioridad'].values())
+        print(f"{fila['productores']:>11}{fila['publicados_por_s']:>10}{fila['recibidos_por_s']:>10}"
+              f"{fila['perdidos']:>10}  {latencias}")
+
+    if argumentos.json:
+        guardar_json(argumentos.json, filas)
+
+if __name__ == "__main__":
+    main()
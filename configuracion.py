@@ -4,6 +4,9 @@
 ANCHO_VENTANA = 1000
 ALTO_VENTANA = 850
 FPS = 60
+INTERFAZ_POR_EVENTOS = True  # Dormir hasta que cambie el estado en lugar de sondear a FPS
+ESPERA_MAXIMA_INTERFAZ = 1.0  # Segundos máximos bloqueada esperando eventos (modo por eventos)
+CAPACIDAD_CACHE_TEXTO = 256  # Superficies de texto renderizadas que conserva la interfaz (LRU)
 
 # Configuración de agentes OPTIMIZADA PARA RESPUESTA INMEDIATA
 CONFIG_AGENTES = {
@@ -14,12 +17,14 @@ CONFIG_AGENTES = {
         'temp_optima_max': 24.0,
         'potencia_calefaccion': 0.08,
         'potencia_enfriamiento': 0.10,
-        'variacion_temperatura': (-0.05, 0.05)
+        'variacion_temperatura': (-0.05, 0.05),
+        'acoplamiento_zonas': 0.02       # Intercambio de calor entre zonas vecinas (fracción de la diferencia por segundo)
     },
     'seguridad': {
         'probabilidad_movimiento': 0.01,
         'intervalo_verificacion': 0.02,  # MUCHO MÁS RÁPIDO: 50ms en lugar de 200ms
-        'tiempo_entre_alertas': 5        # Reducido a 5 segundos
+        'tiempo_entre_alertas': 5,       # Reducido a 5 segundos
+        'lote_mensajes': 500             # Mensajes máximos por ciclo (ráfagas de sensores de la pasarela)
     },
     'iluminacion': {
         'intervalo_verificacion': 0.05,  # MUCHO MÁS RÁPIDO: 50ms
@@ -27,6 +32,23 @@ CONFIG_AGENTES = {
     }
 }
 
+# Hogares y sus zonas (habitaciones). Las zonas se identifican por id en
+# datos_compartidos/estado_zonas.py y en el campo 'zona' de los mensajes.
+# La interfaz no las muestra: sin hogares configurados AgenteTemperatura no
+# simula zonas ni registra eventos de zona. Ejemplo:
+#   HOGARES = {'casa': ('sala', 'cocina', 'dormitorio', 'garage')}
+HOGARES = {}
+
+# Habitaciones dibujadas en la vista de la casa: (nombre, color, panel).
+# La vista tiene lugar para cuatro (dos filas de dos) y cada panel muestra el
+# estado global de estado_sistema, no el de una zona de HOGARES.
+HABITACIONES_INTERFAZ = [
+    ("SALA", (220, 240, 255), "Luces"),
+    ("COCINA", (255, 240, 220), "Temperatura"),
+    ("DORMITORIO", (255, 220, 240), "HVAC"),
+    ("GARAGE", (220, 255, 230), "Seguridad")
+]
+
 # Comportamiento inteligente de iluminación
 COMPORTAMIENTO_LUCES = {
     'encender_anochecer': True,
@@ -43,6 +65,95 @@ TIEMPOS_RESPUESTA = {
     'interfaz': 0.016       # ~60 FPS
 }
 
+# Modo de ejecución de agentes: 'hilos' (un hilo por agente),
+# 'planificador' (todos los agentes en un hilo con rueda de temporización),
+# 'asyncio' (todos los agentes como corrutinas de un bucle de eventos),
+# 'procesos' (un proceso por agente con estado en memoria compartida)
+MODO_AGENTES = 'hilos'
+
+# Rueda de temporización del planificador
+PLANIFICADOR = {
+    'resolucion': 0.005,    # 5ms por tick
+    'ranuras': 256          # ~1.3s por vuelta de la rueda
+}
+
+# Bloqueo de escritura del estado compartido: 'global' (un bloqueo para todo)
+# o 'fragmentos' (un bloqueo por grupo de claves de FRAGMENTOS_ESTADO).
+# Las lecturas nunca bloquean: leen instantáneas inmutables.
+ESTRATEGIA_BLOQUEO_ESTADO = 'global'
+
+FRAGMENTOS_ESTADO = {
+    'clima': ('temperatura', 'calefaccion_activada', 'ventilador_activado'),
+    'iluminacion': ('luces_activadas',),
+    'seguridad': ('alerta_seguridad', 'movimiento_detectado')
+    # El resto ('es_noche', 'presencia_esperada', ...) va al fragmento 'general'
+}
+
+# Registro de eventos (utilidades/registrador.py)
+CONFIG_REGISTRO = {
+    'capacidad_memoria': 100,       # Eventos recientes en memoria para la interfaz
+    'directorio': 'registros',
+    'archivo': 'eventos.log',
+    'tamano_maximo': 1024 * 1024,   # Rotar al superar 1 MB
+    'copias': 5,                    # Archivos rotados que se conservan
+    'tamano_lote': 256              # Máximo de eventos por escritura
+}
+
+# Simulación sin interfaz con reloj virtual (python ejecutar_sistema.py --sin-interfaz)
+SIMULACION = {
+    'duracion': 24 * 3600,      # Segundos simulados (un día)
+    'semilla': 0,               # Semilla de random para resultados reproducibles
+    'intervalo_ciclo': 1.0,     # Periodo de los agentes en la simulación (None = TIEMPOS_RESPUESTA);
+                                # las probabilidades y variaciones por ciclo se aplican por este periodo
+    'tramo': 60.0,              # Cada cuántos segundos simulados se actualiza el horario
+    'horario_noche': (20, 7),   # Horas de anochecer y amanecer
+    'horario_ausencia': (9, 18) # Horas en que no se espera presencia en casa
+}
+
+# Histogramas de latencia de mensajes por tipo y prioridad (BusMensajes.obtener_histogramas)
+TRAZAR_MENSAJES = True
+
+# Perfilador por muestreo de los ciclos más lentos (utilidades/perfilador.py,
+# python ejecutar_sistema.py --perfilar)
+PERFILADOR = {
+    'activado': False,
+    'intervalo_muestreo': 0.001,    # 1ms entre muestras de pila
+    'ciclos_lentos': 5,             # Ciclos más lentos conservados por agente
+    'profundidad': 30               # Marcos máximos por pila
+}
+
+# Buzones del bus: una cola por prioridad (0=normal, 1=alta, 2=crítica) con
+# capacidad propia (por defecto el max_size del bus) y política al llenarse:
+#   'descartar_antiguo' - se pierde el mensaje más viejo de esa prioridad
+#   'descartar_nuevo'   - se pierde el mensaje entrante (enviar_mensaje retorna True)
+#   'bloquear'          - el emisor espera hasta su tiempo_espera; si sigue lleno, se rechaza
+#   'rechazar'          - se pierde el mensaje entrante y enviar_mensaje retorna False
+COLAS_BUS = {
+    0: {'capacidad': None, 'politica': 'descartar_antiguo'},
+    1: {'capacidad': None, 'politica': 'descartar_antiguo'},
+    2: {'capacidad': None, 'politica': 'bloquear'}
+}
+
+# Coalescencia opcional en los buzones: mientras un mensaje de estos tipos sigue
+# sin extraer y no pasaron `ventana` segundos desde que llegó, los siguientes con
+# la misma (tipo, objetivo, de) lo reemplazan en su lugar de la cola; el mensaje
+# entregado es el último y lleva 'coalescidos' con la cantidad que representa
+COALESCENCIA_BUS = {
+    'activada': False,
+    'ventana': 0.25,
+    'tipos': ('movimiento', 'simular_movimiento')
+}
+
+# Pasarela de sockets para sensores y actuadores externos (datos_compartidos/pasarela.py).
+# Tramas: longitud de 4 bytes (big endian) + JSON en UTF-8. `direccion` es
+# (host, puerto) para TCP o la ruta de un socket Unix.
+PASARELA = {
+    'activada': False,
+    'direccion': ('127.0.0.1', 8765),
+    'max_trama': 1 << 20,   # Bytes máximos por trama; una mayor cierra la conexión
+    'max_lote': 5000        # Mensajes máximos por lote
+}
+
 # Prioridades de mensajes
 PRIORIDAD_MENSAJES = {
     'reset_alerta': 2,      # Máxima prioridad
@@ -1,10 +1,27 @@
 # datos_compartidos/__init__.py
-from .estado_sistema import estado_sistema, EstadoSistema
+from .estado_sistema import estado_sistema, EstadoSistema, InstantaneaEstado, Transaccion
+from .estado_compartido import EstadoCompartido
 from .bus_mensajes import bus_mensajes, BusMensajes
+from .bus_procesos import PuenteBus, ExtremoBus
+from .estado_zonas import estado_zonas, EstadoZonas
+from .evento_parada import EventoParada
+from .bus_async import BusMensajesAsync, SuscripcionAsync
+from .pasarela import PasarelaSockets
 
 __all__ = [
     'estado_sistema', 
     'EstadoSistema',
+    'InstantaneaEstado',
+    'Transaccion',
+    'EstadoCompartido',
+    'estado_zonas',
+    'EstadoZonas',
     'bus_mensajes',
-    'BusMensajes'
+    'BusMensajes',
+    'PuenteBus',
+    'ExtremoBus',
+    'EventoParada',
+    'BusMensajesAsync',
+    'SuscripcionAsync',
+    'PasarelaSockets'
 ]
\ No newline at end of file
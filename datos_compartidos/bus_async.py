@@ -0,0 +1,106 @@
+# datos_compartidos/bus_async.py - API asyncio sobre el bus de mensajes
+import asyncio
+import time
+from .bus_mensajes import bus_mensajes
+
+class SuscripcionAsync:
+    """Suscripción al bus consumible desde asyncio (`async for mensaje in ...`).
+
+    Envuelve el buzón del suscriptor: cada depósito despierta al bucle de
+    eventos mediante call_soon_threadsafe, así que no hay hilos ni sondeo.
+    """
+    def __init__(self, bus, nombre, buzon, loop):
+        self.nombre = nombre
+        self._bus = bus
+        self._buzon = buzon
+        self._loop = loop
+        self._evento = asyncio.Event()
+        self._cerrada = False
+        buzon.al_depositar = self.despertar
+
+    def despertar(self):
+        """Despierta a quien espera; puede llamarse desde cualquier hilo"""
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                self._evento.set()
+                return
+        except RuntimeError:
+            pass
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._evento.set)
+
+    async def esperar(self, tiempo_espera=None, evento_parada=None):
+        """Espera hasta que haya mensajes, se active la parada o venza el tiempo"""
+        limite = None if tiempo_espera is None else time.monotonic() + tiempo_espera
+        while True:
+            self._evento.clear()
+            if len(self._buzon):
+                return True
+            if self._cerrada or (evento_parada is not None and evento_parada.is_set()):
+                return False
+            restante = None if limite is None else limite - time.monotonic()
+            if restante is not None and restante <= 0:
+                return False
+            if restante is None:
+                await self._evento.wait()
+                continue
+            # Temporizador del bucle en lugar de wait_for: no crea una tarea por espera
+            temporizador = self._loop.call_later(restante, self._evento.set)
+            try:
+                await self._evento.wait()
+            finally:
+                temporizador.cancel()
+
+    async def recibir(self, tiempo_espera=None):
+        """Retorna el siguiente mensaje o None si venció el tiempo o se cerró"""
+        while True:
+            mensaje = self._buzon.extraer()
+            if mensaje is not None or self._cerrada:
+                return mensaje
+            if not await self.esperar(tiempo_espera):
+                return self._buzon.extraer()
+
+    def extraer_todos(self):
+        """Extrae sin esperar todos los mensajes pendientes en orden de prioridad"""
+        return self._buzon.extraer_todos()
+
+    def cerrar(self):
+        """Cancela la suscripción y termina cualquier `async for` en curso"""
+        self._cerrada = True
+        self._buzon.al_depositar = None
+        self._bus.cancelar_suscripcion(self.nombre)
+        self.despertar()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        mensaje = await self.recibir()
+        if mensaje is None:
+            raise StopAsyncIteration
+        return mensaje
+
+class BusMensajesAsync:
+    """Fachada asyncio del bus de mensajes.
+
+    Comparte el índice de rutas y los buzones del BusMensajes subyacente, de modo
+    que agentes asyncio, agentes en hilos y la interfaz se comunican entre sí.
+    """
+    def __init__(self, bus=None):
+        self.bus = bus or bus_mensajes
+
+    async def publicar(self, mensaje, prioridad=0):
+        # Sin espera: con buzón lleno la política 'bloquear' rechaza en lugar de detener el bucle
+        return self.bus.enviar_mensaje(mensaje, tiempo_espera=0, prioridad=prioridad)
+
+    def suscribir(self, nombre, tipos=None, objetivos=None):
+        """Retorna una SuscripcionAsync; debe llamarse con el bucle de eventos en marcha"""
+        buzon = self.bus.suscribir(nombre, tipos=tipos, objetivos=objetivos)
+        return self.envolver_buzon(nombre, buzon)
+
+    def envolver_buzon(self, nombre, buzon):
+        """Expone como SuscripcionAsync un buzón ya suscrito (p. ej. el de un AgenteBase)"""
+        return SuscripcionAsync(self.bus, nombre, buzon, asyncio.get_running_loop())
+
+    def obtener_estadisticas(self):
+        return self.bus.obtener_estadisticas()
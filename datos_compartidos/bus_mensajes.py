@@ -1,118 +1,596 @@
 # datos_compartidos/bus_mensajes.py - Bus optimizado con prioridad para mensajes críticos
+import itertools
 import queue
 import threading
 import time
-import heapq
+from collections import deque
+from configuracion import TRAZAR_MENSAJES, COLAS_BUS, COALESCENCIA_BUS
+from utilidades.histograma import GrupoHistogramas
+
+NIVELES_PRIORIDAD = 3  # 0=normal, 1=alta, 2=crítica
+POLITICAS_DESBORDE = ('descartar_antiguo', 'descartar_nuevo', 'bloquear', 'rechazar')
+
+_secuencia = itertools.count(1)  # next() sobre count es atómico con el GIL
+
+def prioridad_efectiva(tipo, prioridad=0):
+    """Prioridad con que viaja un mensaje según su tipo (los críticos la fijan)"""
+    if tipo in ['comando', 'reiniciar_alerta']:
+        return 2  # Máxima prioridad para comandos y reset
+    if tipo in ['movimiento', 'alerta']:
+        return 1  # Alta prioridad para alertas
+    return prioridad
 
 class MensajePriorizado:
+    """Sobre con que viaja un mensaje por los buzones.
+
+    La marca de tiempo es monotónica (solo se usa para medir esperas y la
+    ventana de coalescencia) y `secuencia` da un orden total de publicación.
+    """
+    __slots__ = ('mensaje', 'prioridad', 'timestamp', 'secuencia', 'clave_coalescencia', 'coalescidos')
+
     def __init__(self, mensaje, prioridad=0):
         self.mensaje = mensaje
         self.prioridad = prioridad  # 0=normal, 1=alta, 2=crítica
-        self.timestamp = time.time()
-    
-    def __lt__(self, other):
-        # Mensajes con mayor prioridad van primero
-        if self.prioridad != other.prioridad:
-            return self.prioridad > other.prioridad
-        # Si misma prioridad, el más antiguo primero
-        return self.timestamp < other.timestamp
+        self.timestamp = time.monotonic()
+        self.secuencia = next(_secuencia)
+        self.clave_coalescencia = None  # (tipo, objetivo, de) si el buzón puede fusionarlo
+        self.coalescidos = 1
+
+class TrazasMensajes:
+    """Histogramas de latencia por tipo y prioridad de mensaje ('comando/p2').
+
+    espera: desde la publicación hasta que el suscriptor lo extrae del buzón.
+    manejo: duración del manejador del agente (ver AgenteBase.despachar_mensajes).
+    total:  desde la publicación hasta que el manejador terminó.
+    """
+    def __init__(self):
+        self.espera = GrupoHistogramas()
+        self.manejo = GrupoHistogramas()
+        self.total = GrupoHistogramas()
+
+    @staticmethod
+    def clave(mensaje_priorizado):
+        return f"{mensaje_priorizado.mensaje.get('tipo')}/p{mensaje_priorizado.prioridad}"
+
+    def registrar_espera(self, mensajes_priorizados):
+        ahora = time.monotonic()
+        for mensaje_priorizado in mensajes_priorizados:
+            self.espera.registrar(self.clave(mensaje_priorizado), ahora - mensaje_priorizado.timestamp)
+
+    def registrar_manejo(self, mensaje_priorizado, inicio, fin):
+        """`inicio` y `fin` son de time.monotonic(), como la marca del sobre"""
+        clave = self.clave(mensaje_priorizado)
+        self.manejo.registrar(clave, fin - inicio)
+        self.total.registrar(clave, fin - mensaje_priorizado.timestamp)
+
+    def reiniciar(self):
+        for grupo in (self.espera, self.manejo, self.total):
+            grupo.reiniciar()
+
+    def resumen(self):
+        return {'espera': self.espera.resumen(), 'manejo': self.manejo.resumen(), 'total': self.total.resumen()}
+
+class BuzonMensajes:
+    """Cola priorizada privada de un suscriptor del bus.
+
+    Hay una deque por nivel de prioridad: depositar y extraer son O(1) y
+    dentro de cada prioridad el orden es de llegada. Cada nivel tiene su
+    capacidad y su política de desborde (ver COLAS_BUS en configuracion.py);
+    los mensajes descartados se cuentan por prioridad en perdidos_por_prioridad.
+    Con coalescencia (ver COALESCENCIA_BUS) los mensajes repetidos de un mismo
+    emisor se fusionan con el pendiente en lugar de encolarse.
+
+    La espera se hace sobre una variable de condición: el consumidor queda
+    bloqueado sin consumir CPU y se despierta en cuanto se deposita un mensaje.
+    """
+    def __init__(self, nombre, max_size=100, colas=None, coalescencia=None):
+        self.nombre = nombre
+        self.max_size = max_size
+        colas = COLAS_BUS if colas is None else colas
+        self._capacidades = []
+        self._politicas = []
+        for nivel in range(NIVELES_PRIORIDAD):
+            config = colas.get(nivel, {})
+            politica = config.get('politica', 'descartar_antiguo')
+            if politica not in POLITICAS_DESBORDE:
+                raise ValueError(f"Política de desborde desconocida: {politica}")
+            self._capacidades.append(config.get('capacidad') or max_size)
+            self._politicas.append(politica)
+        self._colas = [deque() for _ in range(NIVELES_PRIORIDAD)]
+        self._orden_extraccion = self._colas[::-1]  # De mayor a menor prioridad
+        self._cantidad = 0
+        self._lock = threading.Lock()
+        self._condicion = threading.Condition(self._lock)
+        self._espacio = threading.Condition(self._lock)  # Emisores bloqueados por buzón lleno
+        self.mensajes_recibidos = 0
+        self.perdidos_por_prioridad = [0] * NIVELES_PRIORIDAD
+        # Coalescencia: tipos fusionables y entradas pendientes por (tipo, objetivo, de)
+        coalescencia = coalescencia or {}
+        self._tipos_coalescibles = frozenset(coalescencia.get('tipos', ()))
+        self.ventana_coalescencia = coalescencia.get('ventana', 0)
+        self._coalescibles = {}
+        self.mensajes_coalescidos = 0
+        # Callback opcional tras cada depósito (lo usa el bus asyncio para despertar al bucle)
+        self.al_depositar = None
+        # TrazasMensajes del bus (None si las trazas están desactivadas)
+        self.trazas = None
+
+    @property
+    def mensajes_perdidos(self):
+        return sum(self.perdidos_por_prioridad)
+
+    def depositar(self, mensaje_priorizado, tiempo_espera=0):
+        """Agrega un mensaje a la cola de su prioridad y despierta al consumidor.
+
+        Si la cola está llena se aplica su política de desborde; `tiempo_espera`
+        es lo máximo que bloquea la política 'bloquear'. Retorna False si el
+        mensaje fue rechazado ('bloquear' sin espacio a tiempo o 'rechazar').
+        """
+        limite = time.monotonic() + tiempo_espera if tiempo_espera > 0 else None
+        with self._lock:
+            exito, encolado = self._encolar(mensaje_priorizado, limite)
+            if encolado:
+                self._condicion.notify_all()
+
+        if encolado and self.al_depositar is not None:
+            self.al_depositar()
+        return exito
+
+    def depositar_lote(self, mensajes_priorizados, tiempo_espera=0):
+        """Como depositar() para varios mensajes con una sola toma del bloqueo y un solo aviso.
+
+        `tiempo_espera` limita la espera de todo el lote, no la de cada mensaje.
+        Retorna la lista de mensajes rechazados (vacía si entraron todos).
+        """
+        limite = time.monotonic() + tiempo_espera if tiempo_espera > 0 else None
+        rechazados = []
+        encolados = False
+        with self._lock:
+            for mensaje_priorizado in mensajes_priorizados:
+                exito, encolado = self._encolar(mensaje_priorizado, limite)
+                if not exito:
+                    rechazados.append(mensaje_priorizado)
+                encolados = encolados or encolado
+            if encolados:
+                self._condicion.notify_all()
+
+        if encolados and self.al_depositar is not None:
+            self.al_depositar()
+        return rechazados
+
+    def _encolar(self, mensaje_priorizado, limite):
+        """Aplica coalescencia y política de desborde (llamar con el bloqueo tomado).
+
+        `limite` es el instante (time.monotonic) hasta el que puede esperar la
+        política 'bloquear', o None para no esperar. Retorna (exito, encolado):
+        encolado es False si se fusionó con un pendiente o se descartó.
+        """
+        nivel = min(max(mensaje_priorizado.prioridad, 0), NIVELES_PRIORIDAD - 1)
+        capacidad = self._capacidades[nivel]
+        mensaje = mensaje_priorizado.mensaje
+        coalescible = bool(self._tipos_coalescibles) and mensaje.get('tipo') in self._tipos_coalescibles
+        if coalescible:
+            clave = (mensaje.get('tipo'), mensaje.get('objetivo'), mensaje.get('de'))
+            pendiente = self._coalescibles.get(clave)
+            if (pendiente is not None and
+                    mensaje_priorizado.timestamp - pendiente.timestamp < self.ventana_coalescencia):
+                # Conservar el lugar en la cola con el valor más reciente
+                pendiente.coalescidos += 1
+                pendiente.mensaje = dict(mensaje, coalescidos=pendiente.coalescidos)
+                self.mensajes_coalescidos += 1
+                return True, False
+            # Entrada propia del buzón: se modifica sin afectar a los demás destinos
+            original = mensaje_priorizado
+            mensaje_priorizado = MensajePriorizado(mensaje, original.prioridad)
+            mensaje_priorizado.timestamp = original.timestamp
+            mensaje_priorizado.clave_coalescencia = clave
+
+        cola = self._colas[nivel]
+        if len(cola) >= capacidad:
+            politica = self._politicas[nivel]
+            if politica == 'descartar_antiguo':
+                self._retirar(cola.popleft())
+                self._cantidad -= 1
+                self.perdidos_por_prioridad[nivel] += 1
+            else:
+                if politica == 'bloquear' and limite is not None:
+                    while len(cola) >= capacidad:
+                        restante = limite - time.monotonic()
+                        if restante <= 0:
+                            break
+                        self._espacio.wait(restante)
+                if len(cola) >= capacidad:
+                    self.perdidos_por_prioridad[nivel] += 1
+                    return politica == 'descartar_nuevo', False
+
+        cola.append(mensaje_priorizado)
+        self._cantidad += 1
+        if coalescible:
+            self._coalescibles[clave] = mensaje_priorizado
+        return True, True
+
+    def _retirar(self, mensaje_priorizado):
+        """Deja de fusionar sobre una entrada que sale de la cola (llamar con el bloqueo tomado)"""
+        clave = mensaje_priorizado.clave_coalescencia
+        if clave is not None and self._coalescibles.get(clave) is mensaje_priorizado:
+            del self._coalescibles[clave]
+
+    def esperar(self, tiempo_espera=None, evento_parada=None):
+        """Bloquea hasta que haya mensajes, se active la parada o venza el tiempo.
+
+        Retorna True si hay mensajes disponibles. Para que la parada despierte
+        la espera de inmediato, el evento debe llamar a despertar() al activarse
+        (ver EventoParada); con un threading.Event común se nota al vencer el tiempo.
+        """
+        limite = None if tiempo_espera is None else time.monotonic() + tiempo_espera
+        with self._condicion:
+            while not self._cantidad:
+                if evento_parada is not None and evento_parada.is_set():
+                    return False
+                if limite is None:
+                    self._condicion.wait()
+                    continue
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                self._condicion.wait(restante)
+            return True
+
+    def despertar(self):
+        """Despierta a todos los que esperan en el buzón (p. ej. al detener el sistema)"""
+        with self._condicion:
+            self._condicion.notify_all()
+            self._espacio.notify_all()
+
+    def extraer(self, tiempo_espera=0):
+        """Extrae el mensaje de mayor prioridad esperando hasta tiempo_espera segundos.
+
+        Retorna None si no llegó ningún mensaje a tiempo.
+        """
+        limite = time.monotonic() + tiempo_espera
+        with self._condicion:
+            while not self._cantidad:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return None
+                self._condicion.wait(restante)
+            for cola in self._orden_extraccion:
+                if cola:
+                    mensaje_priorizado = cola.popleft()
+                    break
+            if mensaje_priorizado.clave_coalescencia is not None:
+                self._retirar(mensaje_priorizado)
+            self._cantidad -= 1
+            self.mensajes_recibidos += 1
+            self._espacio.notify_all()
+        if self.trazas is not None:
+            self.trazas.registrar_espera((mensaje_priorizado,))
+        return mensaje_priorizado.mensaje
+
+    def extraer_todos(self):
+        """Extrae todos los mensajes en orden de prioridad"""
+        return [mensaje_priorizado.mensaje for mensaje_priorizado in self.extraer_todos_priorizados()]
+
+    def extraer_todos_priorizados(self):
+        """Como extraer_todos pero retorna los MensajePriorizado (mensaje, prioridad y marca de tiempo)"""
+        mensajes = []
+        with self._lock:
+            if not self._cantidad:
+                return mensajes
+            for cola in self._orden_extraccion:
+                mensajes.extend(cola)
+                cola.clear()
+            self._cantidad = 0
+            self._coalescibles.clear()
+            self.mensajes_recibidos += len(mensajes)
+            self._espacio.notify_all()
+        if self.trazas is not None:
+            self.trazas.registrar_espera(mensajes)
+        return mensajes
+
+    def extraer_lote(self, cantidad_maxima, tiempo_espera=0):
+        """Hasta `cantidad_maxima` mensajes en orden de prioridad, esperando hasta
+        tiempo_espera segundos a que haya al menos uno (lista vacía si no llegó)"""
+        return [mensaje_priorizado.mensaje
+                for mensaje_priorizado in self.extraer_lote_priorizados(cantidad_maxima, tiempo_espera)]
+
+    def extraer_lote_priorizados(self, cantidad_maxima, tiempo_espera=0):
+        """Como extraer_lote pero retorna los MensajePriorizado"""
+        limite = time.monotonic() + tiempo_espera
+        mensajes = []
+        with self._condicion:
+            while not self._cantidad:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return mensajes
+                self._condicion.wait(restante)
+            for cola in self._orden_extraccion:
+                faltan = cantidad_maxima - len(mensajes)
+                if faltan <= 0:
+                    break
+                if len(cola) <= faltan:
+                    mensajes.extend(cola)
+                    cola.clear()
+                else:
+                    mensajes.extend(cola.popleft() for _ in range(faltan))
+            if self._coalescibles:
+                for mensaje_priorizado in mensajes:
+                    if mensaje_priorizado.clave_coalescencia is not None:
+                        self._retirar(mensaje_priorizado)
+            self._cantidad -= len(mensajes)
+            self.mensajes_recibidos += len(mensajes)
+            self._espacio.notify_all()
+        if self.trazas is not None:
+            self.trazas.registrar_espera(mensajes)
+        return mensajes
+
+    def limpiar(self):
+        with self._lock:
+            for cola in self._colas:
+                cola.clear()
+            self._cantidad = 0
+            self._coalescibles.clear()
+            self._espacio.notify_all()
+
+    def __len__(self):
+        return self._cantidad
 
 class BusMensajes:
-    def __init__(self, max_size=100):
-        self._cola_priorizada = []  # Usamos heapq para cola priorizada
+    """Bus publicador/suscriptor con un buzón por agente.
+
+    Cada suscriptor declara los tipos y objetivos que le interesan; al publicar,
+    el índice de rutas entrega el mensaje solo a esos buzones. Los mensajes sin
+    ningún suscriptor interesado quedan en el buzón general, que es el que leen
+    los consumidores que no están suscritos (comportamiento anterior).
+    """
+    def __init__(self, max_size=100, trazar=None, colas=None, coalescencia=None):
+        self.max_size = max_size
+        self.colas = colas  # Capacidad y política por prioridad (None: COLAS_BUS)
+        # Coalescencia de mensajes repetidos (None: COALESCENCIA_BUS si está activada)
+        if coalescencia is None and COALESCENCIA_BUS['activada']:
+            coalescencia = COALESCENCIA_BUS
+        self.coalescencia = coalescencia
         self._lock = threading.Lock()
+        # Histogramas de latencia por tipo/prioridad (ver obtener_histogramas)
+        self.trazas = TrazasMensajes() if (TRAZAR_MENSAJES if trazar is None else trazar) else None
+        self._buzon_general = BuzonMensajes('general', max_size, colas, coalescencia)
+        self._buzon_general.trazas = self.trazas
+        # Índices de rutas: se reemplazan completos al suscribir (copia en escritura)
+        # para que publicar pueda leerlos sin tomar ningún bloqueo
+        self._suscriptores = {}       # nombre -> (buzon, tipos, objetivos)
+        self._rutas_tipo = {}         # tipo -> tupla de buzones
+        self._rutas_objetivo = {}     # objetivo -> tupla de buzones
+        self._buzones_comodin = ()    # suscriptores sin filtro (reciben todo)
+        # al_publicar(mensaje, prioridad): copia cada mensaje publicado fuera de este
+        # proceso (ver bus_procesos.PuenteBus); None si el bus es solo local
+        self.al_publicar = None
         self.estadisticas = {
             'mensajes_enviados': 0,
             'mensajes_recibidos': 0,
             'mensajes_perdidos': 0,
-            'mensajes_alta_prioridad': 0
+            'mensajes_alta_prioridad': 0,
+            'mensajes_sin_destino': 0,
+            'mensajes_coalescidos': 0
         }
-    
+
+    def suscribir(self, nombre, tipos=None, objetivos=None):
+        """Registra un suscriptor y retorna su buzón privado.
+
+        Sin tipos ni objetivos el suscriptor recibe todos los mensajes. Volver a
+        suscribir el mismo nombre reemplaza sus filtros conservando el buzón.
+        """
+        with self._lock:
+            anterior = self._suscriptores.get(nombre)
+            if anterior:
+                buzon = anterior[0]
+            else:
+                buzon = BuzonMensajes(nombre, self.max_size, self.colas, self.coalescencia)
+                buzon.trazas = self.trazas
+            self._suscriptores[nombre] = (buzon, frozenset(tipos or ()), frozenset(objetivos or ()))
+            self._reconstruir_rutas()
+        return buzon
+
+    def cancelar_suscripcion(self, nombre):
+        with self._lock:
+            datos = self._suscriptores.pop(nombre, None)
+            if datos is not None:
+                # Conservar lo que ya recibió y perdió para las estadísticas globales
+                self.estadisticas['mensajes_recibidos'] += datos[0].mensajes_recibidos
+                self.estadisticas['mensajes_perdidos'] += datos[0].mensajes_perdidos
+                self.estadisticas['mensajes_coalescidos'] += datos[0].mensajes_coalescidos
+                self._reconstruir_rutas()
+
+    def _reconstruir_rutas(self):
+        """Recalcula los índices de rutas (llamar con el bloqueo tomado)"""
+        rutas_tipo = {}
+        rutas_objetivo = {}
+        comodines = []
+        for buzon, tipos, objetivos in self._suscriptores.values():
+            if not tipos and not objetivos:
+                comodines.append(buzon)
+            for tipo in tipos:
+                rutas_tipo.setdefault(tipo, []).append(buzon)
+            for objetivo in objetivos:
+                rutas_objetivo.setdefault(objetivo, []).append(buzon)
+
+        self._rutas_tipo = {clave: tuple(valor) for clave, valor in rutas_tipo.items()}
+        self._rutas_objetivo = {clave: tuple(valor) for clave, valor in rutas_objetivo.items()}
+        self._buzones_comodin = tuple(comodines)
+
+    def _destinos(self, tipo, objetivo):
+        """Buzones interesados en un mensaje con ese tipo y objetivo"""
+        por_tipo = self._rutas_tipo.get(tipo, ())
+        por_objetivo = self._rutas_objetivo.get(objetivo, ())
+        destinos = por_tipo + por_objetivo + self._buzones_comodin
+        if por_tipo and (por_objetivo or self._buzones_comodin):
+            # Un suscriptor puede coincidir por varias rutas: entregar una sola vez
+            destinos = tuple(dict.fromkeys(destinos))
+        return destinos
+
     def enviar_mensaje(self, mensaje, tiempo_espera=0.05, prioridad=0):
         try:
             # Determinar prioridad automáticamente para mensajes críticos
-            if mensaje.get('tipo') in ['comando', 'reiniciar_alerta']:
-                prioridad = 2  # Máxima prioridad para comandos y reset
-            elif mensaje.get('tipo') in ['movimiento', 'alerta']:
-                prioridad = 1  # Alta prioridad para alertas
-            
+            prioridad = prioridad_efectiva(mensaje.get('tipo'), prioridad)
+
+            if self.al_publicar is not None:
+                self.al_publicar(mensaje, prioridad)
+
+        except Exception as e:
+            with self._lock:
+                self.estadisticas['mensajes_perdidos'] += 1
+            return False
+
+        return self.entregar_local(mensaje, tiempo_espera, prioridad)
+
+    def entregar_local(self, mensaje, tiempo_espera=0.05, prioridad=0):
+        """Entrega a los buzones de este bus sin pasar por al_publicar.
+
+        La usan los puentes entre procesos para los mensajes que llegan de
+        otro proceso (ya con su prioridad calculada).
+        """
+        try:
             mensaje_priorizado = MensajePriorizado(mensaje, prioridad)
-            
+
+            # Los descartes por buzón lleno se cuentan en cada buzón
+            exito = True
+            destinos = self._destinos(mensaje.get('tipo'), mensaje.get('objetivo'))
+            for buzon in destinos or (self._buzon_general,):
+                if not buzon.depositar(mensaje_priorizado, tiempo_espera):
+                    exito = False
+
             with self._lock:
-                if len(self._cola_priorizada) >= 100:  # Límite máximo
-                    # Remover mensajes más viejos con baja prioridad si es necesario
-                    self._limpiar_mensajes_viejos()
-                
-                heapq.heappush(self._cola_priorizada, mensaje_priorizado)
                 self.estadisticas['mensajes_enviados'] += 1
                 if prioridad > 0:
                     self.estadisticas['mensajes_alta_prioridad'] += 1
-            
-            return True
-            
+                if not destinos:
+                    self.estadisticas['mensajes_sin_destino'] += 1
+
+            return exito
+
         except Exception as e:
-            self.estadisticas['mensajes_perdidos'] += 1
+            with self._lock:
+                self.estadisticas['mensajes_perdidos'] += 1
             return False
-    
-    def recibir_mensaje(self, tiempo_espera=0.5):
+
+    def enviar_lote(self, mensajes, tiempo_espera=0.05, prioridades=None):
+        """Publica varios mensajes tomando una sola vez el bloqueo de cada buzón destino.
+
+        Agrupa los mensajes por buzón, deposita cada grupo con depositar_lote()
+        y actualiza las estadísticas una vez. `prioridades` (opcional) es una
+        secuencia paralela a `mensajes`; los tipos críticos la fijan igual que
+        en enviar_mensaje. `tiempo_espera` limita la espera de cada buzón
+        lleno con política 'bloquear' para todo el lote. Retorna cuántos
+        mensajes llegaron a todos sus destinos.
+        """
+        por_buzon = {}
+        cantidad = alta_prioridad = sin_destino = invalidos = 0
+        al_publicar = self.al_publicar
+        for indice, mensaje in enumerate(mensajes):
+            try:
+                tipo = mensaje.get('tipo')
+                prioridad = prioridad_efectiva(tipo, prioridades[indice] if prioridades is not None else 0)
+                if al_publicar is not None:
+                    al_publicar(mensaje, prioridad)
+                destinos = self._destinos(tipo, mensaje.get('objetivo'))
+            except Exception as e:
+                invalidos += 1
+                continue
+            mensaje_priorizado = MensajePriorizado(mensaje, prioridad)
+            cantidad += 1
+            if prioridad > 0:
+                alta_prioridad += 1
+            if not destinos:
+                sin_destino += 1
+                destinos = (self._buzon_general,)
+            for buzon in destinos:
+                grupo = por_buzon.get(buzon)
+                if grupo is None:
+                    por_buzon[buzon] = [mensaje_priorizado]
+                else:
+                    grupo.append(mensaje_priorizado)
+
+        # Los descartes por buzón lleno se cuentan en cada buzón
+        rechazados = set()
+        for buzon, grupo in por_buzon.items():
+            for mensaje_priorizado in buzon.depositar_lote(grupo, tiempo_espera):
+                rechazados.add(mensaje_priorizado.secuencia)
+
+        with self._lock:
+            self.estadisticas['mensajes_enviados'] += cantidad
+            self.estadisticas['mensajes_alta_prioridad'] += alta_prioridad
+            self.estadisticas['mensajes_sin_destino'] += sin_destino
+            self.estadisticas['mensajes_perdidos'] += invalidos
+        return cantidad - len(rechazados)
+
+    def rutas(self):
+        """Tipos y objetivos suscritos, y si hay suscriptores sin filtro: (tipos, objetivos, comodin)"""
+        return (frozenset(self._rutas_tipo), frozenset(self._rutas_objetivo), bool(self._buzones_comodin))
+
+    def _buzon(self, suscriptor):
+        if suscriptor is None:
+            return self._buzon_general
+        return self._suscriptores[suscriptor][0]
+
+    def recibir_mensaje(self, tiempo_espera=0.5, suscriptor=None):
         try:
-            inicio = time.time()
-            while time.time() - inicio < tiempo_espera:
-                with self._lock:
-                    if self._cola_priorizada:
-                        mensaje_priorizado = heapq.heappop(self._cola_priorizada)
-                        self.estadisticas['mensajes_recibidos'] += 1
-                        return mensaje_priorizado.mensaje
-                
-                time.sleep(0.005)  # Pequeña pausa para no saturar
-            return None
-            
+            # Espera bloqueante: despierta en cuanto se publica un mensaje
+            return self._buzon(suscriptor).extraer(tiempo_espera)
+
         except Exception as e:
             return None
-    
-    def recibir_todos_mensajes(self):
-        mensajes = []
+
+    def recibir_lote(self, cantidad_maxima=100, tiempo_espera=0.5, suscriptor=None):
+        """Hasta `cantidad_maxima` mensajes con una sola toma del bloqueo del buzón;
+        espera hasta tiempo_espera a que llegue al menos uno"""
         try:
-            with self._lock:
-                while self._cola_priorizada:
-                    mensaje_priorizado = heapq.heappop(self._cola_priorizada)
-                    mensajes.append(mensaje_priorizado.mensaje)
-                    self.estadisticas['mensajes_recibidos'] += 1
+            return self._buzon(suscriptor).extraer_lote(cantidad_maxima, tiempo_espera)
         except Exception as e:
-            pass
-        return mensajes
-    
-    def _limpiar_mensajes_viejos(self):
-        """Limpia mensajes con más de 2 segundos de antigüedad y baja prioridad"""
+            return []
+
+    def recibir_todos_mensajes(self, suscriptor=None):
         try:
-            tiempo_actual = time.time()
-            mensajes_temporales = []
-            
-            while self._cola_priorizada:
-                mensaje_priorizado = heapq.heappop(self._cola_priorizada)
-                # Mantener mensajes recientes o de alta prioridad
-                if (tiempo_actual - mensaje_priorizado.timestamp < 2 or 
-                    mensaje_priorizado.prioridad > 0):
-                    mensajes_temporales.append(mensaje_priorizado)
-            
-            # Reinsertar mensajes que se mantienen
-            for mensaje in mensajes_temporales:
-                heapq.heappush(self._cola_priorizada, mensaje)
-                
-        except Exception:
-            pass
-    
+            return self._buzon(suscriptor).extraer_todos()
+        except Exception as e:
+            return []
+
+    def _todos_los_buzones(self):
+        return [self._buzon_general] + [datos[0] for datos in list(self._suscriptores.values())]
+
+    def despertar_todos(self):
+        """Despierta a todos los consumidores bloqueados esperando mensajes"""
+        for buzon in self._todos_los_buzones():
+            buzon.despertar()
+
     def limpiar_cola(self):
-        with self._lock:
-            self._cola_priorizada = []
-    
+        for buzon in self._todos_los_buzones():
+            buzon.limpiar()
+
     def esta_vacia(self):
-        with self._lock:
-            return len(self._cola_priorizada) == 0
-    
+        return all(len(buzon) == 0 for buzon in self._todos_los_buzones())
+
     def obtener_estadisticas(self):
+        buzones = self._todos_los_buzones()
+        recibidos = sum(buzon.mensajes_recibidos for buzon in buzones)
+        perdidos_por_prioridad = [sum(perdidos) for perdidos in
+                                  zip(*(buzon.perdidos_por_prioridad for buzon in buzones))]
         with self._lock:
-            return self.estadisticas.copy()
+            estadisticas = self.estadisticas.copy()
+        estadisticas['mensajes_recibidos'] += recibidos
+        estadisticas['mensajes_perdidos'] += sum(perdidos_por_prioridad)
+        estadisticas['perdidos_por_prioridad'] = perdidos_por_prioridad
+        estadisticas['mensajes_coalescidos'] += sum(buzon.mensajes_coalescidos for buzon in buzones)
+        estadisticas['suscriptores'] = len(self._suscriptores)
+        return estadisticas
+
+    def obtener_histogramas(self):
+        """Percentiles (µs) de espera en cola, manejo y total por 'tipo/pN'"""
+        if self.trazas is None:
+            return {}
+        return self.trazas.resumen()
+
+    def reiniciar_histogramas(self):
+        if self.trazas is not None:
+            self.trazas.reiniciar()
 
 # Instancia global del bus de mensajes
-bus_mensajes = BusMensajes()
\ No newline at end of file
+bus_mensajes = BusMensajes()
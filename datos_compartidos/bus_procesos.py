@@ -0,0 +1,119 @@
+# datos_compartidos/bus_procesos.py - Puente del bus de mensajes entre procesos
+import threading
+
+def _le_interesa(rutas, tipo, objetivo):
+    tipos, objetivos, comodin = rutas
+    return comodin or tipo in tipos or objetivo in objetivos
+
+class ExtremoBus:
+    """Conexión de un proceso hijo con el PuenteBus del proceso principal.
+
+    Se crea en el principal con PuenteBus.crear_extremo() y se pasa al hijo,
+    que lo conecta a su bus local: lo que se publique en ese bus viaja al
+    principal, y lo que el principal reenvíe se entrega en los buzones locales.
+    """
+    def __init__(self, nombre, hacia_central, desde_central):
+        self.nombre = nombre
+        self._hacia_central = hacia_central
+        self._desde_central = desde_central
+        self.bus = None
+        self._hilo = None
+
+    def conectar(self, bus):
+        self.bus = bus
+        bus.al_publicar = self._publicar
+        self._hilo = threading.Thread(target=self._recibir, daemon=True, name=f'extremo-{self.nombre}')
+        self._hilo.start()
+
+    def anunciar_rutas(self):
+        """Informa al principal qué tipos y objetivos escuchan los suscriptores locales"""
+        self._hacia_central.put((self.nombre, 'rutas', self.bus.rutas()))
+
+    def _publicar(self, mensaje, prioridad):
+        self._hacia_central.put((self.nombre, 'mensaje', (mensaje, prioridad)))
+
+    def _recibir(self):
+        while True:
+            entrada = self._desde_central.get()
+            if entrada is None:
+                return
+            mensaje, prioridad = entrada
+            self.bus.entregar_local(mensaje, 0, prioridad)
+
+    def cerrar(self):
+        if self.bus is not None:
+            self.bus.al_publicar = None
+        self._hacia_central.put((self.nombre, 'cerrar', None))
+        if self._hilo is not None:
+            self._hilo.join(1.0)
+
+class PuenteBus:
+    """Une el bus del proceso principal con los buses de los procesos hijos.
+
+    Topología en estrella: los hijos envían todo lo que publican a una cola
+    común que vacía un hilo del principal; ese hilo lo entrega en el bus local
+    y lo reenvía solo a los otros hijos cuyas rutas anunciadas (tipos,
+    objetivos o comodín) coinciden, cada uno por su propia cola. Lo que se
+    publica en el principal (p. ej. la interfaz) se reenvía igual.
+
+    Los mensajes cruzan el límite de proceso serializados con pickle, así que
+    cada proceso recibe su propia copia.
+    """
+    def __init__(self, bus, contexto):
+        self.bus = bus
+        self._contexto = contexto
+        self._entrada = contexto.Queue()
+        self._extremos = {}  # nombre -> [cola hacia el hijo, rutas o None]
+        self._hilo = None
+        self.estadisticas = {'mensajes_recibidos': 0, 'mensajes_reenviados': 0}
+
+    def crear_extremo(self, nombre):
+        salida = self._contexto.Queue()
+        extremos = dict(self._extremos)
+        extremos[nombre] = [salida, None]  # Sin rutas anunciadas no recibe nada
+        self._extremos = extremos  # Copia en escritura: _reenviar itera sin bloqueo
+        return ExtremoBus(nombre, self._entrada, salida)
+
+    def iniciar(self):
+        self.bus.al_publicar = lambda mensaje, prioridad: self._reenviar(mensaje, prioridad, None)
+        self._hilo = threading.Thread(target=self._bombear, daemon=True, name='puente-bus')
+        self._hilo.start()
+
+    def _bombear(self):
+        while True:
+            entrada = self._entrada.get()
+            if entrada is None:
+                return
+            origen, clase, datos = entrada
+            if clase == 'mensaje':
+                mensaje, prioridad = datos
+                self.estadisticas['mensajes_recibidos'] += 1
+                self._reenviar(mensaje, prioridad, origen)
+                self.bus.entregar_local(mensaje, 0, prioridad)
+            elif clase == 'rutas':
+                if origen in self._extremos:
+                    self._extremos[origen][1] = datos
+            elif clase == 'cerrar':
+                extremos = dict(self._extremos)
+                extremo = extremos.pop(origen, None)
+                self._extremos = extremos
+                if extremo is not None:
+                    extremo[0].put(None)
+
+    def _reenviar(self, mensaje, prioridad, origen):
+        tipo, objetivo = mensaje.get('tipo'), mensaje.get('objetivo')
+        for nombre, (salida, rutas) in self._extremos.items():
+            if nombre != origen and rutas is not None and _le_interesa(rutas, tipo, objetivo):
+                salida.put((mensaje, prioridad))
+                self.estadisticas['mensajes_reenviados'] += 1
+
+    def detener(self):
+        self.bus.al_publicar = None
+        if self._hilo is not None:
+            self._entrada.put(None)
+            self._hilo.join(1.0)
+            self._hilo = None
+        # Un hijo que ya terminó no vaciará su cola: no esperar a escribirla al salir
+        for salida, _ in self._extremos.values():
+            salida.cancel_join_thread()
+        self._extremos = {}
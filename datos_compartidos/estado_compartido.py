@@ -0,0 +1,277 @@
+# datos_compartidos/estado_compartido.py - Estado del sistema en memoria compartida entre procesos
+import multiprocessing
+import struct
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from utilidades.registrador import registrador
+from .estado_sistema import ESTADO_INICIAL, InstantaneaEstado, Transaccion
+
+_SECUENCIA = struct.Struct('<Q')
+_CABECERA = struct.Struct('<QQ')  # secuencia, versión global
+_CAMPO = struct.Struct('<dQ')     # valor, versión de la clave
+
+class EstadoCompartido:
+    """Misma interfaz que EstadoSistema, con los valores en un bloque de
+    multiprocessing.shared_memory visible para todos los procesos.
+
+    El esquema es fijo (las claves de ESTADO_INICIAL): cada clave ocupa un
+    double con su valor (los bool como 0/1) y un entero con su versión, tras
+    una cabecera con el contador de secuencia y la versión global.
+
+    Los escritores se serializan con una Condition entre procesos, que además
+    despierta a quienes esperan cambios. Los lectores no toman bloqueo: usan
+    un seqlock. El escritor pone la secuencia en impar mientras escribe y en
+    par al terminar; el lector copia el bloque y reintenta si la secuencia era
+    impar o cambió durante la copia.
+
+    Los eventos de los procesos hijos viajan por una cola hasta el registrador
+    del proceso principal. Los callbacks de suscribir() corren en un hilo
+    observador de cada proceso (no en el hilo que escribió), porque la
+    escritura pudo ocurrir en otro proceso.
+    """
+    def __init__(self, valores=None, contexto=None):
+        contexto = contexto or multiprocessing.get_context('spawn')
+        self.claves = tuple(ESTADO_INICIAL)
+        self._formato = struct.Struct('<QQ' + 'dQ' * len(self.claves))
+        self._memoria = shared_memory.SharedMemory(create=True, size=self._formato.size)
+        self._cambio = contexto.Condition(contexto.Lock())
+        self._eventos = contexto.Queue()
+        self.principal = True
+        self._preparar()
+
+        iniciales = dict(ESTADO_INICIAL)
+        iniciales.update({clave: valor for clave, valor in (valores or {}).items() if clave in iniciales})
+        with self._cambio:
+            self._escribir(iniciales)
+
+        # Eventos que registran los procesos hijos
+        self._hilo_eventos = threading.Thread(target=self._recibir_eventos, daemon=True, name='estado-eventos')
+        self._hilo_eventos.start()
+
+    def _preparar(self):
+        """Estado local de cada proceso (no se transfiere al crear un hijo)"""
+        self._tipos = tuple(type(ESTADO_INICIAL[clave]) for clave in self.claves)
+        self._campos = {clave: (_CABECERA.size + indice * _CAMPO.size, self._tipos[indice])
+                        for indice, clave in enumerate(self.claves)}
+        self._buffer = self._memoria.buf
+        self._cache = (None, None)  # (secuencia, InstantaneaEstado)
+        self._suscriptores = []
+        self._bloqueo_suscriptores = threading.Lock()
+        self._hilo_observador = None
+        self._cerrado = False
+
+    def __getstate__(self):
+        # Solo válido al crear un proceso hijo (la Condition y la Queue lo exigen)
+        return {'nombre': self._memoria.name, 'cambio': self._cambio, 'eventos': self._eventos,
+                'claves': self.claves}
+
+    def __setstate__(self, datos):
+        self.claves = datos['claves']
+        self._formato = struct.Struct('<QQ' + 'dQ' * len(self.claves))
+        # Los hijos creados con 'spawn' comparten el resource_tracker del principal,
+        # así que adjuntarse no agrega un dueño nuevo: solo el principal lo libera
+        self._memoria = shared_memory.SharedMemory(name=datos['nombre'])
+        self._cambio = datos['cambio']
+        self._eventos = datos['eventos']
+        self.principal = False
+        self._preparar()
+
+    # --- Lectura (seqlock) ---
+
+    def obtener_todo(self):
+        """Instantánea consistente del bloque compartido (sin bloqueo)"""
+        buffer = self._buffer
+        while True:
+            secuencia = _SECUENCIA.unpack_from(buffer)[0]
+            cache_secuencia, instantanea = self._cache
+            if secuencia == cache_secuencia:
+                return instantanea
+            if secuencia & 1:
+                time.sleep(0)  # Escritura en curso en otro proceso
+                continue
+            campos = self._formato.unpack_from(buffer)
+            if _SECUENCIA.unpack_from(buffer)[0] == secuencia:
+                break
+        datos = {}
+        versiones = {}
+        for indice, clave in enumerate(self.claves):
+            datos[clave] = self._tipos[indice](campos[2 + indice * 2])
+            versiones[clave] = campos[3 + indice * 2]
+        instantanea = InstantaneaEstado(datos, versiones, campos[1])
+        self._cache = (secuencia, instantanea)
+        return instantanea
+
+    def obtener(self, clave):
+        """Lee una sola clave con el seqlock, sin decodificar el bloque entero"""
+        buffer = self._buffer
+        desplazamiento, tipo = self._campo(clave)
+        while True:
+            secuencia = _SECUENCIA.unpack_from(buffer)[0]
+            cache_secuencia, instantanea = self._cache
+            if secuencia == cache_secuencia:
+                return instantanea[clave]
+            if secuencia & 1:
+                time.sleep(0)
+                continue
+            valor = _CAMPO.unpack_from(buffer, desplazamiento)[0]
+            if _SECUENCIA.unpack_from(buffer)[0] == secuencia:
+                return tipo(valor)
+
+    def leer(self, *claves):
+        instantanea = self.obtener_todo()
+        return tuple(instantanea[clave] for clave in claves)
+
+    def obtener_version(self, *claves):
+        """Versión más reciente entre las claves dadas (o global si no se indican)"""
+        instantanea = self.obtener_todo()
+        if not claves:
+            return instantanea.version
+        return max(instantanea.version_de(clave) for clave in claves)
+
+    # --- Escritura (con self._cambio tomado) ---
+
+    def _campo(self, clave):
+        if clave not in self._campos:
+            raise KeyError(f"'{clave}' no está en el esquema del estado compartido")
+        return self._campos[clave]
+
+    def _valor(self, clave):
+        """Valor actual leído directo del bloque (solo con self._cambio tomado)"""
+        desplazamiento, tipo = self._campo(clave)
+        return tipo(_CAMPO.unpack_from(self._buffer, desplazamiento)[0])
+
+    def _escribir(self, cambios):
+        """Publica los cambios con una versión nueva y despierta a quienes esperan"""
+        desplazamientos = [self._campo(clave)[0] for clave in cambios]
+        buffer = self._buffer
+        secuencia, version = _CABECERA.unpack_from(buffer)
+        version += 1
+        _SECUENCIA.pack_into(buffer, 0, secuencia + 1)  # Impar: escritura en curso
+        for desplazamiento, valor in zip(desplazamientos, cambios.values()):
+            _CAMPO.pack_into(buffer, desplazamiento, float(valor), version)
+        _CABECERA.pack_into(buffer, 0, secuencia + 2, version)
+        self._cambio.notify_all()
+        return version
+
+    def actualizar(self, clave, valor):
+        with self._cambio:
+            if self._valor(clave) == valor:
+                return  # Sin cambio real: no se notifica
+            self._escribir({clave: valor})
+
+    def modificar(self, clave, funcion):
+        """Lectura-modificación-escritura atómica entre procesos; retorna el valor nuevo"""
+        with self._cambio:
+            anterior = self._valor(clave)
+            valor = funcion(anterior)
+            if valor != anterior:
+                self._escribir({clave: valor})
+        return valor
+
+    @contextmanager
+    def transaccion(self, *claves):
+        """Como EstadoSistema.transaccion; bloquea todo el estado (las claves se ignoran)"""
+        with self._cambio:
+            transaccion = Transaccion(self.obtener_todo())
+            yield transaccion
+            for mensaje in transaccion.eventos:
+                self.registrar_evento(mensaje)
+            if transaccion.cambios:
+                self._escribir(dict(transaccion.cambios))
+
+    # --- Eventos del registro ---
+
+    def registrar_evento(self, mensaje):
+        if self.principal:
+            registrador.registrar(mensaje)
+        else:
+            self._eventos.put(mensaje)
+
+    def obtener_eventos(self, cantidad=10):
+        return registrador.recientes(cantidad)
+
+    def limpiar_registro(self):
+        registrador.limpiar()
+
+    def _recibir_eventos(self):
+        while True:
+            mensaje = self._eventos.get()
+            if mensaje is None:
+                return
+            registrador.registrar(mensaje)
+
+    # --- Espera y notificación de cambios ---
+
+    def esperar_cambio(self, claves=None, version=0, tiempo_espera=None):
+        """Bloquea hasta que alguna clave tenga versión mayor que `version` (en cualquier proceso)"""
+        claves = tuple(claves or ())
+        with self._cambio:
+            if self._cambio.wait_for(lambda: self.obtener_version(*claves) > version, tiempo_espera):
+                return self.obtener_version(*claves)
+            return None
+
+    def suscribir(self, callback, claves=None):
+        """Registra callback(clave, valor, version); lo llama el hilo observador de este proceso"""
+        with self._bloqueo_suscriptores:
+            self._suscriptores = self._suscriptores + [(frozenset(claves) if claves else None, callback)]
+            if self._hilo_observador is None:
+                self._hilo_observador = threading.Thread(target=self._observar, daemon=True,
+                                                         name='estado-observador')
+                self._hilo_observador.start()
+        return callback
+
+    def cancelar_suscripcion(self, callback):
+        with self._bloqueo_suscriptores:
+            self._suscriptores = [(claves, cb) for claves, cb in self._suscriptores if cb != callback]
+
+    def _observar(self):
+        """Compara versiones por clave tras cada cambio y llama a los callbacks interesados"""
+        vistas = dict(self.obtener_todo()._versiones)
+        version = self.obtener_version()
+        while not self._cerrado:
+            with self._cambio:
+                self._cambio.wait_for(lambda: self._cerrado or self.obtener_version() > version, 1.0)
+            instantanea = self.obtener_todo()
+            version = instantanea.version
+            for clave in self.claves:
+                version_clave = instantanea.version_de(clave)
+                if version_clave <= vistas[clave]:
+                    continue
+                vistas[clave] = version_clave
+                for claves, callback in self._suscriptores:
+                    if claves is None or clave in claves:
+                        try:
+                            callback(clave, instantanea[clave], version_clave)
+                        except Exception as error:
+                            print(f"[EstadoCompartido] Error en callback de '{clave}': {error}")
+
+    def cerrar(self):
+        """Detiene los hilos locales; el proceso principal además libera el bloque"""
+        self._cerrado = True
+        with self._cambio:
+            self._cambio.notify_all()
+        if self._hilo_observador is not None:
+            self._hilo_observador.join(2.0)
+        if self.principal:
+            self._eventos.put(None)
+            self._hilo_eventos.join(1.0)
+        self._cache = (None, None)
+        self._buffer = None
+        self._memoria.close()
+        if self.principal:
+            self._memoria.unlink()
+
+def instalar_estado(estado):
+    """Reemplaza la instancia global estado_sistema en todos los módulos ya importados.
+
+    Los módulos la importan con `from ... import estado_sistema`, así que
+    cambiar solo el atributo del módulo no alcanza. Retorna la instancia anterior.
+    """
+    anterior = sys.modules['datos_compartidos.estado_sistema'].estado_sistema
+    for modulo in list(sys.modules.values()):
+        if getattr(modulo, 'estado_sistema', None) is anterior:
+            modulo.estado_sistema = estado
+    return anterior
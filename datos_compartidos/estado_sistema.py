@@ -1,44 +1,345 @@
 # datos_compartidos/estado_sistema.py - Estado compartido del sistema
+import itertools
 import threading
-import time
+from collections.abc import Mapping
+from contextlib import ExitStack, contextmanager, nullcontext
+from configuracion import ESTRATEGIA_BLOQUEO_ESTADO, FRAGMENTOS_ESTADO
+from utilidades.registrador import registrador
+
+# Claves del estado y sus valores iniciales (también es el esquema fijo de EstadoCompartido)
+ESTADO_INICIAL = {
+    'es_noche': False,
+    'presencia_esperada': True,
+    'movimiento_detectado': False,
+    'temperatura': 22.0,
+    'calefaccion_activada': False,
+    'ventilador_activado': False,
+    'luces_activadas': False,
+    'alerta_seguridad': False
+}
+
+class InstantaneaEstado(Mapping):
+    """Vista inmutable y consistente del estado en una versión dada.
+
+    Nunca se modifica después de publicarse: cada escritura crea una nueva
+    instantánea y la intercambia de forma atómica, así que los lectores no
+    necesitan bloqueo y pueden conservarla todo el tiempo que quieran.
+    """
+    __slots__ = ('_datos', '_versiones', 'version')
+
+    def __init__(self, datos, versiones, version):
+        self._datos = datos
+        self._versiones = versiones
+        self.version = version
+
+    def __getitem__(self, clave):
+        return self._datos[clave]
+
+    def __iter__(self):
+        return iter(self._datos)
+
+    def __len__(self):
+        return len(self._datos)
+
+    def version_de(self, clave):
+        return self._versiones.get(clave, 0)
+
+    def copy(self):
+        """Copia mutable (dict) para quien necesite modificarla"""
+        return dict(self._datos)
+
+    def __repr__(self):
+        return f"InstantaneaEstado(v{self.version}, {self._datos!r})"
+
+class Transaccion:
+    """Cambios pendientes de una transacción sobre EstadoSistema.
+
+    Las lecturas ven los cambios ya hechos dentro de la transacción; nada se
+    publica hasta que el bloque `with` termina sin excepción.
+    """
+    def __init__(self, instantanea):
+        self._base = instantanea
+        self.cambios = {}
+        self.eventos = []
+
+    def __getitem__(self, clave):
+        if clave in self.cambios:
+            return self.cambios[clave]
+        return self._base[clave]
+
+    def __setitem__(self, clave, valor):
+        self.actualizar(clave, valor)
+
+    def obtener(self, clave):
+        return self[clave]
+
+    def actualizar(self, clave, valor):
+        if clave in self._base and self._base[clave] == valor:
+            self.cambios.pop(clave, None)  # Vuelve al valor original: no es un cambio
+        else:
+            self.cambios[clave] = valor
+
+    def modificar(self, clave, funcion):
+        valor = funcion(self[clave])
+        self.actualizar(clave, valor)
+        return valor
+
+    def registrar_evento(self, mensaje):
+        self.eventos.append(mensaje)
+
+class Fragmento:
+    """Grupo de claves con su propio bloqueo de escritura e instantánea"""
+    __slots__ = ('nombre', 'bloqueo', 'instantanea')
+
+    def __init__(self, nombre, datos):
+        self.nombre = nombre
+        self.bloqueo = threading.Lock()
+        self.instantanea = InstantaneaEstado(datos, dict.fromkeys(datos, 0), 0)
 
 class EstadoSistema:
-    def __init__(self):
-        self._bloqueo = threading.Lock()
-        self._estado = {
-            'es_noche': False,
-            'presencia_esperada': True,
-            'movimiento_detectado': False,
-            'temperatura': 22.0,
-            'calefaccion_activada': False,
-            'ventilador_activado': False,
-            'luces_activadas': False,
-            'alerta_seguridad': False,
-            'registro_eventos': []
-        }
-    
+    """Estado compartido con versión por clave y notificación de cambios.
+
+    Cada escritura que cambia un valor toma un número de un contador global y
+    lo guarda como versión de la clave, así que las versiones por clave son
+    monótonas. Los consumidores pueden suscribir callbacks o bloquearse en
+    esperar_cambio() en lugar de sondear el estado completo.
+
+    Los eventos se delegan al registrador (utilidades.registrador), que no
+    toma el bloqueo del estado.
+
+    Las lecturas no toman bloqueo: leen la instantánea inmutable vigente,
+    que los escritores reemplazan (copia en escritura) bajo el bloqueo.
+
+    estrategia_bloqueo elige cómo se serializan los escritores:
+      - 'global': un único bloqueo e instantánea para todo el estado.
+      - 'fragmentos': un bloqueo e instantánea por grupo de claves
+        (FRAGMENTOS_ESTADO), así que escribir el clima no espera a la
+        iluminación ni a la seguridad. obtener_todo() combina los
+        fragmentos; cada fragmento es consistente, pero dos fragmentos
+        pueden reflejar escrituras de momentos distintos.
+    """
+    def __init__(self, estrategia_bloqueo=None):
+        self.estrategia_bloqueo = estrategia_bloqueo or ESTRATEGIA_BLOQUEO_ESTADO
+        estado = dict(ESTADO_INICIAL)
+        if self.estrategia_bloqueo == 'global':
+            grupos = {}
+        elif self.estrategia_bloqueo == 'fragmentos':
+            grupos = FRAGMENTOS_ESTADO
+        else:
+            raise ValueError(f"Estrategia de bloqueo desconocida: {self.estrategia_bloqueo}")
+
+        # Las claves sin grupo (y las que se agreguen después) van al fragmento 'general'
+        self._fragmento_de = {}
+        self._fragmentos = []
+        for nombre, claves in list(grupos.items()) + [('general', tuple(estado))]:
+            datos = {clave: estado[clave] for clave in claves
+                     if clave in estado and clave not in self._fragmento_de}
+            fragmento = Fragmento(nombre, datos)
+            self._fragmentos.append(fragmento)
+            self._fragmento_de.update(dict.fromkeys(datos, fragmento))
+        self._general = self._fragmentos[-1]
+        self._unico = self._fragmentos[0] if len(self._fragmentos) == 1 else None
+        self._combinada = None
+
+        self._contador_versiones = itertools.count(1)
+        # Solo hace falta con varios fragmentos; con uno, su bloqueo ya serializa
+        self._bloqueo_publicacion = threading.Lock() if self._unico is None else nullcontext()
+        self._cambio = threading.Condition(threading.Lock())
+        self._esperando = 0
+        self._suscriptores = []  # (claves o None, callback)
+
+    def _fragmento(self, clave):
+        return self._fragmento_de.get(clave, self._general)
+
     def actualizar(self, clave, valor):
-        with self._bloqueo:
-            self._estado[clave] = valor
-    
+        fragmento = self._fragmento(clave)
+        with fragmento.bloqueo:
+            datos = fragmento.instantanea._datos
+            if clave in datos and datos[clave] == valor:
+                return  # Sin cambio real: no se notifica
+            version = self._publicar(fragmento, {clave: valor})
+        self._notificar(clave, valor, version)
+
     def obtener(self, clave):
-        with self._bloqueo:
-            return self._estado[clave]
-    
+        return self._fragmento(clave).instantanea[clave]
+
     def obtener_todo(self):
-        with self._bloqueo:
-            return self._estado.copy()
-    
+        """Instantánea inmutable del estado (sin copia ni bloqueo)"""
+        if self._unico is not None:
+            return self._unico.instantanea
+
+        # Con fragmentos se combinan sus instantáneas; se reutiliza mientras no cambien
+        partes = tuple(fragmento.instantanea for fragmento in self._fragmentos)
+        combinada = self._combinada
+        if combinada is not None and combinada[0] == partes:
+            return combinada[1]
+        datos = {}
+        versiones = {}
+        for parte in partes:
+            datos.update(parte._datos)
+            versiones.update(parte._versiones)
+        instantanea = InstantaneaEstado(datos, versiones, max(parte.version for parte in partes))
+        self._combinada = (partes, instantanea)
+        return instantanea
+
+    def leer(self, *claves):
+        """Lee varias claves con una sola instantánea (consistentes dentro de cada fragmento)"""
+        if self._unico is not None:
+            instantanea = self._unico.instantanea
+            return tuple(instantanea[clave] for clave in claves)
+        return tuple(self.obtener(clave) for clave in claves)
+
+    def modificar(self, clave, funcion):
+        """Lectura-modificación-escritura atómica: guarda funcion(valor_actual).
+
+        La función se ejecuta con el bloqueo tomado, así que debe ser breve y
+        no acceder a estado_sistema. Retorna el valor nuevo.
+        """
+        fragmento = self._fragmento(clave)
+        with fragmento.bloqueo:
+            anterior = fragmento.instantanea[clave]
+            valor = funcion(anterior)
+            if valor == anterior:
+                return valor
+            version = self._publicar(fragmento, {clave: valor})
+        self._notificar(clave, valor, version)
+        return valor
+
+    @contextmanager
+    def transaccion(self, *claves):
+        """Agrupa lecturas y escrituras de varias claves bajo un único bloqueo.
+
+        Uso:
+            with estado_sistema.transaccion() as estado:
+                if estado['calefaccion_activada']:
+                    estado['temperatura'] = estado['temperatura'] + 0.1
+
+        Con estrategia 'fragmentos' conviene indicar las claves que se usarán
+        para bloquear solo sus fragmentos (por defecto se bloquean todos).
+        Los cambios se publican juntos en una sola versión al salir del bloque y
+        se descartan si ocurre una excepción. Dentro del bloque no debe usarse
+        estado_sistema directamente (los bloqueos no son reentrantes).
+        """
+        if claves:
+            involucrados = {id(fragmento): fragmento for fragmento in map(self._fragmento, claves)}
+            fragmentos = [fragmento for fragmento in self._fragmentos if id(fragmento) in involucrados]
+        else:
+            fragmentos = self._fragmentos
+
+        with ExitStack() as pila:
+            # Orden fijo de adquisición para evitar interbloqueos entre transacciones
+            for fragmento in fragmentos:
+                pila.enter_context(fragmento.bloqueo)
+
+            transaccion = Transaccion(self.obtener_todo())
+            yield transaccion
+            cambios = dict(transaccion.cambios)
+            fuera = {self._fragmento(clave).nombre for clave in cambios} - {f.nombre for f in fragmentos}
+            if fuera:
+                raise RuntimeError(f"La transacción escribe en fragmentos no bloqueados: {sorted(fuera)}")
+
+            # Los eventos solo se registran si la transacción se confirma
+            for mensaje in transaccion.eventos:
+                registrador.registrar(mensaje)
+            if not cambios:
+                return
+
+            with self._bloqueo_publicacion:
+                version = next(self._contador_versiones)
+                for fragmento in fragmentos:
+                    propios = {clave: valor for clave, valor in cambios.items() if self._fragmento(clave) is fragmento}
+                    if propios:
+                        self._publicar(fragmento, propios, version)
+        for clave, valor in cambios.items():
+            self._notificar(clave, valor, version)
+
     def registrar_evento(self, mensaje):
-        with self._bloqueo:
-            timestamp = time.strftime('%H:%M:%S')
-            self._estado['registro_eventos'].insert(0, f"{timestamp} - {mensaje}")
-            if len(self._estado['registro_eventos']) > 10:
-                self._estado['registro_eventos'] = self._estado['registro_eventos'][:10]
-    
+        """Registra un evento (ver utilidades.registrador; no toma el bloqueo del estado)"""
+        registrador.registrar(mensaje)
+
+    def obtener_eventos(self, cantidad=10):
+        """Eventos más recientes primero, formateados como 'HH:MM:SS - mensaje'"""
+        return registrador.recientes(cantidad)
+
     def limpiar_registro(self):
-        with self._bloqueo:
-            self._estado['registro_eventos'] = []
+        registrador.limpiar()
+
+    def _publicar(self, fragmento, cambios, version=None):
+        """Crea y publica la instantánea siguiente del fragmento (con su bloqueo tomado).
+
+        Todas las claves cambiadas comparten la nueva versión. Si se pasa una
+        versión, quien llama ya tiene tomado _bloqueo_publicacion.
+        """
+        anterior = fragmento.instantanea
+        datos = dict(anterior._datos)
+        datos.update(cambios)
+        versiones = dict(anterior._versiones)
+        if version is None:
+            # Con fragmentos, tomar la versión y publicar deben ser un paso indivisible
+            # respecto de los demás fragmentos para que la versión global nunca retroceda
+            with self._bloqueo_publicacion:
+                version = next(self._contador_versiones)
+                versiones.update(dict.fromkeys(cambios, version))
+                fragmento.instantanea = InstantaneaEstado(datos, versiones, version)
+        else:
+            versiones.update(dict.fromkeys(cambios, version))
+            fragmento.instantanea = InstantaneaEstado(datos, versiones, version)
+        for clave in cambios:
+            if clave not in self._fragmento_de:
+                self._fragmento_de[clave] = fragmento
+        return version
+
+    def _notificar(self, clave, valor, version):
+        """Despierta a esperar_cambio() y llama a los callbacks, fuera de los bloqueos"""
+        # Quien espera incrementa _esperando antes de evaluar su condición, así
+        # que si aquí se lee 0 la instantánea nueva ya será visible para él
+        if self._esperando:
+            with self._cambio:
+                self._cambio.notify_all()
+        for claves, callback in self._suscriptores:
+            if claves is None or clave in claves:
+                try:
+                    callback(clave, valor, version)
+                except Exception as error:
+                    print(f"[EstadoSistema] Error en callback de '{clave}': {error}")
+
+    def obtener_version(self, *claves):
+        """Versión más reciente entre las claves dadas (o global si no se indican)"""
+        if not claves:
+            return max(fragmento.instantanea.version for fragmento in self._fragmentos)
+        return max(self._fragmento(clave).instantanea.version_de(clave) for clave in claves)
+
+    def esperar_cambio(self, claves=None, version=0, tiempo_espera=None):
+        """Bloquea hasta que alguna clave tenga versión mayor que `version`.
+
+        Retorna la versión actual de esas claves, o None si venció el tiempo.
+        Con tiempo_espera=0 sirve como consulta sin bloqueo.
+        """
+        claves = tuple(claves or ())
+        with self._cambio:
+            self._esperando += 1
+            try:
+                if self._cambio.wait_for(lambda: self.obtener_version(*claves) > version, tiempo_espera):
+                    return self.obtener_version(*claves)
+                return None
+            finally:
+                self._esperando -= 1
+
+    def suscribir(self, callback, claves=None):
+        """Registra callback(clave, valor, version) para cambios en las claves dadas.
+
+        El callback se ejecuta en el hilo que hizo la escritura, fuera del
+        bloqueo, así que debe ser breve (típicamente marcar un flag o encolar).
+        """
+        with self._cambio:
+            suscriptores = list(self._suscriptores)
+            suscriptores.append((frozenset(claves) if claves else None, callback))
+            self._suscriptores = suscriptores  # Copia en escritura: _notificar itera sin bloqueo
+        return callback
+
+    def cancelar_suscripcion(self, callback):
+        with self._cambio:
+            self._suscriptores = [(claves, cb) for claves, cb in self._suscriptores if cb != callback]
 
 # Instancia global del estado del sistema
-estado_sistema = EstadoSistema()
\ No newline at end of file
+estado_sistema = EstadoSistema()
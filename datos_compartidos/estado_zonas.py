@@ -0,0 +1,200 @@
+# datos_compartidos/estado_zonas.py - Estado por zona (habitaciones de uno o varios hogares)
+import itertools
+import sys
+import threading
+from array import array
+from configuracion import HOGARES
+
+# Atributos de cada zona: código de array.array y valor inicial.
+# 'd' = float de 8 bytes; 'B' = byte sin signo usado como booleano.
+ATRIBUTOS_ZONA = {
+    'temperatura': ('d', 22.0),
+    'calefaccion_activada': ('B', 0),
+    'ventilador_activado': ('B', 0),
+    'luces_activadas': ('B', 0),
+    'movimiento_detectado': ('B', 0),
+    'alerta_seguridad': ('B', 0)
+}
+
+class EstadoZonas:
+    """Estado de miles de zonas en columnas compactas (struct-of-arrays).
+
+    Cada atributo es un array.array con una posición por zona, así que una
+    zona ocupa unos pocos bytes por atributo y recorrer un atributo en todas
+    las zonas es recorrer memoria contigua. Las zonas se identifican por un
+    id de texto (p. ej. 'casa1/sala') y pertenecen a un hogar.
+    """
+    def __init__(self):
+        self._bloqueo = threading.Lock()
+        self._columnas = {nombre: array(codigo) for nombre, (codigo, _) in ATRIBUTOS_ZONA.items()}
+        self._booleanas = frozenset(nombre for nombre, (codigo, _) in ATRIBUTOS_ZONA.items() if codigo == 'B')
+        self._indice = {}               # id_zona -> posición en las columnas
+        self._ids = []                  # posición -> id_zona
+        self._hogar_de = array('I')     # posición -> número de hogar
+        self._hogares = {}              # hogar -> número
+        self._nombres_hogar = []        # número -> hogar
+        self._versiones = array('Q')    # posición -> versión de la última escritura
+        self._contador = itertools.count(1)
+        self._version = 0
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, id_zona):
+        return id_zona in self._indice
+
+    def agregar_zona(self, id_zona, hogar='casa', **valores):
+        """Agrega una zona y retorna su posición; los atributos no indicados toman su valor inicial"""
+        return self.agregar_zonas([id_zona], hogar, **valores)[0]
+
+    def agregar_zonas(self, ids_zona, hogar='casa', **valores):
+        """Agrega varias zonas de un mismo hogar con una sola toma del bloqueo"""
+        with self._bloqueo:
+            if hogar not in self._hogares:
+                self._hogares[hogar] = len(self._nombres_hogar)
+                self._nombres_hogar.append(hogar)
+            numero_hogar = self._hogares[hogar]
+
+            posiciones = []
+            for id_zona in ids_zona:
+                if id_zona in self._indice:
+                    raise ValueError(f"La zona '{id_zona}' ya existe")
+                posicion = len(self._ids)
+                self._indice[id_zona] = posicion
+                self._ids.append(id_zona)
+                self._hogar_de.append(numero_hogar)
+                self._versiones.append(0)
+                for nombre, (_, inicial) in ATRIBUTOS_ZONA.items():
+                    self._columnas[nombre].append(valores.get(nombre, inicial))
+                posiciones.append(posicion)
+            return posiciones
+
+    def indice(self, id_zona):
+        """Posición de la zona en las columnas (KeyError si no existe)"""
+        return self._indice[id_zona]
+
+    def id_zona(self, posicion):
+        """Id de la zona en una posición de las columnas"""
+        return self._ids[posicion]
+
+    def obtener(self, id_zona, atributo):
+        valor = self._columnas[atributo][self._indice[id_zona]]
+        return bool(valor) if atributo in self._booleanas else valor
+
+    def actualizar(self, id_zona, atributo, valor):
+        posicion = self._indice[id_zona]
+        with self._bloqueo:
+            self._columnas[atributo][posicion] = valor
+            self._version = next(self._contador)
+            self._versiones[posicion] = self._version
+
+    def modificar(self, id_zona, atributo, funcion):
+        """Lectura-modificación-escritura atómica de un atributo de una zona"""
+        posicion = self._indice[id_zona]
+        with self._bloqueo:
+            columna = self._columnas[atributo]
+            columna[posicion] = funcion(columna[posicion])
+            self._version = next(self._contador)
+            self._versiones[posicion] = self._version
+            return columna[posicion]
+
+    def obtener_zona(self, id_zona):
+        """Todos los atributos de una zona como dict"""
+        posicion = self._indice[id_zona]
+        with self._bloqueo:
+            zona = {nombre: columna[posicion] for nombre, columna in self._columnas.items()}
+            hogar = self._nombres_hogar[self._hogar_de[posicion]]
+        for nombre in self._booleanas:
+            zona[nombre] = bool(zona[nombre])
+        zona['id'] = id_zona
+        zona['hogar'] = hogar
+        return zona
+
+    def zonas_de_hogar(self, hogar):
+        """Ids de las zonas de un hogar"""
+        numero = self._hogares.get(hogar)
+        if numero is None:
+            return []
+        return [self._ids[posicion] for posicion, valor in enumerate(self._hogar_de) if valor == numero]
+
+    def hogares(self):
+        return list(self._nombres_hogar)
+
+    def buscar(self, atributo, valor=True):
+        """Ids de las zonas cuyo atributo vale `valor` (booleanos recorridos en C)"""
+        columna = self._columnas[atributo]
+        if atributo in self._booleanas and valor in (True, 1):
+            posiciones = itertools.compress(range(len(columna)), columna)
+        else:
+            posiciones = (posicion for posicion, actual in enumerate(columna) if actual == valor)
+        return [self._ids[posicion] for posicion in posiciones]
+
+    def buscar_si(self, atributo, predicado):
+        """Ids de las zonas cuyo atributo cumple predicado(valor)"""
+        columna = self._columnas[atributo]
+        return [self._ids[posicion] for posicion, valor in enumerate(columna) if predicado(valor)]
+
+    def copiar_columna(self, atributo):
+        """Copia consistente de la columna completa (array.array, una posición por zona)"""
+        with self._bloqueo:
+            return array(self._columnas[atributo].typecode, self._columnas[atributo])
+
+    def copiar_hogares(self):
+        """Número de hogar de cada posición (array.array 'I', misma longitud que las columnas)"""
+        with self._bloqueo:
+            return array('I', self._hogar_de)
+
+    def escribir_columna(self, atributo, valores, posiciones=None):
+        """Escribe la columna completa (o solo `posiciones`) con una sola toma del bloqueo.
+
+        `valores` puede ser cualquier secuencia o buffer contiguo del mismo tipo
+        (por ejemplo un array de NumPy), de igual longitud que la columna o
+        que `posiciones`.
+        """
+        with self._bloqueo:
+            columna = self._columnas[atributo]
+            version = next(self._contador)
+            self._version = version
+            if posiciones is None:
+                if len(valores) != len(columna):
+                    raise ValueError(f"Se esperaban {len(columna)} valores para '{atributo}'")
+                try:
+                    vista = memoryview(valores)
+                except TypeError:
+                    vista = None
+                if (vista is not None and vista.c_contiguous and
+                        vista.format.lstrip('@=<') == columna.typecode):
+                    # Mismo tipo y memoria contigua: copia directa de bytes
+                    memoryview(columna).cast('B')[:] = vista.cast('B')
+                else:
+                    columna[:] = array(columna.typecode, valores)
+                self._versiones[:] = array('Q', [version]) * len(columna)
+            else:
+                for posicion, valor in zip(posiciones, valores):
+                    columna[posicion] = valor
+                    self._versiones[posicion] = version
+
+    def obtener_version(self, id_zona=None):
+        """Versión de la última escritura en la zona (o en cualquier zona)"""
+        if id_zona is None:
+            return self._version
+        return self._versiones[self._indice[id_zona]]
+
+    def memoria_bytes(self):
+        """Estimación de la memoria usada por columnas e índices"""
+        columnas = sum(columna.buffer_info()[1] * columna.itemsize for columna in self._columnas.values())
+        auxiliares = (self._hogar_de.buffer_info()[1] * self._hogar_de.itemsize +
+                      self._versiones.buffer_info()[1] * self._versiones.itemsize)
+        indices = (sys.getsizeof(self._indice) + sys.getsizeof(self._ids) +
+                   sum(sys.getsizeof(id_zona) for id_zona in self._ids))
+        return columnas + auxiliares + indices
+
+def crear_estado_zonas(hogares=None):
+    """Crea un EstadoZonas con las zonas configuradas ({hogar: (ids de zona, ...)})"""
+    estado = EstadoZonas()
+    for hogar, zonas in (hogares or HOGARES).items():
+        estado.agregar_zonas(zonas, hogar)
+    return estado
+
+# Instancia global del estado por zona
+estado_zonas = crear_estado_zonas()
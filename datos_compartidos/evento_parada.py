@@ -0,0 +1,35 @@
+# datos_compartidos/evento_parada.py - Evento de parada que despierta a quien espera en el bus
+import threading
+
+class EventoParada(threading.Event):
+    """threading.Event que además avisa a oyentes registrados al activarse.
+
+    Los agentes registran aquí el despertador de su buzón, de modo que un
+    agente bloqueado esperando mensajes termina en cuanto se pide la parada
+    en lugar de agotar su tiempo de espera.
+    """
+    def __init__(self):
+        super().__init__()
+        self._oyentes = []
+        self._bloqueo_oyentes = threading.Lock()
+
+    def agregar_oyente(self, callback):
+        with self._bloqueo_oyentes:
+            self._oyentes.append(callback)
+        if self.is_set():
+            callback()
+
+    def quitar_oyente(self, callback):
+        with self._bloqueo_oyentes:
+            if callback in self._oyentes:
+                self._oyentes.remove(callback)
+
+    def set(self):
+        super().set()
+        with self._bloqueo_oyentes:
+            oyentes = list(self._oyentes)
+        for callback in oyentes:
+            try:
+                callback()
+            except Exception as error:
+                print(f"[EventoParada] Error notificando oyente: {error}")
@@ -0,0 +1,267 @@
+# datos_compartidos/pasarela.py - Pasarela de sockets (TCP o Unix) hacia el bus de mensajes
+import asyncio
+import itertools
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from configuracion import PASARELA
+from .bus_mensajes import bus_mensajes, NIVELES_PRIORIDAD
+from .bus_async import BusMensajesAsync
+from .estado_sistema import estado_sistema
+
+_LONGITUD = struct.Struct('>I')
+
+class ErrorProtocolo(ValueError):
+    """Trama mal formada o fuera de los límites de la pasarela"""
+
+def interpretar_direccion(texto):
+    """'host:puerto' -> (host, puerto) para TCP; cualquier otra cosa es la ruta de un socket Unix"""
+    host, separador, puerto = texto.rpartition(':')
+    if separador and puerto.isdigit():
+        return (host or '127.0.0.1', int(puerto))
+    return texto
+
+def codificar_trama(datos):
+    cuerpo = json.dumps(datos, separators=(',', ':'), default=str).encode('utf-8')
+    return _LONGITUD.pack(len(cuerpo)) + cuerpo
+
+def _decodificar(cuerpo):
+    try:
+        datos = json.loads(cuerpo)
+    except ValueError as error:
+        raise ErrorProtocolo(f"JSON inválido: {error}") from None
+    if not isinstance(datos, dict):
+        raise ErrorProtocolo("La trama debe ser un objeto JSON")
+    return datos
+
+def _filtro(filtros, campo):
+    """Lista de textos de un filtro de 'suscribir' (o None); un texto suelto se iteraría por letras"""
+    valores = filtros.get(campo)
+    if valores is not None and (not isinstance(valores, list) or
+                                not all(isinstance(valor, str) for valor in valores)):
+        raise ErrorProtocolo(f"'{campo}' debe ser una lista de textos")
+    return valores
+
+async def leer_trama(lector, max_trama):
+    """Lee una trama completa; lanza IncompleteReadError si el otro extremo cerró"""
+    longitud = _LONGITUD.unpack(await lector.readexactly(_LONGITUD.size))[0]
+    if longitud > max_trama:
+        raise ErrorProtocolo(f"Trama de {longitud} bytes (máximo {max_trama})")
+    return _decodificar(await lector.readexactly(longitud))
+
+# --- Lado cliente (sockets bloqueantes) ---
+
+def conectar(direccion, tiempo_espera=5.0):
+    """Abre un socket conectado a la pasarela (TCP si direccion es (host, puerto))"""
+    if isinstance(direccion, str):
+        conexion = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conexion.settimeout(tiempo_espera)
+        conexion.connect(direccion)
+    else:
+        conexion = socket.create_connection(direccion, timeout=tiempo_espera)
+        conexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    conexion.settimeout(None)
+    return conexion
+
+def enviar_trama(conexion, datos):
+    conexion.sendall(codificar_trama(datos))
+
+def _recibir_exacto(conexion, cantidad):
+    partes = []
+    while cantidad:
+        parte = conexion.recv(cantidad)
+        if not parte:
+            raise ConnectionError("La pasarela cerró la conexión")
+        partes.append(parte)
+        cantidad -= len(parte)
+    return b''.join(partes)
+
+def recibir_trama(conexion):
+    longitud = _LONGITUD.unpack(_recibir_exacto(conexion, _LONGITUD.size))[0]
+    return _decodificar(_recibir_exacto(conexion, longitud))
+
+class PasarelaSockets:
+    """Servidor que conecta sensores y actuadores externos con el bus.
+
+    Protocolo: cada trama es una longitud de 4 bytes (big endian) seguida de
+    un objeto JSON. El cliente puede enviar:
+      {"mensajes": [...]}    lote de mensajes a publicar; se responde
+                             {"aceptados": n, "rechazados": m}
+      {"suscribir": {"tipos": [...], "objetivos": [...]}}
+                             abre un flujo de salida: la pasarela envía
+                             {"mensajes": [...]} con todo lo pendiente en su
+                             buzón cada vez que llegan mensajes nuevos
+
+    Cada mensaje necesita 'tipo'; 'prioridad' (0-2) se respeta si es entera
+    y 'de' y 'marca_tiempo' se completan si faltan. Corre en su propio hilo
+    con un bucle asyncio; publica con tiempo_espera=0, así que un buzón lleno
+    con política 'bloquear' rechaza el mensaje en lugar de detener la pasarela.
+    """
+    def __init__(self, bus=None, direccion=None, max_trama=None, max_lote=None):
+        self.bus = bus or bus_mensajes
+        self.direccion = direccion if direccion is not None else PASARELA['direccion']
+        self.max_trama = max_trama or PASARELA['max_trama']
+        self.max_lote = max_lote or PASARELA['max_lote']
+        self._bus_async = BusMensajesAsync(self.bus)
+        self._numeros = itertools.count(1)
+        self._loop = None
+        self._parada = None
+        self._hilo = None
+        self._listo = threading.Event()
+        self._error = None
+        self._escritores = set()
+        self._tareas = set()
+        self.estadisticas = {
+            'conexiones': 0,
+            'conexiones_activas': 0,
+            'lotes_recibidos': 0,
+            'mensajes_aceptados': 0,
+            'mensajes_rechazados': 0,
+            'mensajes_emitidos': 0,
+            'errores_protocolo': 0
+        }
+
+    @property
+    def es_unix(self):
+        return isinstance(self.direccion, str)
+
+    def iniciar(self):
+        """Abre el socket y atiende conexiones en segundo plano; retorna la dirección real"""
+        self._listo.clear()
+        self._hilo = threading.Thread(target=asyncio.run, args=(self._servir(),), daemon=True, name='pasarela')
+        self._hilo.start()
+        self._listo.wait()
+        if self._error is not None:
+            raise self._error
+        return self.direccion
+
+    def detener(self):
+        if self._hilo is None:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._parada.set)
+        self._hilo.join(2.0)
+        self._hilo = None
+        if self.es_unix and os.path.exists(self.direccion):
+            os.unlink(self.direccion)
+
+    async def _servir(self):
+        self._loop = asyncio.get_running_loop()
+        self._parada = asyncio.Event()
+        try:
+            if self.es_unix:
+                if os.path.exists(self.direccion):
+                    os.unlink(self.direccion)  # Socket de una ejecución anterior
+                servidor = await asyncio.start_unix_server(self._atender, path=self.direccion)
+            else:
+                servidor = await asyncio.start_server(self._atender, *self.direccion)
+                # Con puerto 0 el sistema elige uno libre
+                self.direccion = servidor.sockets[0].getsockname()[:2]
+        except OSError as error:
+            self._error = error
+            self._listo.set()
+            return
+        self._listo.set()
+        async with servidor:
+            await self._parada.wait()
+            # Cerrar también las conexiones abiertas y esperar a que sus tareas terminen
+            # (la lectura recibe fin de flujo); si no, asyncio.run las cancelaría a mitad
+            for escritor in list(self._escritores):
+                escritor.close()
+            await asyncio.gather(*self._tareas, return_exceptions=True)
+
+    async def _atender(self, lector, escritor):
+        nombre = f"pasarela-{next(self._numeros)}"
+        remoto = escritor.get_extra_info('peername') or 'socket Unix'
+        self.estadisticas['conexiones'] += 1
+        self.estadisticas['conexiones_activas'] += 1
+        estado_sistema.registrar_evento(f"[Pasarela] Conexión {nombre} desde {remoto}")
+        suscripcion = None
+        emisor = None
+        self._escritores.add(escritor)
+        self._tareas.add(asyncio.current_task())
+        try:
+            while True:
+                try:
+                    datos = await leer_trama(lector, self.max_trama)
+                except asyncio.IncompleteReadError:
+                    break
+                if 'mensajes' in datos:
+                    respuesta = self._publicar(datos['mensajes'], nombre)
+                elif 'suscribir' in datos:
+                    filtros = datos['suscribir'] or {}
+                    if suscripcion is not None:
+                        raise ErrorProtocolo("La conexión ya tiene una suscripción")
+                    if not isinstance(filtros, dict):
+                        raise ErrorProtocolo("'suscribir' debe ser un objeto con 'tipos' y/o 'objetivos'")
+                    suscripcion = self._bus_async.suscribir(nombre, tipos=_filtro(filtros, 'tipos'),
+                                                           objetivos=_filtro(filtros, 'objetivos'))
+                    emisor = asyncio.create_task(self._emitir(suscripcion, escritor))
+                    respuesta = {'suscrito': nombre}
+                else:
+                    raise ErrorProtocolo("Se esperaba 'mensajes' o 'suscribir'")
+                escritor.write(codificar_trama(respuesta))
+                await escritor.drain()
+
+        except ErrorProtocolo as error:
+            self.estadisticas['errores_protocolo'] += 1
+            estado_sistema.registrar_evento(f"[Pasarela] {nombre}: {error}")
+            escritor.write(codificar_trama({'error': str(error)}))
+        except ConnectionError:
+            pass
+        finally:
+            if emisor is not None:
+                emisor.cancel()
+                await asyncio.gather(emisor, return_exceptions=True)
+            if suscripcion is not None:
+                suscripcion.cerrar()
+            escritor.close()
+            self._escritores.discard(escritor)
+            self._tareas.discard(asyncio.current_task())
+            self.estadisticas['conexiones_activas'] -= 1
+            estado_sistema.registrar_evento(f"[Pasarela] Conexión {nombre} cerrada")
+
+    def _publicar(self, mensajes, origen):
+        if not isinstance(mensajes, list):
+            raise ErrorProtocolo("'mensajes' debe ser una lista")
+        if len(mensajes) > self.max_lote:
+            raise ErrorProtocolo(f"Lote de {len(mensajes)} mensajes (máximo {self.max_lote})")
+        self.estadisticas['lotes_recibidos'] += 1
+        ahora = time.time()
+        validos = []
+        prioridades = []
+        for mensaje in mensajes:
+            if not isinstance(mensaje, dict) or not isinstance(mensaje.get('tipo'), str):
+                continue
+            prioridad = mensaje.get('prioridad')
+            if type(prioridad) is not int or not 0 <= prioridad < NIVELES_PRIORIDAD:
+                prioridad = 0
+            mensaje.setdefault('de', origen)
+            mensaje.setdefault('marca_tiempo', ahora)
+            validos.append(mensaje)
+            prioridades.append(prioridad)
+        # Un lote de la trama es un lote del bus: un bloqueo por buzón destino
+        aceptados = self.bus.enviar_lote(validos, tiempo_espera=0, prioridades=prioridades) if validos else 0
+        rechazados = len(mensajes) - aceptados
+        self.estadisticas['mensajes_aceptados'] += aceptados
+        self.estadisticas['mensajes_rechazados'] += rechazados
+        return {'aceptados': aceptados, 'rechazados': rechazados}
+
+    async def _emitir(self, suscripcion, escritor):
+        """Envía al cliente, en una trama por despertar, todo lo pendiente en su buzón"""
+        try:
+            while await suscripcion.esperar():
+                mensajes = suscripcion.extraer_todos()
+                if not mensajes:
+                    continue
+                self.estadisticas['mensajes_emitidos'] += len(mensajes)
+                escritor.write(codificar_trama({'mensajes': [dict(mensaje) for mensaje in mensajes]}))
+                await escritor.drain()
+        except ConnectionError:
+            pass
+
+    def obtener_estadisticas(self):
+        return dict(self.estadisticas)
@@ -1,34 +1,112 @@
 # ejecutar_sistema.py - Archivo principal para ejecutar el sistema
+import argparse
+import asyncio
+import random
 import threading
 import time
 from agentes.agente_temperatura import AgenteTemperatura
 from agentes.agente_iluminacion import AgenteIluminacion
 from agentes.agente_seguridad import AgenteSeguridad
-from interfaz_usuario.interfaz_pygame import InterfazPygame
+from agentes.planificador import PlanificadorAgentes
+from agentes.agente_async import AgenteSincronoAsync, ejecutar_agentes_async
+from agentes.procesos import EjecutorProcesos
 from datos_compartidos.bus_mensajes import bus_mensajes
+from datos_compartidos.bus_async import BusMensajesAsync
 from datos_compartidos.estado_sistema import estado_sistema
+from datos_compartidos.evento_parada import EventoParada
+from datos_compartidos.pasarela import PasarelaSockets, interpretar_direccion
+from utilidades.registrador import registrador
+from utilidades.perfilador import perfilador
+from utilidades.reloj import RelojVirtual, reloj_real
+from configuracion import MODO_AGENTES, SIMULACION, PERFILADOR, PASARELA
 
-def main():
-    print("🚀 Iniciando Sistema Domótica Multiagente...")
-    
-    # Crear evento de parada global
-    evento_parada = threading.Event()
-    
-    # Crear agentes
-    agentes = [
-        AgenteTemperatura(bus_mensajes, evento_parada),
-        AgenteIluminacion(bus_mensajes, evento_parada),
-        AgenteSeguridad(bus_mensajes, evento_parada)
+def crear_agentes(evento_parada, reloj=None):
+    """Crea los agentes del sistema compartiendo evento de parada y reloj"""
+    return [
+        AgenteTemperatura(bus_mensajes, evento_parada, reloj=reloj),
+        AgenteIluminacion(bus_mensajes, evento_parada, reloj=reloj),
+        AgenteSeguridad(bus_mensajes, evento_parada, reloj=reloj)
     ]
+
+def iniciar_agentes(modo, agentes, evento_parada):
+    """Pone en marcha los agentes según el modo; retorna los hilos a esperar al cerrar"""
+    # Un hilo por agente, todos en el planificador compartido
+    # o todos como corrutinas de un bucle asyncio
+    planificador = None
+    if modo == 'planificador':
+        planificador = PlanificadorAgentes(evento_parada)
     
-    # Iniciar agentes
     for agente in agentes:
-        agente.start()
+        if planificador:
+            planificador.agregar_agente(agente)
+        elif modo == 'hilos':
+            agente.start()
         estado_sistema.registrar_evento(f"[Sistema] Agente {agente.nombre} iniciado")
         print(f"✅ Agente {agente.nombre} iniciado")
     
+    if planificador:
+        planificador.start()
+        return [planificador]
+    if modo == 'asyncio':
+        bus_async = BusMensajesAsync(bus_mensajes)
+        corrutina = ejecutar_agentes_async([AgenteSincronoAsync(agente, bus_async) for agente in agentes])
+        hilo_asyncio = threading.Thread(target=asyncio.run, args=(corrutina,), daemon=True)
+        hilo_asyncio.start()
+        return [hilo_asyncio]
+    return agentes
+
+def activar_perfilador(agentes):
+    """Conecta los agentes al perfilador por muestreo y lo pone en marcha"""
+    for agente in agentes:
+        agente.perfilador = perfilador
+    perfilador.iniciar()
+
+def reportar_perfilador():
+    """Detiene el perfilador e imprime los ciclos más lentos de cada agente"""
+    if not perfilador.activo:
+        return
+    perfilador.detener()
+    print(f"🔬 Ciclos más lentos ({perfilador.muestras_tomadas} muestras de pila):")
+    print(perfilador.formatear() or "  (sin ciclos registrados)")
+
+def main(modo=None, perfilar=False, pasarela=None):
+    """Ejecuta el sistema con interfaz; `pasarela` es la dirección de la pasarela de
+    sockets (True: la de configuración; None: solo si PASARELA['activada'])"""
+    modo = modo or MODO_AGENTES
+    print(f"🚀 Iniciando Sistema Domótica Multiagente (modo {modo})...")
+    
+    # Persistir el registro de eventos en segundo plano
+    registrador.iniciar()
+    
+    # Crear evento de parada global
+    evento_parada = EventoParada()
+    
+    # En modo 'procesos' cada agente se crea dentro de su propio proceso
+    ejecutor = None
+    if modo == 'procesos':
+        ejecutor = EjecutorProcesos(evento_parada, perfilar=perfilar)
+        hilos = ejecutor.iniciar()
+        for nombre in ejecutor.nombres:
+            estado_sistema.registrar_evento(f"[Sistema] Agente {nombre} iniciado en su proceso")
+            print(f"✅ Agente {nombre} iniciado en su proceso")
+    else:
+        # Crear agentes
+        agentes = crear_agentes(evento_parada)
+        if perfilar:
+            activar_perfilador(agentes)
+        
+        # Iniciar agentes según el modo
+        hilos = iniciar_agentes(modo, agentes, evento_parada)
+    
+    # Pasarela de sockets para sensores y actuadores externos
+    servidor_pasarela = None
+    if pasarela or (pasarela is None and PASARELA['activada']):
+        servidor_pasarela = PasarelaSockets(direccion=None if pasarela in (None, True) else pasarela)
+        print(f"🔌 Pasarela de sockets escuchando en {servidor_pasarela.iniciar()}")
+    
     try:
-        # Iniciar interfaz de usuario
+        # Iniciar interfaz de usuario (pygame solo se importa si hay interfaz)
+        from interfaz_usuario.interfaz_pygame import InterfazPygame
         interfaz = InterfazPygame()
         interfaz.ejecutar(evento_parada)
         
@@ -38,15 +116,118 @@ def main():
     
     finally:
         print("🛑 Cerrando sistema...")
+        if servidor_pasarela is not None:
+            servidor_pasarela.detener()
         evento_parada.set()
         
-        # Dar tiempo a los agentes para cerrar
-        time.sleep(1)
+        # Los agentes despiertan al activarse la parada; esperar a que cierren
+        for hilo in hilos:
+            hilo.join(timeout=1)
+        if ejecutor is not None:
+            ejecutor.cerrar()
+            for nombre, informe in ejecutor.informes.items():
+                print(f"🔬 Ciclos más lentos de {nombre}:\n{informe}")
         
         # Limpiar la cola de mensajes
         bus_mensajes.limpiar_cola()
         
+        # Escribir los eventos pendientes antes de salir
+        registrador.detener()
+        reportar_perfilador()
+        
         print("✅ Sistema cerrado correctamente")
 
+def aplicar_horario(segundos):
+    """Actualiza noche y presencia según la hora simulada (segundos desde medianoche)"""
+    hora = (segundos / 3600) % 24
+    anochecer, amanecer = SIMULACION['horario_noche']
+    salida, regreso = SIMULACION['horario_ausencia']
+    estado_sistema.actualizar('es_noche', hora >= anochecer or hora < amanecer)
+    estado_sistema.actualizar('presencia_esperada', not (salida <= hora < regreso))
+
+def simular(duracion=None, semilla=None, intervalo_ciclo=None, perfilar=False):
+    """Ejecuta los agentes sin interfaz con un reloj virtual, tan rápido como permita la CPU.
+
+    Todos los agentes corren en el planificador dentro del hilo actual; el
+    reloj empieza a medianoche y el horario de SIMULACION fija noche y
+    presencia. Con la misma semilla el resultado es reproducible.
+    Retorna un resumen con estadísticas y el estado final.
+    """
+    duracion = duracion if duracion is not None else SIMULACION['duracion']
+    semilla = semilla if semilla is not None else SIMULACION['semilla']
+    intervalo_ciclo = intervalo_ciclo if intervalo_ciclo is not None else SIMULACION['intervalo_ciclo']
+    print(f"🧪 Simulación sin interfaz: {duracion:.0f}s simulados, semilla {semilla}")
+    
+    random.seed(semilla)
+    medianoche = time.mktime(time.localtime()[:3] + (0, 0, 0, 0, 0, -1))
+    reloj = RelojVirtual(inicio=medianoche)
+    registrador.reloj = reloj
+    eventos_inicio = registrador.version
+    
+    evento_parada = EventoParada()
+    planificador = PlanificadorAgentes(evento_parada, reloj=reloj)
+    agentes = crear_agentes(evento_parada, reloj)
+    for agente in agentes:
+        if intervalo_ciclo:
+            agente.intervalo_ciclo = intervalo_ciclo
+        planificador.agregar_agente(agente)
+    if perfilar:
+        activar_perfilador(agentes)
+    
+    inicio_real = time.perf_counter()
+    try:
+        # Avanzar por tramos para actualizar el horario entre uno y otro
+        transcurrido = 0.0
+        while transcurrido < duracion and not evento_parada.is_set():
+            aplicar_horario(transcurrido)
+            tramo = min(SIMULACION['tramo'], duracion - transcurrido)
+            planificador.simular(tramo)
+            transcurrido += tramo
+    finally:
+        duracion_real = time.perf_counter() - inicio_real
+        planificador.cerrar()
+        evento_parada.set()
+        bus_mensajes.limpiar_cola()
+        registrador.reloj = reloj_real
+        reportar_perfilador()
+    
+    resumen = {
+        'semilla': semilla,
+        'duracion_simulada': transcurrido,
+        'duracion_real': duracion_real,
+        'aceleracion': transcurrido / duracion_real if duracion_real else 0.0,
+        'eventos_registrados': registrador.version - eventos_inicio,
+        'planificador': planificador.obtener_estadisticas(),
+        'agentes': {agente.nombre: agente.obtener_estadisticas() for agente in agentes},
+        'bus': bus_mensajes.obtener_estadisticas(),
+        'estado_final': dict(estado_sistema.obtener_todo())
+    }
+    print(f"✅ {transcurrido:.0f}s simulados en {duracion_real:.2f}s reales "
+          f"(x{resumen['aceleracion']:.0f}), {resumen['eventos_registrados']} eventos")
+    return resumen
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sistema Domótica Multiagente")
+    parser.add_argument('--modo', choices=['hilos', 'planificador', 'asyncio', 'procesos'], default=None,
+                        help="Ejecución de agentes (por defecto MODO_AGENTES de configuracion.py)")
+    parser.add_argument('--sin-interfaz', action='store_true',
+                        help="Simulación acelerada con reloj virtual, sin pygame")
+    parser.add_argument('--duracion', type=float, default=None,
+                        help="Segundos simulados con --sin-interfaz (por defecto SIMULACION['duracion'])")
+    parser.add_argument('--semilla', type=int, default=None,
+                        help="Semilla de random con --sin-interfaz")
+    parser.add_argument('--intervalo', type=float, default=None,
+                        help="Periodo de ciclo de los agentes con --sin-interfaz")
+    parser.add_argument('--pasarela', nargs='?', const=True, default=None, metavar='DIRECCION',
+                        help="Abrir la pasarela de sockets (host:puerto o ruta Unix; por defecto PASARELA)")
+    parser.add_argument('--perfilar', action='store_true',
+                        help="Muestrear las pilas de los ciclos más lentos e imprimirlas al salir")
+    argumentos = parser.parse_args()
+    perfilar = argumentos.perfilar or PERFILADOR['activado']
+    if argumentos.sin_interfaz:
+        simular(argumentos.duracion, argumentos.semilla, argumentos.intervalo, perfilar)
+    else:
+        pasarela = argumentos.pasarela
+        if isinstance(pasarela, str):
+            pasarela = interpretar_direccion(pasarela)
+        main(argumentos.modo, perfilar, pasarela)
\ No newline at end of file
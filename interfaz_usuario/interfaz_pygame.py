@@ -1,23 +1,145 @@
 # interfaz_usuario/interfaz_pygame.py - Interfaz gráfica del sistema
+import collections
+import threading
 import pygame
 from datos_compartidos.estado_sistema import estado_sistema
 from datos_compartidos.bus_mensajes import bus_mensajes
-from configuracion import ANCHO_VENTANA, ALTO_VENTANA, FPS, COLORES
+from utilidades.registrador import registrador
+from configuracion import (ANCHO_VENTANA, ALTO_VENTANA, FPS, COLORES, HABITACIONES_INTERFAZ,
+                           CAPACIDAD_CACHE_TEXTO, INTERFAZ_POR_EVENTOS, ESPERA_MAXIMA_INTERFAZ)
+
+# Claves del estado que se muestran en pantalla: un cambio en lo que se muestra
+# de ellas (valor_mostrado) despierta al bucle y redibuja
+CLAVES_INTERFAZ = (
+    'luces_activadas',
+    'temperatura',
+    'calefaccion_activada',
+    'ventilador_activado',
+    'presencia_esperada',
+    'es_noche',
+    'alerta_seguridad'
+)
+
+# Evento propio que despierta al bucle de la interfaz cuando cambia algo que se muestra
+EVENTO_CAMBIO = pygame.USEREVENT + 1
+
+# Controladores de video sin ventana: no reciben entrada y SDL implementa
+# event.wait sondeando cada 1 ms, así que se espera en un threading.Event
+CONTROLADORES_SIN_VENTANA = ('dummy', 'offscreen')
+
+class CacheTexto:
+    """Caché LRU de superficies de texto ya renderizadas.
+
+    La clave es (texto, color, fuente): la mayoría de los textos se repiten
+    entre cuadros ("SALA", la ayuda de teclas, "Luces: ACTIVADAS", las líneas
+    del registro), así que en régimen estable casi no se rasteriza nada.
+    Solo la usa el hilo de la interfaz, por eso no lleva bloqueo.
+    """
+    def __init__(self, fuentes, capacidad=CAPACIDAD_CACHE_TEXTO):
+        self.fuentes = fuentes
+        self.capacidad = capacidad
+        self._superficies = collections.OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, texto, color, fuente):
+        clave = (texto, tuple(color), fuente)
+        superficie = self._superficies.get(clave)
+        if superficie is not None:
+            self._superficies.move_to_end(clave)
+            self.aciertos += 1
+            return superficie
+        self.fallos += 1
+        superficie = self.fuentes[fuente].render(texto, True, color)
+        self._superficies[clave] = superficie
+        if len(self._superficies) > self.capacidad:
+            self._superficies.popitem(last=False)  # Descartar la menos usada
+        return superficie
+
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def limpiar(self):
+        self._superficies.clear()
+
+    def obtener_estadisticas(self):
+        return {
+            'entradas': len(self._superficies),
+            'capacidad': self.capacidad,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.tasa_aciertos(), 3)
+        }
+
+class Widget:
+    """Región de la pantalla que depende de ciertas claves del estado.
+
+    obtener_valor(estado) retorna lo que el widget muestra; solo cuando eso
+    cambia se restaura su rectángulo desde la capa estática y se vuelve a
+    dibujar su contenido.
+    """
+    __slots__ = ('rect', 'obtener_valor', 'dibujar', 'valor')
+
+    def __init__(self, rect, obtener_valor, dibujar):
+        self.rect = pygame.Rect(rect)
+        self.obtener_valor = obtener_valor
+        self.dibujar = dibujar
+        self.valor = None
+
+def valor_mostrado(clave, valor):
+    """Lo que la interfaz muestra de una clave; un cambio que no lo altera no redibuja"""
+    if clave == 'temperatura':
+        # Texto con un decimal y franja de color (caliente > 24, frío < 20)
+        return (f"{valor:.1f}", valor > 24, valor < 20)
+    return valor
+
+def valores_mostrados(*claves):
+    return lambda estado: tuple(valor_mostrado(clave, estado[clave]) for clave in claves)
+
+VALORES_INTERFAZ = valores_mostrados(*CLAVES_INTERFAZ)
 
 class InterfazPygame:
-    def __init__(self):
+    # Disposición de la vista de la casa
+    X_CASA, Y_CASA = 20, 60
+    ANCHO_CASA, ALTO_CASA = 460, 620
+    TAMANO_HABITACION = 180
+    MARGEN_HABITACIONES = 25
+    MAX_HABITACIONES = 4        # Dos filas de dos dentro de la vista de la casa
+    # Disposición del panel derecho
+    X_PANEL = 500
+    ANCHO_PANEL = 480
+    Y_ESTADO = 60 + 300
+    Y_REGISTRO = 60 + 300 + 200
+    
+    def __init__(self, por_eventos=None):
         self.ancho = ANCHO_VENTANA
         self.alto = ALTO_VENTANA
         self.fps = FPS
         self.pantalla = None
+        self.lienzo = None          # Superficie destino de las funciones de dibujo
         self.reloj = None
         self.fuentes = {}
-        self.estado_anterior = None
+        self.cache_texto = None
+        self.mostrado_dibujado = None
+        self.valores_avisados = {}  # clave -> último valor mostrado que despertó al bucle
         self.contador_frames = 0
+        self.capas_estaticas = {}   # es_noche -> superficie con todo lo que no cambia
+        self.widgets = []
+        self.es_noche_dibujado = None
+        self.redibujar_todo = True
+        # Modo por eventos: el bucle duerme en pygame.event.wait hasta que un
+        # cambio de estado, un evento del registro o la parada publiquen EVENTO_CAMBIO
+        self.por_eventos = INTERFAZ_POR_EVENTOS if por_eventos is None else por_eventos
+        self.espera_maxima = ESPERA_MAXIMA_INTERFAZ
+        self._cambio_pendiente = False
+        self._despertar = threading.Event()
+        self.sin_ventana = False
     
     def inicializar(self):
         pygame.init()
         self.pantalla = pygame.display.set_mode((self.ancho, self.alto))
+        self.lienzo = self.pantalla
         pygame.display.set_caption("Sistema Domótica Multiagente")
         self.reloj = pygame.time.Clock()
         
@@ -28,103 +150,92 @@ class InterfazPygame:
             'normal': pygame.font.SysFont("Arial", 20),
             'pequena': pygame.font.SysFont("Arial", 16)
         }
+        self.cache_texto = CacheTexto(self.fuentes)
+        self.widgets = self.crear_widgets()
+        self.sin_ventana = pygame.display.get_driver() in CONTROLADORES_SIN_VENTANA
     
     def dibujar_texto(self, x, y, texto, color=COLORES['texto_principal'], fuente='normal', centrado=False):
-        fuente_obj = self.fuentes[fuente]
-        superficie = fuente_obj.render(texto, True, color)
+        superficie = self.cache_texto.obtener(texto, color, fuente)
         if centrado:
             x = x - superficie.get_width() // 2
-        self.pantalla.blit(superficie, (x, y))
+        self.lienzo.blit(superficie, (x, y))
         return superficie.get_width()
     
     def dibujar_seccion(self, x, y, ancho, alto, titulo, color_fondo=COLORES['panel_principal']):
         # Fondo de la sección
-        pygame.draw.rect(self.pantalla, color_fondo, (x, y, ancho, alto), border_radius=8)
-        pygame.draw.rect(self.pantalla, (180, 180, 180), (x, y, ancho, alto), 2, border_radius=8)
+        pygame.draw.rect(self.lienzo, color_fondo, (x, y, ancho, alto), border_radius=8)
+        pygame.draw.rect(self.lienzo, (180, 180, 180), (x, y, ancho, alto), 2, border_radius=8)
         
         # Título de la sección
         fondo_titulo = pygame.Rect(x, y-5, ancho, 30)
-        pygame.draw.rect(self.pantalla, (200, 200, 220), fondo_titulo, border_radius=8)
-        pygame.draw.rect(self.pantalla, (150, 150, 180), fondo_titulo, 1, border_radius=8)
+        pygame.draw.rect(self.lienzo, (200, 200, 220), fondo_titulo, border_radius=8)
+        pygame.draw.rect(self.lienzo, (150, 150, 180), fondo_titulo, 1, border_radius=8)
         self.dibujar_texto(x + ancho//2, y, titulo, COLORES['texto_principal'], 'seccion', centrado=True)
         
         return y + 35
     
-    def dibujar_vista_casa(self):
-        # Panel izquierdo: Vista de la casa
-        x_casa, y_casa = 20, 60
-        ancho_casa, alto_casa = 460, 620
-        
-        y_contenido = self.dibujar_seccion(x_casa, y_casa, ancho_casa, alto_casa, "VISTA DE LA CASA", (250, 250, 255))
-        
-        # Habitaciones en grid 2x2
-        tamano_habitacion = 180
-        margen_habitaciones = 25
-        x_inicio = x_casa + 40
-        y_inicio = y_contenido + 20
-        
-        habitaciones = [
-            (x_inicio, y_inicio, "SALA", (220, 240, 255), "Luces"),
-            (x_inicio + tamano_habitacion + margen_habitaciones, y_inicio, "COCINA", (255, 240, 220), "Temperatura"),
-            (x_inicio, y_inicio + tamano_habitacion + margen_habitaciones, "DORMITORIO", (255, 220, 240), "HVAC"),
-            (x_inicio + tamano_habitacion + margen_habitaciones, y_inicio + tamano_habitacion + margen_habitaciones, "GARAGE", (220, 255, 230), "Seguridad")
+    def habitaciones(self):
+        """(x, y, nombre, color, tipo) de las habitaciones configuradas, en filas de dos"""
+        if len(HABITACIONES_INTERFAZ) > self.MAX_HABITACIONES:
+            raise ValueError(f"HABITACIONES_INTERFAZ tiene {len(HABITACIONES_INTERFAZ)} habitaciones; "
+                             f"la vista de la casa admite {self.MAX_HABITACIONES}")
+        paso = self.TAMANO_HABITACION + self.MARGEN_HABITACIONES
+        x_inicio = self.X_CASA + 40
+        y_inicio = self.Y_CASA + 35 + 20
+        return [
+            (x_inicio + (i % 2) * paso, y_inicio + (i // 2) * paso, nombre, color, tipo)
+            for i, (nombre, color, tipo) in enumerate(HABITACIONES_INTERFAZ)
         ]
+    
+    def y_estado_general(self):
+        paso = self.TAMANO_HABITACION + self.MARGEN_HABITACIONES
+        return self.Y_CASA + 35 + 20 + 2 * paso + 30
+    
+    # --- Capa estática: se dibuja una vez por fondo (día/noche) ---
+    
+    def crear_capa_estatica(self, es_noche):
+        capa = pygame.Surface((self.ancho, self.alto)).convert()
+        self.lienzo = capa
+        try:
+            # Fondo principal según momento del día
+            capa.fill(COLORES['fondo_noche'] if es_noche else COLORES['fondo_dia'])
+            
+            # Título principal
+            self.dibujar_texto(self.ancho//2, 15, "Sistema Domótica Multiagente", 
+                             COLORES['texto_principal'], 'titulo', centrado=True)
+            
+            self.dibujar_vista_casa_estatica()
+            self.dibujar_panel_control_estatico()
+        finally:
+            self.lienzo = self.pantalla
+        return capa
+    
+    def dibujar_vista_casa_estatica(self):
+        # Panel izquierdo: Vista de la casa
+        self.dibujar_seccion(self.X_CASA, self.Y_CASA, self.ANCHO_CASA, self.ALTO_CASA, "VISTA DE LA CASA", (250, 250, 255))
         
-        estado = estado_sistema.obtener_todo()
-        
-        for x, y, nombre, color, tipo in habitaciones:
+        tamano = self.TAMANO_HABITACION
+        for x, y, nombre, color, tipo in self.habitaciones():
             # Dibujar habitación
-            pygame.draw.rect(self.pantalla, color, (x, y, tamano_habitacion, tamano_habitacion), border_radius=10)
-            pygame.draw.rect(self.pantalla, (150, 150, 150), (x, y, tamano_habitacion, tamano_habitacion), 2, border_radius=10)
+            pygame.draw.rect(self.lienzo, color, (x, y, tamano, tamano), border_radius=10)
+            pygame.draw.rect(self.lienzo, (150, 150, 150), (x, y, tamano, tamano), 2, border_radius=10)
             
             # Nombre de la habitación
-            self.dibujar_texto(x + tamano_habitacion//2, y + 15, nombre, (50, 50, 50), 'seccion', centrado=True)
+            self.dibujar_texto(x + tamano//2, y + 15, nombre, (50, 50, 50), 'seccion', centrado=True)
             
-            # Contenido específico
-            if tipo == "Luces":
-                color_luz = (255, 255, 100) if estado['luces_activadas'] else (180, 180, 180)
-                pygame.draw.circle(self.pantalla, color_luz, (x + tamano_habitacion//2, y + 70), 25)
-                pygame.draw.circle(self.pantalla, (100, 100, 100), (x + tamano_habitacion//2, y + 70), 25, 2)
-                estado_luces = "ACTIVADAS" if estado['luces_activadas'] else "DESACTIVADAS"
-                self.dibujar_texto(x + tamano_habitacion//2, y + 110, f"Luces: {estado_luces}", (40, 40, 40), 'pequena', centrado=True)
-                
-            elif tipo == "Temperatura":
-                temp = estado['temperatura']
-                color_temp = COLORES['caliente'] if temp > 24 else COLORES['frio'] if temp < 20 else COLORES['optimo']
-                self.dibujar_texto(x + tamano_habitacion//2, y + 60, "Temperatura", (40, 40, 40), 'pequena', centrado=True)
-                self.dibujar_texto(x + tamano_habitacion//2, y + 85, f"{temp:.1f} °C", color_temp, 'normal', centrado=True)
-                
+            # Rótulos fijos
+            if tipo == "Temperatura":
+                self.dibujar_texto(x + tamano//2, y + 60, "Temperatura", (40, 40, 40), 'pequena', centrado=True)
             elif tipo == "HVAC":
-                self.dibujar_texto(x + tamano_habitacion//2, y + 60, "Sistema HVAC", (40, 40, 40), 'pequena', centrado=True)
-                self.dibujar_texto(x + 20, y + 90, f"Calefacción: {'● ON' if estado['calefaccion_activada'] else '○ OFF'}", 
-                                 COLORES['caliente'] if estado['calefaccion_activada'] else (100, 100, 100), 'pequena')
-                self.dibujar_texto(x + 20, y + 115, f"Ventilador: {'● ON' if estado['ventilador_activado'] else '○ OFF'}", 
-                                 COLORES['frio'] if estado['ventilador_activado'] else (100, 100, 100), 'pequena')
-                
-            elif tipo == "Seguridad":
-                color_seguridad = COLORES['alerta'] if estado['alerta_seguridad'] else COLORES['seguro']
-                estado_seguridad = "ALERTA!" if estado['alerta_seguridad'] else "SEGURO"
-                pygame.draw.rect(self.pantalla, color_seguridad, (x + 20, y + 70, tamano_habitacion - 40, 50), border_radius=8)
-                self.dibujar_texto(x + tamano_habitacion//2, y + 85, estado_seguridad, (255, 255, 255), 'normal', centrado=True)
+                self.dibujar_texto(x + tamano//2, y + 60, "Sistema HVAC", (40, 40, 40), 'pequena', centrado=True)
         
         # Estado general
-        y_general = y_inicio + 2 * (tamano_habitacion + margen_habitaciones) + 30
-        y_contenido_general = self.dibujar_seccion(x_casa + 40, y_general, ancho_casa - 80, 120, "ESTADO GENERAL")
-        
-        self.dibujar_texto(x_casa + 60, y_contenido_general, 
-                          f"● Presencia: {'ESPERADA' if estado['presencia_esperada'] else 'NO ESPERADA'}", 
-                          COLORES['seguro'] if estado['presencia_esperada'] else COLORES['alerta'], 'pequena')
-        self.dibujar_texto(x_casa + 60, y_contenido_general + 25, 
-                          f"● Momento: {'NOCHE' if estado['es_noche'] else 'DÍA'}", 
-                          (40, 40, 40), 'pequena')
-        self.dibujar_texto(x_casa + 60, y_contenido_general + 50, 
-                          f"● Modo: {'AUTOMÁTICO' if estado['presencia_esperada'] else 'AUSENTE'}", 
-                          (60, 60, 150), 'pequena')
+        self.dibujar_seccion(self.X_CASA + 40, self.y_estado_general(), self.ANCHO_CASA - 80, 120, "ESTADO GENERAL")
     
-    def dibujar_panel_control(self):
+    def dibujar_panel_control_estatico(self):
         # Panel derecho: Controles y registros
-        x_panel = 500
-        ancho_panel = 480
+        x_panel = self.X_PANEL
+        ancho_panel = self.ANCHO_PANEL
         
         # Sección de controles
         y_controles = self.dibujar_seccion(x_panel, 60, ancho_panel, 280, "CONTROLES DEL SISTEMA", (255, 250, 240))
@@ -144,16 +255,97 @@ class InterfazPygame:
         for i, (tecla, descripcion) in enumerate(controles):
             y_pos = y_controles + 35 + i * 30
             if i % 2 == 0:
-                pygame.draw.rect(self.pantalla, (245, 248, 255), (x_panel + 15, y_pos - 5, ancho_panel - 30, 25), border_radius=5)
+                pygame.draw.rect(self.lienzo, (245, 248, 255), (x_panel + 15, y_pos - 5, ancho_panel - 30, 25), border_radius=5)
             
             self.dibujar_texto(x_panel + 30, y_pos, f"{tecla}:", (0, 80, 160), 'pequena')
             self.dibujar_texto(x_panel + 80, y_pos, descripcion, (40, 40, 40), 'pequena')
         
         # Sección de estado actual
-        y_estado = 60 + 300
-        y_contenido_estado = self.dibujar_seccion(x_panel, y_estado, ancho_panel, 180, "ESTADO ACTUAL DEL SISTEMA", (240, 255, 240))
+        self.dibujar_seccion(x_panel, self.Y_ESTADO, ancho_panel, 180, "ESTADO ACTUAL DEL SISTEMA", (240, 255, 240))
         
-        estado = estado_sistema.obtener_todo()
+        # Sección de registro de eventos
+        y_contenido_registro = self.dibujar_seccion(x_panel, self.Y_REGISTRO, ancho_panel, 240, "REGISTRO DE EVENTOS DEL SISTEMA", (240, 240, 250))
+        pygame.draw.rect(self.lienzo, (250, 250, 255), (x_panel + 15, y_contenido_registro, ancho_panel - 30, 190), border_radius=5)
+        pygame.draw.rect(self.lienzo, (220, 220, 230), (x_panel + 15, y_contenido_registro, ancho_panel - 30, 190), 1, border_radius=5)
+    
+    # --- Widgets: contenido que depende del estado ---
+    
+    def crear_widgets(self):
+        """Crea los widgets con su rectángulo, el valor que muestran y su función de dibujo"""
+        widgets = []
+        tamano = self.TAMANO_HABITACION
+        claves_habitacion = {
+            "Luces": ('luces_activadas',),
+            "Temperatura": ('temperatura',),
+            "HVAC": ('calefaccion_activada', 'ventilador_activado'),
+            "Seguridad": ('alerta_seguridad',)
+        }
+        for x, y, _, _, tipo in self.habitaciones():
+            if tipo in claves_habitacion:
+                # Debajo del nombre y dentro del borde de la habitación
+                widgets.append(Widget((x + 4, y + 45, tamano - 8, tamano - 49),
+                                      valores_mostrados(*claves_habitacion[tipo]),
+                                      lambda estado, x=x, y=y, tipo=tipo: self.dibujar_habitacion(x, y, tipo, estado)))
+        
+        y_general = self.y_estado_general() + 35
+        widgets.append(Widget((self.X_CASA + 50, y_general - 2, self.ANCHO_CASA - 100, 75),
+                              valores_mostrados('presencia_esperada', 'es_noche'),
+                              lambda estado: self.dibujar_estado_general(y_general, estado)))
+        
+        y_contenido_estado = self.Y_ESTADO + 35
+        for i, clave in enumerate(('temperatura', 'luces_activadas', 'calefaccion_activada',
+                                   'ventilador_activado', 'alerta_seguridad', 'presencia_esperada')):
+            y_pos = y_contenido_estado + i * 25
+            widgets.append(Widget((self.X_PANEL + 20, y_pos, self.ANCHO_PANEL - 40, 25),
+                                  valores_mostrados(clave),
+                                  lambda estado, i=i, y_pos=y_pos: self.dibujar_linea_estado(i, y_pos, estado)))
+        
+        y_contenido_registro = self.Y_REGISTRO + 35
+        widgets.append(Widget((self.X_PANEL + 16, y_contenido_registro + 1, self.ANCHO_PANEL - 32, 188),
+                              lambda estado: registrador.version,
+                              lambda estado: self.dibujar_registro(y_contenido_registro)))
+        return widgets
+    
+    def dibujar_habitacion(self, x, y, tipo, estado):
+        tamano = self.TAMANO_HABITACION
+        # Contenido específico
+        if tipo == "Luces":
+            color_luz = (255, 255, 100) if estado['luces_activadas'] else (180, 180, 180)
+            pygame.draw.circle(self.lienzo, color_luz, (x + tamano//2, y + 70), 25)
+            pygame.draw.circle(self.lienzo, (100, 100, 100), (x + tamano//2, y + 70), 25, 2)
+            estado_luces = "ACTIVADAS" if estado['luces_activadas'] else "DESACTIVADAS"
+            self.dibujar_texto(x + tamano//2, y + 110, f"Luces: {estado_luces}", (40, 40, 40), 'pequena', centrado=True)
+            
+        elif tipo == "Temperatura":
+            temp = estado['temperatura']
+            color_temp = COLORES['caliente'] if temp > 24 else COLORES['frio'] if temp < 20 else COLORES['optimo']
+            self.dibujar_texto(x + tamano//2, y + 85, f"{temp:.1f} °C", color_temp, 'normal', centrado=True)
+            
+        elif tipo == "HVAC":
+            self.dibujar_texto(x + 20, y + 90, f"Calefacción: {'● ON' if estado['calefaccion_activada'] else '○ OFF'}", 
+                             COLORES['caliente'] if estado['calefaccion_activada'] else (100, 100, 100), 'pequena')
+            self.dibujar_texto(x + 20, y + 115, f"Ventilador: {'● ON' if estado['ventilador_activado'] else '○ OFF'}", 
+                             COLORES['frio'] if estado['ventilador_activado'] else (100, 100, 100), 'pequena')
+            
+        elif tipo == "Seguridad":
+            color_seguridad = COLORES['alerta'] if estado['alerta_seguridad'] else COLORES['seguro']
+            estado_seguridad = "ALERTA!" if estado['alerta_seguridad'] else "SEGURO"
+            pygame.draw.rect(self.lienzo, color_seguridad, (x + 20, y + 70, tamano - 40, 50), border_radius=8)
+            self.dibujar_texto(x + tamano//2, y + 85, estado_seguridad, (255, 255, 255), 'normal', centrado=True)
+    
+    def dibujar_estado_general(self, y_contenido_general, estado):
+        x_casa = self.X_CASA
+        self.dibujar_texto(x_casa + 60, y_contenido_general, 
+                          f"● Presencia: {'ESPERADA' if estado['presencia_esperada'] else 'NO ESPERADA'}", 
+                          COLORES['seguro'] if estado['presencia_esperada'] else COLORES['alerta'], 'pequena')
+        self.dibujar_texto(x_casa + 60, y_contenido_general + 25, 
+                          f"● Momento: {'NOCHE' if estado['es_noche'] else 'DÍA'}", 
+                          (40, 40, 40), 'pequena')
+        self.dibujar_texto(x_casa + 60, y_contenido_general + 50, 
+                          f"● Modo: {'AUTOMÁTICO' if estado['presencia_esperada'] else 'AUSENTE'}", 
+                          (60, 60, 150), 'pequena')
+    
+    def dibujar_linea_estado(self, indice, y_pos, estado):
         info_estado = [
             f"Temperatura: {estado['temperatura']:.1f} °C",
             f"Luces: {'ACTIVADAS' if estado['luces_activadas'] else 'DESACTIVADAS'}",
@@ -162,38 +354,33 @@ class InterfazPygame:
             f"Alerta Seguridad: {'ACTIVA' if estado['alerta_seguridad'] else 'INACTIVA'}",
             f"Presencia: {'ESPERADA' if estado['presencia_esperada'] else 'NO ESPERADA'}"
         ]
+        texto = info_estado[indice]
         
-        for i, texto in enumerate(info_estado):
-            y_pos = y_contenido_estado + i * 25
-            color = (50, 50, 50)
-            if "ACTIVA" in texto or "ACTIVADAS" in texto or "ESPERADA" in texto:
-                color = COLORES['seguro']
-            elif "INACTIVA" in texto or "DESACTIVADAS" in texto or "NO ESPERADA" in texto:
-                color = COLORES['alerta']
-            elif "Temperatura" in texto:
-                temp = estado['temperatura']
-                if temp > 24:
-                    color = COLORES['caliente']
-                elif temp < 20:
-                    color = COLORES['frio']
-                else:
-                    color = COLORES['optimo']
-                    
-            self.dibujar_texto(x_panel + 30, y_pos, f"● {texto}", color, 'pequena')
-        
-        # Sección de registro de eventos
-        y_registro = y_estado + 200
-        y_contenido_registro = self.dibujar_seccion(x_panel, y_registro, ancho_panel, 240, "REGISTRO DE EVENTOS DEL SISTEMA", (240, 240, 250))
-        
-        eventos = estado_sistema.obtener('registro_eventos')
-        
-        pygame.draw.rect(self.pantalla, (250, 250, 255), (x_panel + 15, y_contenido_registro, ancho_panel - 30, 190), border_radius=5)
-        pygame.draw.rect(self.pantalla, (220, 220, 230), (x_panel + 15, y_contenido_registro, ancho_panel - 30, 190), 1, border_radius=5)
+        color = (50, 50, 50)
+        if "ACTIVA" in texto or "ACTIVADAS" in texto or "ESPERADA" in texto:
+            color = COLORES['seguro']
+        elif "INACTIVA" in texto or "DESACTIVADAS" in texto or "NO ESPERADA" in texto:
+            color = COLORES['alerta']
+        elif "Temperatura" in texto:
+            temp = estado['temperatura']
+            if temp > 24:
+                color = COLORES['caliente']
+            elif temp < 20:
+                color = COLORES['frio']
+            else:
+                color = COLORES['optimo']
+                
+        self.dibujar_texto(self.X_PANEL + 30, y_pos, f"● {texto}", color, 'pequena')
+    
+    def dibujar_registro(self, y_contenido_registro):
+        x_panel = self.X_PANEL
+        ancho_panel = self.ANCHO_PANEL
+        eventos = estado_sistema.obtener_eventos(8)
         
         for i, evento in enumerate(eventos[:8]):
             y_pos = y_contenido_registro + 5 + i * 22
             if i % 2 == 0:
-                pygame.draw.rect(self.pantalla, (245, 248, 255), (x_panel + 20, y_pos, ancho_panel - 40, 20), border_radius=3)
+                pygame.draw.rect(self.lienzo, (245, 248, 255), (x_panel + 20, y_pos, ancho_panel - 40, 20), border_radius=3)
             
             if "ALERTA" in evento or "ERROR" in evento:
                 color = COLORES['alerta']
@@ -208,67 +395,134 @@ class InterfazPygame:
                 
             self.dibujar_texto(x_panel + 25, y_pos, evento, color, 'pequena')
     
+    # --- Bucle de dibujo ---
+    
+    def dibujar_widget(self, widget, capa, estado):
+        """Restaura el rectángulo del widget desde la capa estática y dibuja su contenido"""
+        self.pantalla.blit(capa, widget.rect, widget.rect)
+        self.pantalla.set_clip(widget.rect)
+        try:
+            widget.dibujar(estado)
+        finally:
+            self.pantalla.set_clip(None)
+    
+    def dibujar(self):
+        """Redibuja lo que cambió; retorna la cantidad de widgets dibujados"""
+        estado = estado_sistema.obtener_todo()
+        es_noche = estado['es_noche']
+        if es_noche not in self.capas_estaticas:
+            self.capas_estaticas[es_noche] = self.crear_capa_estatica(es_noche)
+        capa = self.capas_estaticas[es_noche]
+        
+        # Cambio de fondo o ventana expuesta: pantalla completa
+        if self.redibujar_todo or es_noche != self.es_noche_dibujado:
+            self.redibujar_todo = False
+            self.es_noche_dibujado = es_noche
+            self.pantalla.blit(capa, (0, 0))
+            for widget in self.widgets:
+                widget.valor = widget.obtener_valor(estado)
+                self.dibujar_widget(widget, capa, estado)
+            pygame.display.flip()
+            return len(self.widgets)
+        
+        # Solo los widgets cuyo valor mostrado cambió
+        rectangulos = []
+        for widget in self.widgets:
+            valor = widget.obtener_valor(estado)
+            if valor != widget.valor:
+                widget.valor = valor
+                self.dibujar_widget(widget, capa, estado)
+                rectangulos.append(widget.rect)
+        if rectangulos:
+            pygame.display.update(rectangulos)
+        return len(rectangulos)
+    
+    def al_cambiar_estado(self, clave, valor, version):
+        """Callback del estado: despierta al bucle solo si cambia lo que se muestra de la clave"""
+        mostrado = valor_mostrado(clave, valor)
+        if clave in self.valores_avisados and self.valores_avisados[clave] == mostrado:
+            return
+        self.valores_avisados[clave] = mostrado
+        self.avisar_cambio()
+    
+    def avisar_cambio(self, *_):
+        """Despierta al bucle de la interfaz; se llama desde el hilo que produjo el cambio.
+
+        Solo se publica un EVENTO_CAMBIO a la vez: una ráfaga de escrituras
+        produce un único despertar y un único redibujado.
+        """
+        if self._cambio_pendiente:
+            return
+        self._cambio_pendiente = True
+        self._despertar.set()
+        try:
+            pygame.event.post(pygame.event.Event(EVENTO_CAMBIO))
+        except pygame.error:
+            self._cambio_pendiente = False  # Cola de SDL llena o pygame ya cerrado
+    
+    def obtener_eventos(self):
+        """Eventos de pygame pendientes; en modo por eventos bloquea hasta que llegue alguno"""
+        if not self.por_eventos:
+            return pygame.event.get()
+        if self.sin_ventana:
+            self._despertar.wait(self.espera_maxima)
+            self._despertar.clear()
+            eventos = pygame.event.get()
+        else:
+            evento = pygame.event.wait(int(self.espera_maxima * 1000))
+            eventos = [] if evento.type == pygame.NOEVENT else [evento]
+            eventos.extend(pygame.event.get())
+        # Desde aquí cualquier cambio nuevo publica otro aviso
+        self._cambio_pendiente = False
+        return eventos
+    
     def ejecutar(self, evento_parada):
         self.inicializar()
         ejecutando = True
         
-        while ejecutando and not evento_parada.is_set():
-            for evento in pygame.event.get():
-                if evento.type == pygame.QUIT:
-                    ejecutando = False
-                    evento_parada.set()
-                elif evento.type == pygame.KEYDOWN:
-                    self.manejar_teclado(evento.key, evento_parada)
-                    if evento.key == pygame.K_ESCAPE:
+        if self.por_eventos:
+            estado_sistema.suscribir(self.al_cambiar_estado, claves=CLAVES_INTERFAZ)
+            registrador.agregar_oyente(self.avisar_cambio)
+            evento_parada.agregar_oyente(self.avisar_cambio)
+        
+        try:
+            while ejecutando and not evento_parada.is_set():
+                for evento in self.obtener_eventos():
+                    if evento.type == pygame.QUIT:
                         ejecutando = False
-            
-            # Verificar si el estado cambió para evitar redibujado innecesario
-            estado_actual = estado_sistema.obtener_todo()
-            claves_estado = (
-                estado_actual['luces_activadas'],
-                round(estado_actual['temperatura'], 1),
-                estado_actual['calefaccion_activada'],
-                estado_actual['ventilador_activado'],
-                estado_actual['presencia_esperada'],
-                estado_actual['es_noche'],
-                estado_actual['alerta_seguridad']
-            )
-            
-            self.contador_frames += 1
-            if claves_estado != self.estado_anterior or self.contador_frames % 10 == 0:
-                self.estado_anterior = claves_estado
-                
-                # Fondo principal según momento del día
-                if estado_actual['es_noche']:
-                    self.pantalla.fill(COLORES['fondo_noche'])
-                else:
-                    self.pantalla.fill(COLORES['fondo_dia'])
-                
-                # Título principal
-                self.dibujar_texto(self.ancho//2, 15, "Sistema Domótica Multiagente", 
-                                 COLORES['texto_principal'], 'titulo', centrado=True)
+                        evento_parada.set()
+                    elif evento.type == pygame.KEYDOWN:
+                        self.manejar_teclado(evento.key, evento_parada)
+                        if evento.key == pygame.K_ESCAPE:
+                            ejecutando = False
+                    elif evento.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        self.redibujar_todo = True
                 
-                # Dibujar componentes
-                self.dibujar_vista_casa()
-                self.dibujar_panel_control()
+                # Revisar widgets solo si cambió algo visible: un valor mostrado o el registro
+                self.contador_frames += 1
+                mostrado = (VALORES_INTERFAZ(estado_sistema.obtener_todo()), registrador.version)
+                if mostrado != self.mostrado_dibujado or self.redibujar_todo:
+                    self.mostrado_dibujado = mostrado
+                    self.dibujar()
                 
-                pygame.display.flip()
-            
-            self.reloj.tick(self.fps)
+                # En modo por eventos solo limita la tasa ante ráfagas de cambios
+                self.reloj.tick(self.fps)
+        finally:
+            if self.por_eventos:
+                estado_sistema.cancelar_suscripcion(self.al_cambiar_estado)
+                registrador.quitar_oyente(self.avisar_cambio)
+                evento_parada.quitar_oyente(self.avisar_cambio)
         
+        cache = self.cache_texto.obtener_estadisticas()
+        print(f"[Interfaz] Caché de texto: {cache['tasa_aciertos']:.1%} aciertos, "
+              f"{cache['entradas']}/{cache['capacidad']} superficies")
         pygame.quit()
 
     def manejar_teclado(self, tecla, evento_parada):
         if tecla == pygame.K_p:
-            estado_actual = estado_sistema.obtener('presencia_esperada')
-            nuevo_estado = not estado_actual
-            estado_sistema.actualizar('presencia_esperada', nuevo_estado)
-            
-            if nuevo_estado and estado_sistema.obtener('es_noche'):
-                estado_sistema.actualizar('luces_activadas', True)
-                estado_sistema.registrar_evento("[Interfaz] Presencia activada en noche -> luces encendidas")
-            else:
-                estado_sistema.registrar_evento(f"[Interfaz] Presencia: {'ACTIVADA' if nuevo_estado else 'DESACTIVADA'}")
+            # Las luces las decide MotorReglas del agente de iluminación (agentes/reglas_hogar.py)
+            nuevo_estado = estado_sistema.modificar('presencia_esperada', lambda presencia: not presencia)
+            estado_sistema.registrar_evento(f"[Interfaz] Presencia: {'ACTIVADA' if nuevo_estado else 'DESACTIVADA'}")
         
         elif tecla == pygame.K_m:
             if bus_mensajes.enviar_mensaje(
@@ -280,32 +534,15 @@ class InterfazPygame:
                 estado_sistema.registrar_evento("[Interfaz] Error: Cola de mensajes llena")
         
         elif tecla == pygame.K_n:
-            estado_actual = estado_sistema.obtener('es_noche')
-            nuevo_estado = not estado_actual
-            estado_sistema.actualizar('es_noche', nuevo_estado)
-            
-            presencia_esperada = estado_sistema.obtener('presencia_esperada')
-            luces_activadas = estado_sistema.obtener('luces_activadas')
-            
-            if nuevo_estado:
-                estado_sistema.registrar_evento("[Interfaz] Modo cambiado a NOCHE")
-                if presencia_esperada and not luces_activadas:
-                    estado_sistema.actualizar('luces_activadas', True)
-                    estado_sistema.registrar_evento("[Interfaz] Anochecer con presencia -> luces encendidas")
-            else:
-                estado_sistema.registrar_evento("[Interfaz] Modo cambiado a DÍA")
-                if not presencia_esperada and luces_activadas:
-                    estado_sistema.actualizar('luces_activadas', False)
-                    estado_sistema.registrar_evento("[Interfaz] Amanecer sin presencia -> luces apagadas")
+            nuevo_estado = estado_sistema.modificar('es_noche', lambda es_noche: not es_noche)
+            estado_sistema.registrar_evento(f"[Interfaz] Modo cambiado a {'NOCHE' if nuevo_estado else 'DÍA'}")
         
         elif tecla == pygame.K_t:
-            temperatura_actual = estado_sistema.obtener('temperatura')
-            estado_sistema.actualizar('temperatura', min(35.0, temperatura_actual + 1.0))
+            estado_sistema.modificar('temperatura', lambda temperatura: min(35.0, temperatura + 1.0))
             estado_sistema.registrar_evento("[Interfaz] Temperatura aumentada")
         
         elif tecla == pygame.K_g:
-            temperatura_actual = estado_sistema.obtener('temperatura')
-            estado_sistema.actualizar('temperatura', max(15.0, temperatura_actual - 1.0))
+            estado_sistema.modificar('temperatura', lambda temperatura: max(15.0, temperatura - 1.0))
             estado_sistema.registrar_evento("[Interfaz] Temperatura disminuida")
         
         elif tecla == pygame.K_r:
@@ -1,2 +1,15 @@
 # utilidades/__init__.py
-# Módulo de utilidades (puede expandirse en el futuro)
\ No newline at end of file
+# Módulo de utilidades (puede expandirse en el futuro)
+from .registrador import registrador, Registrador
+from .reloj import reloj_real, RelojReal, RelojVirtual
+from .histograma import HistogramaLatencias, GrupoHistogramas
+
+__all__ = [
+    'registrador',
+    'Registrador',
+    'reloj_real',
+    'RelojReal',
+    'RelojVirtual',
+    'HistogramaLatencias',
+    'GrupoHistogramas'
+]
@@ -0,0 +1,129 @@
+# utilidades/histograma.py - Histogramas de latencia de bajo costo (cubetas estilo HDR)
+import threading
+
+# Cada potencia de dos se divide en 2**BITS_SUBCUBETA cubetas lineales:
+# error relativo máximo ~1/16 (6%) con memoria fija
+BITS_SUBCUBETA = 4
+_SUBCUBETAS = 1 << BITS_SUBCUBETA
+_LIMITE_LINEAL = _SUBCUBETAS << 1      # Valores menores se cuentan uno a uno
+_BITS_NORMALIZADOS = BITS_SUBCUBETA + 1
+CANTIDAD_CUBETAS = 512                 # Cubre hasta ~2**35 µs (horas)
+
+def indice_cubeta(microsegundos):
+    """Cubeta de un valor entero en microsegundos"""
+    if microsegundos < _LIMITE_LINEAL:
+        return max(0, microsegundos)
+    desplazamiento = microsegundos.bit_length() - _BITS_NORMALIZADOS
+    indice = (desplazamiento << BITS_SUBCUBETA) + (microsegundos >> desplazamiento)
+    return min(indice, CANTIDAD_CUBETAS - 1)
+
+def limite_inferior(indice):
+    """Menor valor (µs) que cae en la cubeta `indice`"""
+    if indice < _LIMITE_LINEAL:
+        return indice
+    desplazamiento = indice // _SUBCUBETAS - 1
+    return (indice - desplazamiento * _SUBCUBETAS) << desplazamiento
+
+class HistogramaLatencias:
+    """Histograma de latencias con cubetas logarítmico-lineales (estilo HdrHistogram).
+
+    registrar() solo calcula un índice con bit_length() e incrementa un
+    contador: costo constante y memoria fija sin importar cuántas muestras
+    se acumulen. Los percentiles se reportan con ~6% de error relativo.
+    """
+    def __init__(self):
+        self._bloqueo = threading.Lock()
+        self._cuentas = [0] * CANTIDAD_CUBETAS
+        self.suma_us = 0
+        self.maximo_us = 0
+
+    def registrar(self, segundos):
+        # Igual que indice_cubeta() pero en línea: este método está en la ruta de cada mensaje
+        microsegundos = int(segundos * 1000000)
+        if microsegundos < _LIMITE_LINEAL:
+            indice = microsegundos if microsegundos > 0 else 0
+        else:
+            desplazamiento = microsegundos.bit_length() - _BITS_NORMALIZADOS
+            indice = (desplazamiento << BITS_SUBCUBETA) + (microsegundos >> desplazamiento)
+            if indice >= CANTIDAD_CUBETAS:
+                indice = CANTIDAD_CUBETAS - 1
+        with self._bloqueo:
+            self._cuentas[indice] += 1
+            self.suma_us += microsegundos
+            if microsegundos > self.maximo_us:
+                self.maximo_us = microsegundos
+
+    @property
+    def cuenta(self):
+        return sum(self._cuentas)
+
+    def percentil(self, porcentaje):
+        """Valor (µs) por debajo del cual está el `porcentaje` de las muestras"""
+        with self._bloqueo:
+            cuentas = list(self._cuentas)
+            maximo = self.maximo_us
+        total = sum(cuentas)
+        if not total:
+            return 0
+        objetivo = max(1, round(porcentaje / 100 * total))
+        acumulado = 0
+        for indice, cantidad in enumerate(cuentas):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                # Reportar el límite superior de la cubeta, sin pasar del máximo visto
+                return min(limite_inferior(indice + 1) - 1, maximo)
+        return maximo
+
+    def fusionar(self, otro):
+        """Suma las muestras de otro histograma a este"""
+        with otro._bloqueo:
+            cuentas = list(otro._cuentas)
+            suma, maximo = otro.suma_us, otro.maximo_us
+        with self._bloqueo:
+            self._cuentas = [propia + ajena for propia, ajena in zip(self._cuentas, cuentas)]
+            self.suma_us += suma
+            self.maximo_us = max(self.maximo_us, maximo)
+
+    def reiniciar(self):
+        with self._bloqueo:
+            self._cuentas = [0] * CANTIDAD_CUBETAS
+            self.suma_us = 0
+            self.maximo_us = 0
+
+    def resumen(self):
+        """Cuenta, media y percentiles en microsegundos"""
+        cuenta = self.cuenta
+        return {
+            'cuenta': cuenta,
+            'media_us': round(self.suma_us / cuenta, 1) if cuenta else 0.0,
+            'p50_us': self.percentil(50),
+            'p90_us': self.percentil(90),
+            'p99_us': self.percentil(99),
+            'p999_us': self.percentil(99.9),
+            'max_us': self.maximo_us
+        }
+
+class GrupoHistogramas:
+    """Histogramas por clave (p. ej. 'comando/p2'), creados al primer uso"""
+    def __init__(self):
+        self._bloqueo = threading.Lock()
+        self._histogramas = {}
+
+    def obtener(self, clave):
+        histograma = self._histogramas.get(clave)
+        if histograma is None:
+            with self._bloqueo:
+                histograma = self._histogramas.setdefault(clave, HistogramaLatencias())
+        return histograma
+
+    def registrar(self, clave, segundos):
+        self.obtener(clave).registrar(segundos)
+
+    def reiniciar(self):
+        with self._bloqueo:
+            self._histogramas = {}
+
+    def resumen(self):
+        with self._bloqueo:
+            histogramas = sorted(self._histogramas.items())
+        return {clave: histograma.resumen() for clave, histograma in histogramas}
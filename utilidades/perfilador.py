@@ -0,0 +1,135 @@
+# utilidades/perfilador.py - Perfilador por muestreo de los ciclos más lentos de los agentes
+import collections
+import heapq
+import itertools
+import sys
+import threading
+import time
+from configuracion import PERFILADOR
+
+class CicloPerfilado:
+    """Muestras de pila tomadas mientras un agente ejecutaba un ciclo"""
+    __slots__ = ('nombre', 'hilo', 'inicio', 'duracion', 'pilas')
+
+    def __init__(self, nombre, hilo):
+        self.nombre = nombre
+        self.hilo = hilo
+        self.inicio = time.time()
+        self.duracion = 0.0
+        self.pilas = collections.Counter()  # pila (tupla de marcos) -> cantidad de muestras
+
+class PerfiladorMuestreo:
+    """Perfilador estadístico para encontrar qué ejecutar_ciclo consume el presupuesto.
+
+    Un hilo muestrea cada `intervalo_muestreo` segundos la pila de los hilos
+    que están dentro de un ciclo (sys._current_frames) y, al terminar cada
+    ciclo, se conservan solo los `ciclos_lentos` más lentos por agente. Los
+    ciclos más cortos que el intervalo casi nunca reciben muestras, así que el
+    costo se concentra en los ciclos que interesan.
+    """
+    def __init__(self, intervalo_muestreo=None, ciclos_lentos=None, profundidad=None):
+        self.intervalo_muestreo = intervalo_muestreo or PERFILADOR['intervalo_muestreo']
+        self.ciclos_lentos = ciclos_lentos or PERFILADOR['ciclos_lentos']
+        self.profundidad = profundidad or PERFILADOR['profundidad']
+        self._activos = {}      # id de hilo -> CicloPerfilado en curso
+        self._lentos = {}       # agente -> heap de (duracion, desempate, CicloPerfilado)
+        self._desempate = itertools.count()
+        self._bloqueo = threading.Lock()
+        self._hilo = None
+        self._parada = threading.Event()
+        self.muestras_tomadas = 0
+
+    @property
+    def activo(self):
+        return self._hilo is not None
+
+    def iniciar(self):
+        if self._hilo is not None:
+            return
+        self._parada.clear()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True, name='perfilador')
+        self._hilo.start()
+
+    def detener(self):
+        if self._hilo is None:
+            return
+        self._parada.set()
+        self._hilo.join(1.0)
+        self._hilo = None
+
+    def comenzar_ciclo(self, nombre):
+        """Marca el inicio del ciclo del agente en el hilo actual; retorna un testigo"""
+        ciclo = CicloPerfilado(nombre, threading.get_ident())
+        self._activos[ciclo.hilo] = ciclo
+        return ciclo
+
+    def terminar_ciclo(self, ciclo, duracion):
+        """Cierra el ciclo y lo conserva si está entre los más lentos de su agente"""
+        self._activos.pop(ciclo.hilo, None)
+        ciclo.duracion = duracion
+        with self._bloqueo:
+            lentos = self._lentos.setdefault(ciclo.nombre, [])
+            entrada = (duracion, next(self._desempate), ciclo)
+            if len(lentos) < self.ciclos_lentos:
+                heapq.heappush(lentos, entrada)
+            elif duracion > lentos[0][0]:
+                heapq.heapreplace(lentos, entrada)
+
+    def _muestrear(self):
+        while not self._parada.wait(self.intervalo_muestreo):
+            activos = list(self._activos.values())
+            if not activos:
+                continue
+            marcos = sys._current_frames()
+            for ciclo in activos:
+                marco = marcos.get(ciclo.hilo)
+                # El ciclo pudo terminar mientras se tomaban las pilas
+                if marco is None or self._activos.get(ciclo.hilo) is not ciclo:
+                    continue
+                ciclo.pilas[self._pila(marco)] += 1
+                self.muestras_tomadas += 1
+
+    def _pila(self, marco):
+        """Pila de la más externa a la más interna como (archivo, función, línea)"""
+        pila = []
+        while marco is not None and len(pila) < self.profundidad:
+            codigo = marco.f_code
+            pila.append((codigo.co_filename, codigo.co_name, marco.f_lineno))
+            marco = marco.f_back
+        pila.reverse()
+        return tuple(pila)
+
+    def obtener_ciclos_lentos(self, nombre=None):
+        """Ciclos más lentos (de mayor a menor) con sus pilas más muestreadas"""
+        with self._bloqueo:
+            entradas = [entrada for agente, lentos in self._lentos.items()
+                        if nombre is None or agente == nombre for entrada in lentos]
+        entradas.sort(key=lambda entrada: -entrada[0])
+        return [{
+            'agente': ciclo.nombre,
+            'inicio': ciclo.inicio,
+            'duracion_ms': round(ciclo.duracion * 1000, 3),
+            'muestras': sum(ciclo.pilas.values()),
+            'pilas': [{'pila': [f"{archivo}:{linea} {funcion}" for archivo, funcion, linea in pila],
+                       'muestras': cantidad}
+                      for pila, cantidad in ciclo.pilas.most_common(3)]
+        } for _, _, ciclo in entradas]
+
+    def formatear(self, nombre=None, marcos=6):
+        """Texto legible con los ciclos más lentos y los marcos más internos de cada pila"""
+        lineas = []
+        for ciclo in self.obtener_ciclos_lentos(nombre):
+            lineas.append(f"[{ciclo['agente']}] ciclo de {ciclo['duracion_ms']:.1f} ms "
+                          f"({ciclo['muestras']} muestras)")
+            for pila in ciclo['pilas']:
+                lineas.append(f"  {pila['muestras']} muestras:")
+                lineas.extend(f"    {marco}" for marco in pila['pila'][-marcos:])
+        return '\n'.join(lineas)
+
+    def reiniciar(self):
+        with self._bloqueo:
+            self._lentos = {}
+        self.muestras_tomadas = 0
+
+# Instancia global del perfilador (solo muestrea tras iniciar())
+perfilador = PerfiladorMuestreo()
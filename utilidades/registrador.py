@@ -0,0 +1,177 @@
+# utilidades/registrador.py - Registro de eventos asíncrono y persistente
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import deque
+from configuracion import CONFIG_REGISTRO
+from .reloj import reloj_real
+
+class Registrador:
+    """Registro de eventos del sistema.
+
+    registrar() solo guarda la entrada cruda (marca de tiempo, mensaje) en un
+    buffer circular en memoria y la encola para el hilo escritor: no formatea
+    ni toca el disco. El hilo escritor, iniciado con iniciar(), agrupa las
+    entradas en lotes y las agrega a un archivo que rota al superar
+    `tamano_maximo` bytes, conservando `copias` archivos anteriores.
+    """
+    def __init__(self, capacidad_memoria=None, directorio=None, archivo=None,
+                 tamano_maximo=None, copias=None, tamano_lote=None):
+        self.capacidad_memoria = capacidad_memoria or CONFIG_REGISTRO['capacidad_memoria']
+        self.directorio = directorio or CONFIG_REGISTRO['directorio']
+        self.archivo = archivo or CONFIG_REGISTRO['archivo']
+        self.tamano_maximo = tamano_maximo or CONFIG_REGISTRO['tamano_maximo']
+        self.copias = copias if copias is not None else CONFIG_REGISTRO['copias']
+        self.tamano_lote = tamano_lote or CONFIG_REGISTRO['tamano_lote']
+        self.reloj = reloj_real  # Reemplazable por un RelojVirtual en simulaciones
+
+        self._recientes = deque(maxlen=self.capacidad_memoria)  # Más reciente primero
+        self._cola = queue.SimpleQueue()
+        self._contador = itertools.count(1)
+        self._hilo = None
+        self._persistiendo = False
+        self.version = 0  # Aumenta con cada evento: permite detectar cambios sin copiar
+        self._oyentes = []  # Copia en escritura: registrar() itera sin bloqueo
+        self._bloqueo_oyentes = threading.Lock()
+        self.estadisticas = {
+            'eventos_escritos': 0,
+            'lotes_escritos': 0,
+            'rotaciones': 0,
+            'errores_escritura': 0
+        }
+
+    def registrar(self, mensaje):
+        """Registra un evento; costo aproximado de un append y un put en cola"""
+        entrada = (self.reloj.time(), mensaje)
+        self._recientes.appendleft(entrada)
+        if self._persistiendo:
+            self._cola.put(entrada)
+        self.version = next(self._contador)
+        if self._oyentes:
+            self._avisar()
+
+    def agregar_oyente(self, callback):
+        """Registra callback() que se llama tras cada evento nuevo, en el hilo que registró"""
+        with self._bloqueo_oyentes:
+            self._oyentes = self._oyentes + [callback]
+
+    def quitar_oyente(self, callback):
+        with self._bloqueo_oyentes:
+            self._oyentes = [oyente for oyente in self._oyentes if oyente != callback]
+
+    def _avisar(self):
+        for callback in self._oyentes:
+            try:
+                callback()
+            except Exception as error:
+                print(f"[Registrador] Error notificando oyente: {error}")
+
+    def recientes(self, cantidad=10):
+        """Eventos más recientes formateados como 'HH:MM:SS - mensaje' (para la interfaz)"""
+        entradas = list(itertools.islice(self._recientes, cantidad))
+        return [f"{time.strftime('%H:%M:%S', time.localtime(marca))} - {mensaje}"
+                for marca, mensaje in entradas]
+
+    def limpiar(self):
+        """Vacía el buffer en memoria (lo ya persistido se conserva)"""
+        self._recientes.clear()
+        self.version = next(self._contador)
+        if self._oyentes:
+            self._avisar()
+
+    @property
+    def ruta(self):
+        return os.path.join(self.directorio, self.archivo)
+
+    def iniciar(self):
+        """Inicia el hilo escritor; los eventos previos solo quedan en memoria"""
+        if self._hilo is not None:
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        self._persistiendo = True
+        self._hilo = threading.Thread(target=self._escribir, daemon=True, name='registrador')
+        self._hilo.start()
+
+    def detener(self, tiempo_espera=2.0):
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        if self._hilo is None:
+            return
+        self._persistiendo = False
+        self._cola.put(None)
+        self._hilo.join(tiempo_espera)
+        self._hilo = None
+
+    def _escribir(self):
+        """Bucle del hilo escritor: bloquea hasta tener eventos y los escribe por lotes"""
+        archivo = open(self.ruta, 'a', encoding='utf-8')
+        try:
+            terminar = False
+            while not terminar:
+                lote = [self._cola.get()]
+                while len(lote) < self.tamano_lote:
+                    try:
+                        lote.append(self._cola.get_nowait())
+                    except queue.Empty:
+                        break
+
+                if None in lote:
+                    terminar = True
+                    lote = [entrada for entrada in lote if entrada is not None]
+                if not lote:
+                    continue
+
+                lineas = ''.join(
+                    f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(marca))}"
+                    f".{int(marca % 1 * 1000):03d} - {mensaje}\n"
+                    for marca, mensaje in lote)
+                try:
+                    archivo.write(lineas)
+                    archivo.flush()
+                    self.estadisticas['eventos_escritos'] += len(lote)
+                    self.estadisticas['lotes_escritos'] += 1
+                    if archivo.tell() >= self.tamano_maximo:
+                        archivo = self._rotar(archivo)
+                except (OSError, ValueError) as error:
+                    # ValueError: el archivo quedó cerrado (p. ej. falló la apertura tras rotar)
+                    self.estadisticas['errores_escritura'] += 1
+                    print(f"[Registrador] Error escribiendo registro: {error}")
+                    archivo = self._reabrir(archivo)
+        finally:
+            archivo.close()
+
+    def _reabrir(self, archivo):
+        """Cierra `archivo` y abre de nuevo la ruta; si no se puede, retorna el cerrado
+        (la próxima escritura fallará y se volverá a intentar)"""
+        archivo.close()
+        try:
+            return open(self.ruta, 'a', encoding='utf-8')
+        except OSError as error:
+            print(f"[Registrador] No se pudo reabrir el registro: {error}")
+            return archivo
+
+    def _rotar(self, archivo):
+        """Renombra eventos.log -> eventos.log.1 -> ... y abre un archivo nuevo.
+
+        Si falla el renombrado se sigue escribiendo en el archivo actual.
+        """
+        archivo.close()
+        try:
+            for indice in range(self.copias - 1, 0, -1):
+                origen = f"{self.ruta}.{indice}"
+                if os.path.exists(origen):
+                    os.replace(origen, f"{self.ruta}.{indice + 1}")
+            if self.copias > 0:
+                os.replace(self.ruta, f"{self.ruta}.1")
+            else:
+                os.remove(self.ruta)
+        except OSError as error:
+            self.estadisticas['errores_escritura'] += 1
+            print(f"[Registrador] Error rotando registro: {error}")
+        else:
+            self.estadisticas['rotaciones'] += 1
+        return open(self.ruta, 'a', encoding='utf-8')
+
+# Instancia global del registrador de eventos
+registrador = Registrador()
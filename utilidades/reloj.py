@@ -0,0 +1,59 @@
+# utilidades/reloj.py - Relojes inyectables (real y virtual)
+import threading
+import time
+
+class RelojReal:
+    """Reloj del sistema: time() de pared y monotonic() para medir intervalos"""
+    virtual = False
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def dormir(self, segundos, evento_parada=None):
+        """Pausa real; retorna True si se activó la parada"""
+        if evento_parada is not None:
+            return evento_parada.wait(segundos)
+        time.sleep(segundos)
+        return False
+
+class RelojVirtual:
+    """Reloj simulado que solo avanza cuando se le indica.
+
+    Permite ejecutar horas de simulación en segundos: el planificador avanza
+    el reloj directamente al próximo ciclo programado en lugar de esperar.
+    time() parte de `inicio` (época en segundos) y monotonic() de cero.
+    """
+    virtual = True
+
+    def __init__(self, inicio=None):
+        self._inicio = time.time() if inicio is None else inicio
+        self._transcurrido = 0.0
+        self._bloqueo = threading.Lock()
+
+    def time(self):
+        return self._inicio + self._transcurrido
+
+    def monotonic(self):
+        return self._transcurrido
+
+    def avanzar(self, segundos):
+        with self._bloqueo:
+            self._transcurrido += max(0.0, segundos)
+            return self._transcurrido
+
+    def avanzar_hasta(self, monotonico):
+        """Avanza hasta el instante monotónico indicado (nunca retrocede)"""
+        with self._bloqueo:
+            self._transcurrido = max(self._transcurrido, monotonico)
+            return self._transcurrido
+
+    def dormir(self, segundos, evento_parada=None):
+        """Dormir en tiempo virtual es solo avanzar el reloj"""
+        self.avanzar(segundos)
+        return evento_parada is not None and evento_parada.is_set()
+
+# Reloj por defecto de agentes, planificador y registrador
+reloj_real = RelojReal()
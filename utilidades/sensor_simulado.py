@@ -0,0 +1,136 @@
+# utilidades/sensor_simulado.py - Cliente de prueba que simula sensores conectados a la pasarela
+#
+#   python -m utilidades.sensor_simulado --direccion 127.0.0.1:8765 --frecuencia 5000
+#   python -m utilidades.sensor_simulado --direccion /tmp/domotica.sock --escuchar comando
+import argparse
+import random
+import threading
+import time
+from configuracion import PASARELA
+from datos_compartidos.pasarela import conectar, enviar_trama, recibir_trama, interpretar_direccion
+from utilidades.histograma import HistogramaLatencias
+
+class ClienteSensores:
+    """Conexión a la pasarela que publica lotes y, opcionalmente, recibe un flujo de mensajes.
+
+    Las respuestas a los lotes y las tramas del flujo llegan por el mismo
+    socket: un hilo lector separa unas de otras para que publicar() pueda
+    esperar su confirmación mientras el flujo sigue llegando.
+    """
+    def __init__(self, direccion):
+        self.conexion = conectar(direccion)
+        self._confirmaciones = []
+        self._recibidos = []
+        self._condicion = threading.Condition()
+        self._cerrado = False
+        self.mensajes_recibidos = 0
+        threading.Thread(target=self._leer, daemon=True, name='sensor-lector').start()
+
+    def _leer(self):
+        try:
+            while True:
+                trama = recibir_trama(self.conexion)
+                with self._condicion:
+                    if 'aceptados' in trama or 'suscrito' in trama or 'error' in trama:
+                        self._confirmaciones.append(trama)
+                    else:
+                        self._recibidos.extend(trama.get('mensajes', ()))
+                        self.mensajes_recibidos += len(trama.get('mensajes', ()))
+                    self._condicion.notify_all()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            with self._condicion:
+                self._cerrado = True
+                self._condicion.notify_all()
+
+    def _esperar_confirmacion(self, tiempo_espera=5.0):
+        with self._condicion:
+            if not self._condicion.wait_for(lambda: self._confirmaciones or self._cerrado, tiempo_espera):
+                raise TimeoutError("La pasarela no confirmó a tiempo")
+            if not self._confirmaciones:
+                raise ConnectionError("La pasarela cerró la conexión")
+            confirmacion = self._confirmaciones.pop(0)
+        if 'error' in confirmacion:
+            raise ValueError(confirmacion['error'])
+        return confirmacion
+
+    def publicar(self, mensajes):
+        """Envía un lote y espera {'aceptados': n, 'rechazados': m}"""
+        enviar_trama(self.conexion, {'mensajes': mensajes})
+        return self._esperar_confirmacion()
+
+    def suscribir(self, tipos=None, objetivos=None):
+        enviar_trama(self.conexion, {'suscribir': {'tipos': tipos, 'objetivos': objetivos}})
+        return self._esperar_confirmacion()['suscrito']
+
+    def recibir(self, tiempo_espera=None):
+        """Mensajes del flujo recibidos desde la última llamada (espera si no hay ninguno)"""
+        with self._condicion:
+            self._condicion.wait_for(lambda: self._recibidos or self._cerrado, tiempo_espera)
+            mensajes, self._recibidos = self._recibidos, []
+        return mensajes
+
+    def cerrar(self):
+        self.conexion.close()
+
+def generar_lote(sensores, cantidad, probabilidad_movimiento):
+    """Lecturas de sensores de movimiento, uno por zona ('zona-0', 'zona-1', ...)"""
+    return [{'tipo': 'movimiento',
+             'zona': f"zona-{random.randrange(sensores)}",
+             'valor': random.random() < probabilidad_movimiento,
+             'de': 'sensor_simulado'}
+            for _ in range(cantidad)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Sensores simulados conectados a la pasarela de sockets")
+    parser.add_argument('--direccion', default=None,
+                        help="host:puerto o ruta de socket Unix (por defecto PASARELA['direccion'])")
+    parser.add_argument('--sensores', type=int, default=50, help="Zonas con sensor de movimiento")
+    parser.add_argument('--frecuencia', type=float, default=2000,
+                        help="Lecturas por segundo en total (0: tan rápido como se pueda)")
+    parser.add_argument('--lote', type=int, default=100, help="Lecturas por trama")
+    parser.add_argument('--duracion', type=float, default=5.0, help="Segundos de envío")
+    parser.add_argument('--probabilidad-movimiento', type=float, default=0.0005,
+                        help="Fracción de lecturas que detectan movimiento")
+    parser.add_argument('--escuchar', nargs='*', default=None, metavar='TIPO',
+                        help="Abrir además un flujo de salida con estos tipos (sin tipos: todos)")
+    argumentos = parser.parse_args()
+
+    direccion = interpretar_direccion(argumentos.direccion) if argumentos.direccion else PASARELA['direccion']
+    cliente = ClienteSensores(direccion)
+    if argumentos.escuchar is not None:
+        print(f"Suscrito como {cliente.suscribir(tipos=argumentos.escuchar or None)}")
+
+    confirmaciones = HistogramaLatencias()
+    aceptados = rechazados = 0
+    periodo = argumentos.lote / argumentos.frecuencia if argumentos.frecuencia else 0.0
+    inicio = time.perf_counter()
+    siguiente = inicio
+    try:
+        while time.perf_counter() - inicio < argumentos.duracion:
+            lote = generar_lote(argumentos.sensores, argumentos.lote, argumentos.probabilidad_movimiento)
+            envio = time.perf_counter()
+            respuesta = cliente.publicar(lote)
+            confirmaciones.registrar(time.perf_counter() - envio)
+            aceptados += respuesta['aceptados']
+            rechazados += respuesta['rechazados']
+            siguiente += periodo
+            espera = siguiente - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        duracion = time.perf_counter() - inicio
+        cliente.cerrar()
+
+    resumen = confirmaciones.resumen()
+    print(f"{aceptados + rechazados} lecturas en {duracion:.2f}s ({(aceptados + rechazados) / duracion:.0f}/s): "
+          f"{aceptados} aceptadas, {rechazados} rechazadas")
+    print(f"Confirmación por lote: p50 {resumen['p50_us']} µs, p99 {resumen['p99_us']} µs")
+    if argumentos.escuchar is not None:
+        print(f"Mensajes recibidos por el flujo: {cliente.mensajes_recibidos}")
+
+if __name__ == "__main__":
+    main()
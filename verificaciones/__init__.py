@@ -0,0 +1,3 @@
+# verificaciones/__init__.py
+# Comprobaciones de comportamiento con asserts (ejecutar con python -m verificaciones.<modulo>,
+# o todas con python -m verificaciones)
@@ -0,0 +1,18 @@
+# verificaciones/__main__.py - Ejecuta todas las verificaciones
+#
+#   python -m verificaciones
+import sys
+from verificaciones import agentes, bus, estado, estado_compartido, pasarela, registrador, reglas, termico
+from verificaciones.comun import reportar
+
+MODULOS = (agentes, bus, estado, estado_compartido, registrador, reglas, termico, pasarela)
+
+def main():
+    resultados = {}
+    for modulo in MODULOS:
+        resultados.update({f"{modulo.__name__.rsplit('.', 1)[-1]}.{nombre}": error
+                           for nombre, error in modulo.ejecutar().items()})
+    return 0 if reportar(resultados) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+# verificaciones/agentes.py - Reloj y estadísticas de ciclo de agentes/agente_base.py y agentes/agente_async.py
+import asyncio
+import sys
+import time
+from agentes.agente_async import AsyncAgenteBase
+from agentes.agente_base import AgenteBase
+from datos_compartidos.bus_mensajes import BusMensajes
+from datos_compartidos.evento_parada import EventoParada
+from utilidades.reloj import RelojVirtual
+from verificaciones.comun import ejecutar_verificaciones, reportar
+
+class AgenteAsyncVacio(AsyncAgenteBase):
+    async def ejecutar_ciclo(self):
+        pass
+
+class AgenteLento(AgenteBase):
+    """Agente cuyo ciclo dura más que su plazo"""
+    config = {'intervalo_verificacion': 0.001}
+
+    def ejecutar_ciclo(self):
+        time.sleep(0.005)
+
+def verificar_plazo_incumplido_no_afecta_la_salud():
+    """Los ciclos que exceden el plazo se cuentan en las estadísticas; la salud solo mira la inactividad"""
+    reloj = RelojVirtual(inicio=1000.0)
+    bus = BusMensajes(trazar=False)
+    agente = AgenteLento('lento', bus, EventoParada(), reloj=reloj)
+    try:
+        for _ in range(3):
+            assert agente.ejecutar_paso()
+        estadisticas = agente.obtener_estadisticas()
+        assert estadisticas['plazos_incumplidos'] == 3
+        assert estadisticas['plazo_ciclo'] == 0.001
+        assert agente.verificar_salud()
+        reloj.avanzar(5.0)
+        assert not agente.verificar_salud()
+    finally:
+        bus.cancelar_suscripcion(agente.nombre)
+
+def verificar_agente_async_usa_su_reloj():
+    """Las marcas de tiempo del agente asyncio salen del reloj inyectado, no de time.time()"""
+    reloj = RelojVirtual(inicio=1000.0)
+    agente = AgenteAsyncVacio('vacio', None, None, reloj=reloj)
+    assert agente.ultimo_tiempo_procesamiento == 1000.0
+    reloj.avanzar(3600)
+    assert asyncio.run(agente.ejecutar_paso())
+    assert agente.ultimo_tiempo_procesamiento == 4600.0
+    assert agente.estadisticas['ciclos_ejecutados'] == 1
+
+VERIFICACIONES = [
+    verificar_plazo_incumplido_no_afecta_la_salud,
+    verificar_agente_async_usa_su_reloj
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)
@@ -0,0 +1,185 @@
+# verificaciones/bus.py - Rutas, buzones, trazas y lotes de datos_compartidos/bus_mensajes.py
+import sys
+import threading
+import time
+from datos_compartidos.bus_mensajes import BusMensajes
+from utilidades.histograma import CANTIDAD_CUBETAS, HistogramaLatencias, indice_cubeta, limite_inferior
+from verificaciones.comun import ejecutar_verificaciones, reportar
+
+def verificar_rutas_por_tipo_y_objetivo():
+    """Cada buzón recibe solo lo suscrito; lo que nadie pidió va al buzón general"""
+    bus = BusMensajes(trazar=False)
+    luces = bus.suscribir('luces', tipos=('movimiento',), objetivos=('iluminacion',))
+    seguridad = bus.suscribir('seguridad', tipos=('movimiento',))
+    monitor = bus.suscribir('monitor')  # Sin filtros: recibe todo
+
+    bus.enviar_mensaje({'tipo': 'movimiento', 'objetivo': 'iluminacion'})
+    bus.enviar_mensaje({'tipo': 'comando', 'objetivo': 'iluminacion'})
+    bus.enviar_mensaje({'tipo': 'estado'})
+
+    # 'luces' coincide por tipo y por objetivo con el primero, pero lo recibe una vez
+    assert [m['tipo'] for m in luces.extraer_todos()] == ['comando', 'movimiento']
+    assert [m['tipo'] for m in seguridad.extraer_todos()] == ['movimiento']
+    assert len(monitor.extraer_todos()) == 3
+    assert bus.recibir_todos_mensajes() == []
+
+    bus.cancelar_suscripcion('monitor')
+    bus.enviar_mensaje({'tipo': 'estado'})
+    assert [m['tipo'] for m in bus.recibir_todos_mensajes()] == ['estado']
+    assert bus.obtener_estadisticas()['mensajes_sin_destino'] == 1
+
+def verificar_histograma_de_latencias():
+    """Percentiles con error relativo acotado (~6%), máximo exacto y fusión de muestras"""
+    for indice in range(CANTIDAD_CUBETAS):
+        assert indice_cubeta(limite_inferior(indice)) == indice
+
+    histograma = HistogramaLatencias()
+    for microsegundos in range(1, 10001):
+        histograma.registrar(microsegundos / 1e6)
+    for porcentaje, esperado in ((50, 5000), (90, 9000), (99, 9900)):
+        assert abs(histograma.percentil(porcentaje) - esperado) <= esperado / 16
+    resumen = histograma.resumen()
+    assert resumen['cuenta'] == 10000 and resumen['max_us'] == 10000
+    assert resumen['p999_us'] <= resumen['max_us']
+
+    otro = HistogramaLatencias()
+    otro.registrar(2.0)
+    histograma.fusionar(otro)
+    assert histograma.cuenta == 10001 and histograma.maximo_us == 2000000
+
+def verificar_trazas_por_tipo_y_prioridad():
+    """La espera en buzón se registra por 'tipo/pN'; sin trazas no hay histogramas"""
+    bus = BusMensajes(trazar=True)
+    buzon = bus.suscribir('agente')
+    bus.enviar_mensaje({'tipo': 'comando'})
+    bus.enviar_mensaje({'tipo': 'estado'})
+    bus.enviar_mensaje({'tipo': 'estado'})
+    buzon.extraer_todos()
+    espera = bus.obtener_histogramas()['espera']
+    assert {clave: datos['cuenta'] for clave, datos in espera.items()} == {'comando/p2': 1, 'estado/p0': 2}
+    bus.reiniciar_histogramas()
+    assert bus.obtener_histogramas()['espera'] == {}
+
+    sin_trazas = BusMensajes(trazar=False)
+    sin_trazas.enviar_mensaje({'tipo': 'comando'})
+    sin_trazas.recibir_todos_mensajes()
+    assert sin_trazas.obtener_histogramas() == {}
+
+def verificar_politicas_de_desborde():
+    """Cada prioridad aplica su política al llenarse y cuenta sus pérdidas"""
+    bus = BusMensajes(trazar=False, colas={
+        0: {'capacidad': 2, 'politica': 'descartar_antiguo'},
+        1: {'capacidad': 2, 'politica': 'rechazar'},
+        2: {'capacidad': 2, 'politica': 'descartar_nuevo'}
+    })
+    buzon = bus.suscribir('agente')
+    for numero in range(4):
+        assert bus.enviar_mensaje({'tipo': 'estado', 'n': numero}, tiempo_espera=0)
+        assert bus.enviar_mensaje({'tipo': 'comando', 'n': numero}, tiempo_espera=0)  # Falso éxito
+        exito = bus.enviar_mensaje({'tipo': 'movimiento', 'n': numero}, tiempo_espera=0)
+        assert exito == (numero < 2)
+    assert buzon.perdidos_por_prioridad == [2, 2, 2]
+
+    # Las colas llenas no se estorban entre sí y se extraen de mayor a menor prioridad
+    recibidos = [(m['tipo'], m['n']) for m in buzon.extraer_todos()]
+    assert recibidos == [('comando', 0), ('comando', 1), ('movimiento', 0), ('movimiento', 1),
+                         ('estado', 2), ('estado', 3)]
+    assert bus.obtener_estadisticas()['perdidos_por_prioridad'] == [2, 2, 2]
+
+def verificar_politica_bloquear():
+    """'bloquear' espera a que se libere espacio hasta su tiempo_espera; si no, rechaza"""
+    bus = BusMensajes(trazar=False, colas={0: {'capacidad': 1, 'politica': 'bloquear'}})
+    buzon = bus.suscribir('agente')
+    assert bus.enviar_mensaje({'tipo': 'estado', 'n': 0}, tiempo_espera=0)
+    inicio = time.monotonic()
+    assert not bus.enviar_mensaje({'tipo': 'estado', 'n': 1}, tiempo_espera=0.05)
+    assert time.monotonic() - inicio >= 0.05
+
+    consumidor = threading.Timer(0.05, buzon.extraer)
+    consumidor.start()
+    try:
+        assert bus.enviar_mensaje({'tipo': 'estado', 'n': 2}, tiempo_espera=2.0)
+    finally:
+        consumidor.join()
+    assert [m['n'] for m in buzon.extraer_todos()] == [2]
+    assert buzon.perdidos_por_prioridad == [1, 0, 0]
+
+    try:
+        BusMensajes(trazar=False, colas={0: {'politica': 'ignorar'}})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Se aceptó una política de desborde desconocida")
+
+def verificar_coalescencia():
+    """Los repetidos de una misma (tipo, objetivo, de) se fusionan en el lugar del pendiente"""
+    bus = BusMensajes(trazar=False, coalescencia={'tipos': ('movimiento',), 'ventana': 10.0})
+    buzon = bus.suscribir('agente')
+    primero = {'tipo': 'movimiento', 'de': 'sensor-a', 'valor': 1}
+    bus.enviar_mensaje(primero)
+    bus.enviar_mensaje({'tipo': 'movimiento', 'de': 'sensor-b', 'valor': 1})
+    bus.enviar_mensaje({'tipo': 'movimiento', 'de': 'sensor-a', 'objetivo': 'iluminacion', 'valor': 1})
+    bus.enviar_mensaje({'tipo': 'movimiento', 'de': 'sensor-a', 'valor': 2})
+    bus.enviar_mensaje({'tipo': 'movimiento', 'de': 'sensor-a', 'valor': 3})
+    bus.enviar_mensaje({'tipo': 'estado', 'de': 'sensor-a'})
+    bus.enviar_mensaje({'tipo': 'estado', 'de': 'sensor-a'})  # Tipo no coalescible
+
+    recibidos = buzon.extraer_todos()
+    assert [(m['tipo'], m['de'], m.get('objetivo'), m.get('valor'), m.get('coalescidos', 1)) for m in recibidos] == [
+        ('movimiento', 'sensor-a', None, 3, 3),
+        ('movimiento', 'sensor-b', None, 1, 1),
+        ('movimiento', 'sensor-a', 'iluminacion', 1, 1),
+        ('estado', 'sensor-a', None, None, 1),
+        ('estado', 'sensor-a', None, None, 1)
+    ]
+    assert 'coalescidos' not in primero  # El mensaje publicado no se modifica
+    assert bus.obtener_estadisticas()['mensajes_coalescidos'] == 2
+
+    # Una vez extraído, el siguiente abre una entrada nueva
+    bus.enviar_mensaje({'tipo': 'movimiento', 'de': 'sensor-a', 'valor': 4})
+    assert [m.get('coalescidos', 1) for m in buzon.extraer_todos()] == [1]
+
+def verificar_ventana_de_coalescencia():
+    """Pasada la ventana desde el pendiente, el mensaje se encola aparte"""
+    bus = BusMensajes(trazar=False, coalescencia={'tipos': ('movimiento',), 'ventana': 0.02})
+    buzon = bus.suscribir('agente')
+    bus.enviar_mensaje({'tipo': 'movimiento', 'de': 'sensor-a', 'valor': 1})
+    time.sleep(0.03)
+    bus.enviar_mensaje({'tipo': 'movimiento', 'de': 'sensor-a', 'valor': 2})
+    assert [m['valor'] for m in buzon.extraer_todos()] == [1, 2]
+
+def verificar_lotes():
+    """enviar_lote enruta y cuenta como enviar_mensaje; extraer_lote respeta la cantidad y la prioridad"""
+    bus = BusMensajes(trazar=False, colas={0: {'capacidad': 3, 'politica': 'rechazar'}})
+    buzon = bus.suscribir('agente', tipos=('estado', 'comando'))
+    mensajes = [{'tipo': 'estado', 'n': numero} for numero in range(4)]
+    mensajes += [{'tipo': 'comando', 'n': 4}, {'tipo': 'log', 'n': 5}, 'no es un mensaje']
+    # El cuarto 'estado' no cabe; 'log' no tiene suscriptor; la cadena es inválida
+    assert bus.enviar_lote(mensajes, tiempo_espera=0) == 5
+    estadisticas = bus.obtener_estadisticas()
+    assert estadisticas['mensajes_enviados'] == 6
+    assert estadisticas['mensajes_sin_destino'] == 1
+    assert estadisticas['mensajes_alta_prioridad'] == 1
+    assert estadisticas['mensajes_perdidos'] == 2  # El rechazado y el inválido
+
+    assert [m['n'] for m in buzon.extraer_lote(2)] == [4, 0]
+    assert [m['n'] for m in bus.recibir_lote(10, suscriptor='agente')] == [1, 2]
+    assert buzon.extraer_lote(10, tiempo_espera=0.01) == []
+    assert [m['n'] for m in bus.recibir_todos_mensajes()] == [5]
+
+VERIFICACIONES = [
+    verificar_rutas_por_tipo_y_objetivo,
+    verificar_histograma_de_latencias,
+    verificar_trazas_por_tipo_y_prioridad,
+    verificar_politicas_de_desborde,
+    verificar_politica_bloquear,
+    verificar_coalescencia,
+    verificar_ventana_de_coalescencia,
+    verificar_lotes
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)
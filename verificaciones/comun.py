@@ -0,0 +1,34 @@
+# verificaciones/comun.py - Utilidades compartidas por las verificaciones
+import contextlib
+import io
+import time
+import traceback
+
+def ejecutar_verificaciones(verificaciones):
+    """Ejecuta cada función (silenciando su salida) y retorna {nombre: None o el error}"""
+    resultados = {}
+    for verificacion in verificaciones:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                verificacion()
+            resultados[verificacion.__name__] = None
+        except Exception:
+            resultados[verificacion.__name__] = traceback.format_exc()
+    return resultados
+
+def esperar(condicion, tiempo_espera=2.0):
+    """Sondea condicion() hasta que sea verdadera; retorna False si venció el tiempo"""
+    limite = time.monotonic() + tiempo_espera
+    while not condicion():
+        if time.monotonic() > limite:
+            return False
+        time.sleep(0.01)
+    return True
+
+def reportar(resultados):
+    """Imprime OK/FALLA por verificación; retorna True si pasaron todas"""
+    for nombre, error in resultados.items():
+        print(f"{'OK   ' if error is None else 'FALLA'} {nombre}")
+        if error is not None:
+            print(error)
+    return all(error is None for error in resultados.values())
@@ -0,0 +1,143 @@
+# verificaciones/estado.py - Versiones, instantáneas, fragmentos y transacciones de datos_compartidos/estado_sistema.py
+import sys
+import threading
+import time
+from datos_compartidos.estado_sistema import EstadoSistema
+from utilidades.registrador import registrador
+from verificaciones.comun import ejecutar_verificaciones, reportar
+
+def verificar_versiones_y_notificaciones():
+    """Solo los cambios reales suben la versión y llegan a los suscriptores de esa clave"""
+    estado = EstadoSistema()
+    recibidos = []
+    estado.suscribir(lambda clave, valor, version: recibidos.append((clave, valor, version)),
+                     claves=('temperatura',))
+    version = estado.obtener_version('temperatura')
+    estado.actualizar('temperatura', 22.0)  # Mismo valor: no es un cambio
+    estado.actualizar('es_noche', True)     # Clave no suscrita
+    assert recibidos == []
+    assert estado.obtener_version('temperatura') == version
+
+    estado.actualizar('temperatura', 23.5)
+    nueva = estado.obtener_version('temperatura')
+    assert nueva > estado.obtener_todo().version_de('es_noche') > version
+    assert recibidos == [('temperatura', 23.5, nueva)]
+
+def verificar_esperar_cambio():
+    """esperar_cambio retorna None al vencer el tiempo y la versión nueva si otro hilo escribe"""
+    estado = EstadoSistema()
+    version = estado.obtener_version('luces_activadas')
+    inicio = time.monotonic()
+    assert estado.esperar_cambio(('luces_activadas',), version, tiempo_espera=0.05) is None
+    assert time.monotonic() - inicio >= 0.05
+    assert estado.esperar_cambio(('luces_activadas',), version, tiempo_espera=0) is None
+
+    escritor = threading.Timer(0.05, estado.actualizar, ('luces_activadas', True))
+    escritor.start()
+    try:
+        nueva = estado.esperar_cambio(('luces_activadas',), version, tiempo_espera=2.0)
+    finally:
+        escritor.join()
+    assert nueva == estado.obtener_version('luces_activadas') > version
+
+def verificar_instantaneas_inmutables():
+    """Una instantánea conserva sus valores tras escrituras posteriores y no admite asignación"""
+    estado = EstadoSistema()
+    instantanea = estado.obtener_todo()
+    assert estado.obtener_todo() is instantanea  # Sin cambios no se crea otra
+    try:
+        instantanea['temperatura'] = 30.0
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("La instantánea admitió una asignación")
+
+    copia = instantanea.copy()
+    copia['temperatura'] = 30.0
+    assert estado.obtener('temperatura') == 22.0
+
+    estado.actualizar('temperatura', 25.0)
+    assert instantanea['temperatura'] == 22.0
+    nueva = estado.obtener_todo()
+    assert nueva is not instantanea and nueva['temperatura'] == 25.0
+    assert nueva.version > instantanea.version
+
+def escritura_concurrente_espera(estrategia):
+    """True si, con una transacción abierta sobre 'temperatura', otro hilo no puede escribir 'luces_activadas'"""
+    estado = EstadoSistema(estrategia)
+    escrito = threading.Event()
+    escritor = threading.Thread(target=lambda: (estado.actualizar('luces_activadas', True), escrito.set()))
+    with estado.transaccion('temperatura') as transaccion:
+        transaccion['temperatura'] = 21.0
+        escritor.start()
+        espero = not escrito.wait(0.1)
+    escritor.join()
+    assert estado.leer('temperatura', 'luces_activadas') == (21.0, True)
+    return espero
+
+def verificar_bloqueo_por_fragmentos():
+    """Con 'fragmentos' escribir la iluminación no espera al clima; con 'global' sí"""
+    assert not escritura_concurrente_espera('fragmentos')
+    assert escritura_concurrente_espera('global')
+
+    # La versión global y la instantánea combinada abarcan todos los fragmentos
+    estado = EstadoSistema('fragmentos')
+    estado.actualizar('temperatura', 19.0)
+    estado.actualizar('alerta_seguridad', True)
+    instantanea = estado.obtener_todo()
+    assert (instantanea['temperatura'], instantanea['alerta_seguridad']) == (19.0, True)
+    assert instantanea.version == estado.obtener_version() == instantanea.version_de('alerta_seguridad')
+    assert instantanea.version_de('alerta_seguridad') > instantanea.version_de('temperatura')
+
+    try:
+        EstadoSistema('por_clave')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Se aceptó una estrategia de bloqueo desconocida")
+
+def verificar_transaccion_abortada_no_registra():
+    """Escribir fuera de los fragmentos bloqueados aborta sin publicar cambios ni registrar eventos"""
+    estado = EstadoSistema('fragmentos')
+    version_estado = estado.obtener_version()
+    version_registro = registrador.version
+    try:
+        with estado.transaccion('temperatura') as transaccion:
+            transaccion['temperatura'] = 25.0
+            transaccion['luces_activadas'] = True  # Fragmento 'iluminacion', no bloqueado
+            transaccion.registrar_evento("[Verificación] No debe registrarse")
+    except RuntimeError as error:
+        assert 'iluminacion' in str(error)
+    else:
+        raise AssertionError("La transacción debía abortar")
+    assert registrador.version == version_registro
+    assert estado.obtener_version() == version_estado
+    assert estado.leer('temperatura', 'luces_activadas') == (22.0, False)
+
+def verificar_transaccion_confirmada():
+    """Los cambios se publican en una sola versión y el evento se registra al confirmar"""
+    estado = EstadoSistema('fragmentos')
+    version_registro = registrador.version
+    with estado.transaccion('temperatura', 'calefaccion_activada') as transaccion:
+        transaccion['temperatura'] = 18.0
+        transaccion['calefaccion_activada'] = True
+        transaccion.registrar_evento("[Verificación] Transacción confirmada")
+    assert registrador.version > version_registro
+    assert estado.leer('temperatura', 'calefaccion_activada') == (18.0, True)
+    instantanea = estado.obtener_todo()
+    assert instantanea.version_de('temperatura') == instantanea.version_de('calefaccion_activada')
+
+VERIFICACIONES = [
+    verificar_versiones_y_notificaciones,
+    verificar_esperar_cambio,
+    verificar_instantaneas_inmutables,
+    verificar_bloqueo_por_fragmentos,
+    verificar_transaccion_abortada_no_registra,
+    verificar_transaccion_confirmada
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)
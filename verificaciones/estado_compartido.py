@@ -0,0 +1,76 @@
+# verificaciones/estado_compartido.py - Seqlock y transacciones de datos_compartidos/estado_compartido.py
+import multiprocessing
+import sys
+from datos_compartidos.estado_compartido import EstadoCompartido
+from verificaciones.comun import ejecutar_verificaciones, reportar
+
+ESCRITURAS = 50000
+
+def escribir_alternando(estado, cantidad):
+    """Proceso hijo: escribe juntas tres claves que deben verse siempre coherentes"""
+    try:
+        for numero in range(1, cantidad + 1):
+            with estado.transaccion() as transaccion:
+                transaccion['temperatura'] = float(numero)
+                transaccion['calefaccion_activada'] = numero % 2 == 1
+                transaccion['ventilador_activado'] = numero % 2 == 0
+    finally:
+        estado.cerrar()
+
+def coherente(instantanea):
+    numero = int(instantanea['temperatura'])
+    return (instantanea['calefaccion_activada'] == (numero % 2 == 1) and
+            instantanea['ventilador_activado'] == (numero % 2 == 0) and
+            instantanea.version_de('temperatura') == instantanea.version_de('calefaccion_activada'))
+
+def verificar_lectura_concurrente_con_escritura():
+    """Un lector sin bloqueo nunca ve una escritura a medias de otro proceso"""
+    contexto = multiprocessing.get_context('spawn')
+    estado = EstadoCompartido({'temperatura': 0.0, 'calefaccion_activada': False,
+                               'ventilador_activado': True}, contexto)
+    escritor = contexto.Process(target=escribir_alternando, args=(estado, ESCRITURAS), daemon=True)
+    try:
+        escritor.start()
+        vistos = set()
+        while escritor.is_alive() or len(vistos) < 2:
+            instantanea = estado.obtener_todo()
+            assert coherente(instantanea), dict(instantanea)
+            vistos.add(instantanea['temperatura'])
+            if instantanea['temperatura'] == ESCRITURAS:
+                break
+        escritor.join(10)
+        assert escritor.exitcode == 0
+        final = estado.obtener_todo()
+        assert coherente(final) and final['temperatura'] == ESCRITURAS
+        assert estado.obtener('temperatura') == ESCRITURAS
+    finally:
+        # Dejar terminar al escritor: matarlo con el bloqueo tomado colgaría cerrar()
+        escritor.join(10)
+        estado.cerrar()
+
+def verificar_transaccion_abortada():
+    """Una excepción dentro de la transacción descarta sus cambios"""
+    estado = EstadoCompartido()
+    try:
+        version = estado.obtener_version()
+        try:
+            with estado.transaccion() as transaccion:
+                transaccion['temperatura'] = 30.0
+                raise KeyError('temperatura')
+        except KeyError:
+            pass
+        assert estado.obtener_version() == version
+        assert estado.obtener('temperatura') == 22.0
+    finally:
+        estado.cerrar()
+
+VERIFICACIONES = [
+    verificar_lectura_concurrente_con_escritura,
+    verificar_transaccion_abortada
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)
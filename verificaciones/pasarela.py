@@ -0,0 +1,126 @@
+# verificaciones/pasarela.py - PasarelaSockets con el cliente de sensores simulados en un puerto local
+import logging
+import sys
+from datos_compartidos.bus_mensajes import BusMensajes
+from datos_compartidos.pasarela import PasarelaSockets
+from utilidades.sensor_simulado import ClienteSensores
+from verificaciones.comun import ejecutar_verificaciones, esperar, reportar
+
+class ErroresAsyncio(logging.Handler):
+    """Junta lo que asyncio registraría en stderr (p. ej. tareas canceladas a mitad)"""
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.registros = []
+
+    def emit(self, registro):
+        self.registros.append(registro)
+
+def iniciar_pasarela():
+    """Pasarela en un puerto libre (puerto 0) sobre un bus aislado"""
+    bus = BusMensajes(trazar=False)
+    pasarela = PasarelaSockets(bus, ('127.0.0.1', 0))
+    return bus, pasarela, pasarela.iniciar()
+
+def verificar_publicar_lote():
+    bus, pasarela, direccion = iniciar_pasarela()
+    buzon = bus.suscribir('consumidor', tipos=('movimiento',))
+    cliente = ClienteSensores(direccion)
+    try:
+        respuesta = cliente.publicar([{'tipo': 'movimiento', 'valor': True, 'prioridad': 1},
+                                      {'tipo': 'movimiento', 'valor': False},
+                                      {'valor': True}])  # Sin 'tipo': se rechaza
+        assert respuesta == {'aceptados': 2, 'rechazados': 1}, respuesta
+        mensajes = buzon.extraer_lote(10, tiempo_espera=0.5)
+        assert [mensaje['valor'] for mensaje in mensajes] == [True, False]
+        assert all(mensaje['de'].startswith('pasarela-') for mensaje in mensajes)
+    finally:
+        cliente.cerrar()
+        pasarela.detener()
+
+def verificar_suscribir_y_recibir_flujo():
+    bus, pasarela, direccion = iniciar_pasarela()
+    cliente = ClienteSensores(direccion)
+    try:
+        nombre = cliente.suscribir(tipos=['comando'])
+        assert nombre.startswith('pasarela-')
+        bus.enviar_mensaje({'de': 'verificacion', 'tipo': 'comando', 'accion': 'activar_luces'})
+        bus.enviar_mensaje({'de': 'verificacion', 'tipo': 'movimiento', 'valor': True})  # Filtrado
+        mensajes = cliente.recibir(tiempo_espera=2.0)
+        assert [mensaje['accion'] for mensaje in mensajes] == ['activar_luces'], mensajes
+    finally:
+        cliente.cerrar()
+        pasarela.detener()
+
+def verificar_error_de_protocolo():
+    bus, pasarela, direccion = iniciar_pasarela()
+    cliente = ClienteSensores(direccion)
+    try:
+        try:
+            cliente.publicar('no es una lista')
+        except ValueError as error:
+            assert "'mensajes' debe ser una lista" in str(error)
+        else:
+            raise AssertionError("La pasarela aceptó una trama inválida")
+        # Tras el error la pasarela cierra la conexión
+        assert esperar(lambda: cliente._cerrado)
+        assert pasarela.obtener_estadisticas()['errores_protocolo'] == 1
+    finally:
+        cliente.cerrar()
+        pasarela.detener()
+
+def verificar_filtros_de_suscripcion_invalidos():
+    """'tipos' y 'objetivos' deben ser listas de textos; si no, error de protocolo y cierre"""
+    bus, pasarela, direccion = iniciar_pasarela()
+    try:
+        for filtros in ({'tipos': 'movimiento'}, {'objetivos': ['iluminacion', 3]}, {'tipos': {'a': 1}}):
+            cliente = ClienteSensores(direccion)
+            try:
+                try:
+                    cliente.suscribir(**filtros)
+                except ValueError as error:
+                    assert 'debe ser una lista de textos' in str(error)
+                else:
+                    raise AssertionError(f"La pasarela aceptó los filtros {filtros}")
+                assert esperar(lambda: cliente._cerrado)
+            finally:
+                cliente.cerrar()
+        assert pasarela.obtener_estadisticas()['errores_protocolo'] == 3
+        assert bus.obtener_estadisticas()['suscriptores'] == 0
+    finally:
+        pasarela.detener()
+
+def verificar_detener_con_cliente_conectado():
+    errores = ErroresAsyncio()
+    registro_asyncio = logging.getLogger('asyncio')
+    registro_asyncio.addHandler(errores)
+    bus, pasarela, direccion = iniciar_pasarela()
+    suscrito = ClienteSensores(direccion)
+    publicador = ClienteSensores(direccion)
+    try:
+        suscrito.suscribir(tipos=['comando'])
+        publicador.publicar([{'tipo': 'movimiento', 'valor': True}])
+        assert pasarela.obtener_estadisticas()['conexiones_activas'] == 2
+
+        pasarela.detener()
+        assert esperar(lambda: suscrito._cerrado and publicador._cerrado)
+        assert pasarela.obtener_estadisticas()['conexiones_activas'] == 0
+        assert not errores.registros, [registro.getMessage() for registro in errores.registros]
+    finally:
+        registro_asyncio.removeHandler(errores)
+        suscrito.cerrar()
+        publicador.cerrar()
+        pasarela.detener()
+
+VERIFICACIONES = [
+    verificar_publicar_lote,
+    verificar_suscribir_y_recibir_flujo,
+    verificar_error_de_protocolo,
+    verificar_filtros_de_suscripcion_invalidos,
+    verificar_detener_con_cliente_conectado
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)
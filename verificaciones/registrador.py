@@ -0,0 +1,83 @@
+# verificaciones/registrador.py - Hilo escritor y rotación de utilidades/registrador.py
+import os
+import sys
+import tempfile
+from utilidades.registrador import Registrador
+from verificaciones.comun import ejecutar_verificaciones, esperar, reportar
+
+def leer_lineas(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        return archivo.read().splitlines()
+
+def verificar_rotacion():
+    with tempfile.TemporaryDirectory() as directorio:
+        registro = Registrador(directorio=directorio, tamano_maximo=1, copias=2)
+        registro.iniciar()
+        try:
+            for indice in range(4):
+                registro.registrar(f"evento {indice}")
+                assert esperar(lambda: registro.estadisticas['eventos_escritos'] == indice + 1)
+        finally:
+            registro.detener()
+        assert registro.estadisticas['rotaciones'] == 4
+        assert leer_lineas(registro.ruta + '.1')[0].endswith(' - evento 3')
+        assert os.path.exists(registro.ruta + '.2') and not os.path.exists(registro.ruta + '.3')
+
+def verificar_sigue_escribiendo_si_falla_el_renombrado():
+    """Si os.replace falla al rotar, el escritor reabre el archivo actual y el hilo sigue vivo"""
+    with tempfile.TemporaryDirectory() as directorio:
+        registro = Registrador(directorio=directorio, tamano_maximo=1, copias=1)
+        replace = os.replace
+
+        def fallar(origen, destino):
+            raise PermissionError(f"Archivo en uso: {origen}")
+
+        os.replace = fallar
+        try:
+            registro.iniciar()
+            registro.registrar("antes")
+            assert esperar(lambda: registro.estadisticas['errores_escritura'] >= 1)
+            registro.registrar("despues")
+            assert esperar(lambda: registro.estadisticas['eventos_escritos'] == 2)
+            assert registro._hilo.is_alive()
+        finally:
+            os.replace = replace
+            registro.detener()
+        assert registro.estadisticas['rotaciones'] == 0
+        assert [linea.rsplit(' - ', 1)[1] for linea in leer_lineas(registro.ruta)] == ['antes', 'despues']
+
+def verificar_recupera_archivo_cerrado():
+    """Si la reapertura tras rotar falla, la próxima escritura reabre la ruta en lugar de morir"""
+    with tempfile.TemporaryDirectory() as directorio:
+        registro = Registrador(directorio=directorio, tamano_maximo=1, copias=2)
+        rotar = registro._rotar
+
+        def rotar_y_fallar(archivo):
+            rotar(archivo).close()
+            raise OSError("Sin descriptores de archivo")
+
+        registro._rotar = rotar_y_fallar
+        registro.iniciar()
+        try:
+            registro.registrar("primero")
+            assert esperar(lambda: registro.estadisticas['errores_escritura'] >= 1)
+            registro._rotar = rotar
+            registro.registrar("segundo")
+            assert esperar(lambda: registro.estadisticas['eventos_escritos'] == 2)
+            assert registro._hilo.is_alive()
+        finally:
+            registro.detener()
+        assert leer_lineas(registro.ruta + '.2')[0].endswith(' - primero')
+        assert leer_lineas(registro.ruta + '.1')[0].endswith(' - segundo')
+
+VERIFICACIONES = [
+    verificar_rotacion,
+    verificar_sigue_escribiendo_si_falla_el_renombrado,
+    verificar_recupera_archivo_cerrado
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)
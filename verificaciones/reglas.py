@@ -0,0 +1,62 @@
+# verificaciones/reglas.py - Reglas de iluminación y seguridad de agentes/reglas_hogar.py
+import sys
+from agentes.agente_iluminacion import AgenteIluminacion
+from datos_compartidos.bus_mensajes import BusMensajes
+from datos_compartidos.estado_sistema import estado_sistema
+from datos_compartidos.evento_parada import EventoParada
+from verificaciones.comun import ejecutar_verificaciones, reportar
+
+def crear_agente_iluminacion(**estado):
+    """Agente sin hilo propio sobre un bus aislado; `estado` fija las claves antes de crearlo"""
+    for clave, valor in estado.items():
+        estado_sistema.actualizar(clave, valor)
+    return AgenteIluminacion(BusMensajes(trazar=False), EventoParada())
+
+def cerrar(agente):
+    estado_sistema.cancelar_suscripcion(agente.reglas.marcar_cambio)
+
+def verificar_lectura_negativa_no_enciende():
+    """De noche sin presencia, lecturas 'movimiento' con valor False no encienden las luces"""
+    agente = crear_agente_iluminacion(es_noche=True, presencia_esperada=False, luces_activadas=False)
+    try:
+        for _ in range(10):
+            agente.procesar_mensaje({'tipo': 'movimiento', 'valor': False})
+        assert estado_sistema.obtener('luces_activadas') is False
+        assert agente.ultimo_movimiento == 0
+
+        agente.procesar_mensaje({'tipo': 'movimiento', 'valor': True})
+        assert estado_sistema.obtener('luces_activadas') is True
+        assert agente.ultimo_movimiento > 0
+    finally:
+        cerrar(agente)
+
+def verificar_movimiento_de_dia_no_enciende():
+    agente = crear_agente_iluminacion(es_noche=False, presencia_esperada=False, luces_activadas=False)
+    try:
+        agente.procesar_mensaje({'tipo': 'movimiento', 'valor': True})
+        assert estado_sistema.obtener('luces_activadas') is False
+    finally:
+        cerrar(agente)
+
+def verificar_anochecer_con_presencia():
+    """El cambio de 'es_noche' solo se evalúa en el ciclo siguiente (procesar_pendientes)"""
+    agente = crear_agente_iluminacion(es_noche=False, presencia_esperada=True, luces_activadas=False)
+    try:
+        estado_sistema.actualizar('es_noche', True)
+        assert estado_sistema.obtener('luces_activadas') is False
+        agente.reglas.procesar_pendientes()
+        assert estado_sistema.obtener('luces_activadas') is True
+    finally:
+        cerrar(agente)
+
+VERIFICACIONES = [
+    verificar_lectura_negativa_no_enciende,
+    verificar_movimiento_de_dia_no_enciende,
+    verificar_anochecer_con_presencia
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)
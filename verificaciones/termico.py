@@ -0,0 +1,52 @@
+# verificaciones/termico.py - Paso vectorizado de agentes/motor_termico.py (requiere NumPy)
+import sys
+from agentes.motor_termico import MotorTermico, numpy_disponible
+from configuracion import CONFIG_AGENTES
+from verificaciones.comun import ejecutar_verificaciones, reportar
+
+# Sin variación aleatoria el paso es determinista
+CONFIG_SIN_VARIACION = dict(CONFIG_AGENTES['temperatura'], variacion_temperatura=(0.0, 0.0))
+
+def verificar_control_por_umbrales():
+    """Cada zona sigue la lógica de AgenteTemperatura y solo se reportan los actuadores que cambiaron"""
+    if not numpy_disponible():
+        return  # NumPy es opcional: sin él no hay motor que verificar
+    config = dict(CONFIG_SIN_VARIACION, acoplamiento_zonas=0.0)
+    motor = MotorTermico(4, config=config)
+    motor.temperatura[:] = [18.0, 30.0, 22.0, 22.0]
+    motor.calefaccion[3] = True  # En el rango óptimo: se apaga
+
+    cambios = motor.paso(1.0)
+    assert cambios['calefaccion_activada'].tolist() == [0, 3]
+    assert cambios['ventilador_activado'].tolist() == [1]
+    assert motor.calefaccion.tolist() == [True, False, False, False]
+    assert motor.ventilador.tolist() == [False, True, False, False]
+    esperadas = [18.0 + config['potencia_calefaccion'], 30.0 - config['potencia_enfriamiento'], 22.0, 22.0]
+    assert all(abs(real - esperada) < 1e-9 for real, esperada in zip(motor.temperatura.tolist(), esperadas))
+
+    # Sin cruzar umbrales no hay cambios que reportar
+    cambios = motor.paso(1.0)
+    assert not len(cambios['calefaccion_activada']) and not len(cambios['ventilador_activado'])
+
+def verificar_acoplamiento_entre_vecinas():
+    """El calor fluye entre zonas vecinas sin crearse ni perderse; las zonas aisladas no cambian"""
+    if not numpy_disponible():
+        return
+    motor = MotorTermico(3, config=dict(CONFIG_SIN_VARIACION, acoplamiento_zonas=0.1), vecinos=[(0, 1)])
+    motor.temperatura[:] = [21.0, 23.0, 20.0]
+    motor.paso(1.0)
+    a, b, aislada = motor.temperatura.tolist()
+    assert 21.0 < a < b < 23.0
+    assert abs((a + b) - 44.0) < 1e-9
+    assert aislada == 20.0
+
+VERIFICACIONES = [
+    verificar_control_por_umbrales,
+    verificar_acoplamiento_entre_vecinas
+]
+
+def ejecutar():
+    return ejecutar_verificaciones(VERIFICACIONES)
+
+if __name__ == "__main__":
+    sys.exit(0 if reportar(ejecutar()) else 1)